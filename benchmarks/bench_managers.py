@@ -0,0 +1,238 @@
+"""Hot-path benchmarks for the managers, renderers and storage backends against a fake guild.
+
+Each suite times individual operations and reports mean and p50/p95/p99 in
+microseconds. ``--json`` saves the results; ``--baseline`` compares a run
+against saved results and exits non-zero if any suite's p50 got slower by
+more than ``--tolerance``, so it can gate a deploy.
+
+Usage:
+    python -m benchmarks.bench_managers [--members 2000] [--history 20000] [--ops 2000]
+                                        [--suites add_points,render] [--json out.json]
+                                        [--baseline base.json] [--tolerance 0.25]
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_serialization import make_scores
+from benchmarks.fakes import FakeGuild, house_config, make_guild
+from benchmarks.workload import Op, make_puzzles, make_workload
+from bot.config import DEFAULT_CONFIG, ConfigManager
+from bot.puzzles import PuzzleManager
+from bot.scoring import ScoreManager
+from bot.seasons import SeasonManager
+from storage.json_storage import JsonStorage, get_serializer
+from storage.snapshot import SnapshotStorage
+from utils.embeds import create_standings_embed
+from utils.weights import get_house_member_counts
+
+BACKENDS = ("json", "snapshot")
+
+
+class BenchEnv:
+    """A data directory seeded with ``history`` events and managers wired to one storage backend."""
+
+    def __init__(self, root: str, backend: str, guild: FakeGuild, history: int):
+        self.root = root
+        self.backend = backend
+        self.guild = guild
+        paths = self.paths = dict(
+            config_path=os.path.join(root, "houseledger_config.json"),
+            scores_path=os.path.join(root, "houseledger_scores.json"),
+            season_path=os.path.join(root, "houseledger_season.json"),
+        )
+        if not os.path.exists(paths["scores_path"]):
+            scores = make_scores(history, n_players=min(len(guild.members), 2000) or 1)
+            # Score the fake guild's members so renders resolve real names
+            ids = [str(m.id) for m in guild.members[:len(scores["players"])]]
+            scores["players"] = dict(zip(ids, scores["players"].values()))
+            for i, event in enumerate(scores["events"]):
+                event["target_id"] = ids[i % len(ids)] if ids else event["target_id"]
+            with open(paths["scores_path"], "w", encoding="utf-8") as f:
+                json.dump(scores, f)
+            with open(paths["config_path"], "w", encoding="utf-8") as f:
+                json.dump(house_config(DEFAULT_CONFIG), f)
+            with open(os.path.join(root, "puzzles.json"), "w", encoding="utf-8") as f:
+                json.dump(make_puzzles(), f)
+        self.storage = self.open_storage()
+        self.config_mgr = ConfigManager(storage=self.storage)
+        self.score_mgr = ScoreManager(storage=self.storage, config_mgr=self.config_mgr)
+        self.season_mgr = SeasonManager(storage=self.storage)
+        self.season_mgr.set_stage_solution("answer", 10)
+        self.puzzle_mgr = PuzzleManager(puzzle_file=os.path.join(root, "puzzles.json"))
+        self.puzzle_ids = [p.id for p in self.puzzle_mgr.get_active_puzzles()]
+
+    def open_storage(self) -> JsonStorage:
+        if self.backend == "snapshot":
+            return SnapshotStorage(snapshot_path=os.path.join(self.root, "houseledger_scores.snap"), **self.paths)
+        return JsonStorage(**self.paths)
+
+    async def apply(self, op: Op) -> None:
+        """Run one workload operation the way the bot's handlers would."""
+        kind = op[0]
+        if kind == "award":
+            await self.score_mgr.add_points(
+                guild=self.guild, actor_id=op[1], target="player", target_id=str(op[1]),
+                base_points=op[2], reason="Benchmark award", weighted=True
+            )
+        elif kind == "submission":
+            self.season_mgr.submit_answer(str(op[1]), op[2])
+        elif kind == "answer":
+            if self.puzzle_mgr.check_solution(op[2], op[3]):
+                self.puzzle_mgr.mark_solved(op[2], str(op[1]), "house_veridian")
+        elif kind == "render":
+            create_standings_embed(self.guild, self.score_mgr.get_house_totals(), self.score_mgr.get_top_players(15), self.config_mgr)
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    n = len(samples)
+
+    def pct(q: float) -> float:
+        return samples[min(n - 1, int(q * n))] * 1e6
+
+    return {
+        "ops": n,
+        "mean_us": sum(samples) / n * 1e6,
+        "p50_us": pct(0.50),
+        "p95_us": pct(0.95),
+        "p99_us": pct(0.99),
+    }
+
+async def _time_ops(ops: List[Op], run: Callable[[Op], Any]) -> List[float]:
+    samples = []
+    for op in ops:
+        start = time.perf_counter()
+        result = run(op)
+        if asyncio.iscoroutine(result):
+            await result
+        samples.append(time.perf_counter() - start)
+    return samples
+
+async def _run_suites(env: BenchEnv, ops: int, selected: Optional[List[str]], seed: int) -> Dict[str, Dict[str, float]]:
+    workload = make_workload(env.guild, ops, puzzle_ids=env.puzzle_ids, seed=seed)
+    by_kind: Dict[str, List[Op]] = {}
+    for op in workload:
+        by_kind.setdefault(op[0], []).append(op)
+    renders = [("render",)] * max(1, ops // 20)
+
+    def save_scores(_: Op) -> None:
+        env.storage.save_scores(env.score_mgr.data)
+
+    def load_scores(_: Op) -> None:
+        ScoreManager(storage=env.open_storage(), config_mgr=env.config_mgr)
+
+    def member_counts(_: Op) -> None:
+        get_house_member_counts(guild=env.guild, house_role_ids=env.config_mgr.get_house_role_ids())
+
+    prefix = env.backend
+    suites: Dict[str, Callable[[], Any]] = {
+        f"{prefix}.add_points": lambda: _time_ops(by_kind.get("award", []), env.apply),
+        f"{prefix}.save_scores": lambda: _time_ops([("save",)] * max(1, ops // 50), save_scores),
+        f"{prefix}.load_scores": lambda: _time_ops([("load",)] * 5, load_scores),
+        f"{prefix}.mixed_workload": lambda: _time_ops(workload, env.apply),
+    }
+    # Backend-independent suites are only reported once, with the JSON backend
+    if env.backend == "json":
+        suites.update({
+            "seasons.submit_answer": lambda: _time_ops(by_kind.get("submission", []), env.apply),
+            "puzzles.answer": lambda: _time_ops(by_kind.get("answer", []), env.apply),
+            "render.standings": lambda: _time_ops(renders, env.apply),
+            "weights.member_counts": lambda: _time_ops(renders, member_counts),
+        })
+
+    results = {}
+    for name, suite in suites.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        samples = await suite()
+        if samples:
+            results[name] = _stats(samples)
+    return results
+
+def run(members: int, history: int, ops: int, selected: Optional[List[str]] = None, backends=BACKENDS, seed: int = 1) -> Dict[str, Any]:
+    guild = make_guild(members, seed=seed)
+    results: Dict[str, Dict[str, float]] = {}
+    for backend in backends:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = BenchEnv(tmp, backend, guild, history)
+            results.update(asyncio.run(_run_suites(env, ops, selected, seed)))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "serializer": get_serializer().name,
+            "members": members,
+            "history": history,
+            "ops": ops,
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Names of suites whose p50 regressed by more than ``tolerance`` (0.25 = 25%)."""
+    regressions = []
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("p50_us"):
+            continue
+        if stats["p50_us"] > base["p50_us"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+def print_results(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    header = f"{'suite':<28} {'ops':>6} {'mean (us)':>11} {'p50 (us)':>11} {'p95 (us)':>11} {'p99 (us)':>11}"
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    print(header)
+    for name, s in report["results"].items():
+        line = f"{name:<28} {s['ops']:>6} {s['mean_us']:>11.1f} {s['p50_us']:>11.1f} {s['p95_us']:>11.1f} {s['p99_us']:>11.1f}"
+        base = (baseline or {}).get("results", {}).get(name)
+        if base and base.get("p50_us"):
+            line += f" {s['p50_us'] / base['p50_us'] - 1:>+11.0%}"
+        print(line)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=2000, help="Members in the fake guild.")
+    parser.add_argument("--history", type=int, default=20000, help="Events already in the scores file.")
+    parser.add_argument("--ops", type=int, default=2000, help="Operations in the synthetic workload.")
+    parser.add_argument("--suites", default="", help="Comma-separated substrings selecting suites to run.")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated storage backends.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--baseline", help="Compare against results saved with --json.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown vs the baseline.")
+    args = parser.parse_args()
+
+    selected = [s for s in args.suites.split(",") if s] or None
+    backends = [b for b in args.backends.split(",") if b in BACKENDS]
+    report = run(args.members, args.history, args.ops, selected, backends, args.seed)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare the memory held by events and submissions as JSON dicts vs slotted records.
+
+Usage: python -m benchmarks.bench_records [--count 100000]
+"""
+from __future__ import annotations
+from typing import Any, Callable, List
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.bench_serialization import make_scores
+from storage.records import ScoreEvent, Submission
+
+def _measure(build: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return size
+
+def run(count: int) -> None:
+    # Round-trip through JSON text so the dicts hold freshly parsed strings,
+    # exactly as they would after loading the scores file.
+    raw_events = json.dumps(make_scores(count)["events"])
+    raw_submissions = json.dumps([
+        {"user_id": str(100000000000000000 + i), "answer": f"guess{i % 500}", "timestamp": "2025-03-01T12:00:00.123456", "correct": False}
+        for i in range(count)
+    ])
+
+    rows = [
+        ("events (dict)", lambda: json.loads(raw_events)),
+        ("events (ScoreEvent)", lambda: [ScoreEvent.from_dict(e) for e in json.loads(raw_events)]),
+        ("submissions (dict)", lambda: json.loads(raw_submissions)),
+        ("submissions (Submission)", lambda: [Submission.from_dict(s) for s in json.loads(raw_submissions)]),
+    ]
+    print(f"{'records':<26} {'total (MB)':>11} {'bytes/record':>13}")
+    for name, build in rows:
+        size = _measure(build)
+        print(f"{name:<26} {size / 1e6:>11.1f} {size / count:>13.0f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="Records per measurement.")
+    args = parser.parse_args()
+    run(args.count)
+
+if __name__ == "__main__":
+    main()
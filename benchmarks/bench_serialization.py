@@ -0,0 +1,81 @@
+"""Compare load/save time and file size of the JSON serializers on a synthetic scores file.
+
+Usage: python -m benchmarks.bench_serialization [--sizes 10000,100000,1000000] [--repeat 3]
+"""
+from __future__ import annotations
+from typing import Any, Dict, List
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from storage.json_storage import SERIALIZERS, _save_json
+
+def make_scores(n_events: int, n_players: int = 2000, seed: int = 1) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    player_ids = [str(100000000000000000 + rng.randrange(10 ** 17)) for _ in range(n_players)]
+    reasons = ["Solved puzzle: The Midnight Riddle", "Solved Stage 3", "Event participation", "Bonus", "Correction"]
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    events: List[Dict[str, Any]] = []
+    players: Dict[str, int] = {}
+    for i in range(n_events):
+        target_id = rng.choice(player_ids)
+        points = rng.randint(1, 25)
+        players[target_id] = players.get(target_id, 0) + points
+        events.append({
+            "timestamp": (start + timedelta(seconds=i * 7)).isoformat(),
+            "actor_id": rng.choice(player_ids),
+            "target": "player",
+            "target_id": target_id,
+            "base_points": points,
+            "weighted": True,
+            "house_points_awarded": points,
+            "player_points_awarded": points,
+            "reason": rng.choice(reasons)
+        })
+    return {
+        "houses": {"house_veridian": sum(players.values()) // 2, "feathered_host": sum(players.values()) // 2},
+        "players": players,
+        "events": events
+    }
+
+def _best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(f"{'events':>9} {'serializer':<10} {'format':<8} {'save (s)':>9} {'load (s)':>9} {'size (MB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scores.json")
+        for n in sizes:
+            payload = make_scores(n)
+            for name, serializer in SERIALIZERS.items():
+                for pretty in (True, False):
+                    save = _best_of(repeat, lambda: _save_json(path, payload, serializer, pretty))
+
+                    def load():
+                        with open(path, "rb") as f:
+                            serializer.loads(f.read())
+                    load_time = _best_of(repeat, load)
+                    size_mb = os.path.getsize(path) / 1e6
+                    fmt = "pretty" if pretty else "compact"
+                    print(f"{n:>9} {name:<10} {fmt:<8} {save:>9.3f} {load_time:>9.3f} {size_mb:>10.1f}")
+            # Release this size's payload before the next one is built
+            payload = None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated event counts.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is reported.")
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",") if s.strip()], args.repeat)
+
+if __name__ == "__main__":
+    main()
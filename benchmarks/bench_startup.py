@@ -0,0 +1,103 @@
+"""Measure cold-start time up to the point where the bot would connect to Discord.
+
+Each run happens in a fresh interpreter so imports are really cold. Phases:
+imports, manager construction (loading the data files), command and event
+registration, and the command-tree hash used to skip redundant syncs.
+Gateway login and READY are network-bound and not included.
+
+Usage: python -m benchmarks.bench_startup [--data-dir DIR] [--events 100000] [--runs 5]
+"""
+from __future__ import annotations
+from typing import Dict, List
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bench_serialization import make_scores
+
+_CHILD = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+import discord
+from bot.client import create_bot
+from storage.json_storage import JsonStorage
+from storage.snapshot import SnapshotStorage
+from bot.config import ConfigManager
+from bot.scoring import ScoreManager
+from bot.seasons import SeasonManager
+from bot.puzzles import PuzzleManager
+from bot.events import setup_events
+from bot.commands import setup_commands
+from bot.tree_cache import command_tree_hash
+t1 = time.perf_counter()
+
+data_dir, fmt = sys.argv[1], sys.argv[2]
+paths = dict(
+    config_path=os.path.join(data_dir, "houseledger_config.json"),
+    scores_path=os.path.join(data_dir, "houseledger_scores.json"),
+    season_path=os.path.join(data_dir, "houseledger_season.json"),
+)
+if fmt == "snapshot":
+    storage = SnapshotStorage(snapshot_path=os.path.join(data_dir, "houseledger_scores.snap"), **paths)
+else:
+    storage = JsonStorage(**paths)
+config_mgr = ConfigManager(storage=storage)
+score_mgr = ScoreManager(storage=storage, config_mgr=config_mgr)
+season_mgr = SeasonManager(storage=storage)
+puzzle_mgr = PuzzleManager(puzzle_file=os.path.join(data_dir, "puzzles.json"))
+t2 = time.perf_counter()
+
+bot = create_bot(intents=discord.Intents.default())
+setup_events(bot=bot, tree=bot.tree, dev_guild_id=None, puzzle_mgr=puzzle_mgr, score_mgr=score_mgr, config_mgr=config_mgr)
+setup_commands(tree=bot.tree, bot=bot, config_mgr=config_mgr, score_mgr=score_mgr, season_mgr=season_mgr, puzzle_mgr=puzzle_mgr, dev_guild_id=None)
+t3 = time.perf_counter()
+
+command_tree_hash(bot.tree, None)
+t4 = time.perf_counter()
+
+print(json.dumps({"imports": t1 - t0, "load": t2 - t1, "register": t3 - t2, "tree_hash": t4 - t3, "total": t4 - t0}))
+"""
+
+def _run_once(repo_root: str, data_dir: str, fmt: str) -> Dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, data_dir, fmt],
+        cwd=repo_root, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def _prepare(data_dir: str, n_events: int) -> None:
+    with open(os.path.join(data_dir, "houseledger_scores.json"), "w", encoding="utf-8") as f:
+        json.dump(make_scores(n_events), f)
+
+def run(data_dir: str, runs: int, formats: List[str]) -> None:
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    phases = ["imports", "load", "register", "tree_hash", "total"]
+    print(f"{'format':<9} " + " ".join(f"{p + ' (s)':>14}" for p in phases))
+    for fmt in formats:
+        # The first run also migrates JSON to the snapshot file, so discard it
+        _run_once(repo_root, data_dir, fmt)
+        results = [_run_once(repo_root, data_dir, fmt) for _ in range(runs)]
+        best = {p: min(r[p] for r in results) for p in phases}
+        print(f"{fmt:<9} " + " ".join(f"{best[p]:>14.3f}" for p in phases))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="Directory with existing data files; a synthetic one is generated if omitted.")
+    parser.add_argument("--events", type=int, default=100000, help="Events in the synthetic scores file.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per format; the best is reported.")
+    parser.add_argument("--formats", default="json,snapshot", help="Comma-separated storage formats to compare.")
+    args = parser.parse_args()
+    formats = [f for f in args.formats.split(",") if f]
+
+    if args.data_dir:
+        run(args.data_dir, args.runs, formats)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        _prepare(tmp, args.events)
+        run(tmp, args.runs, formats)
+
+if __name__ == "__main__":
+    main()
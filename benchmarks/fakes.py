@@ -0,0 +1,251 @@
+"""Offline stand-ins for the parts of discord.py objects the bot touches.
+
+Only what the bot reads is modelled: ids, names, role membership, guild
+lookups, and the message/interaction calls its handlers make. Members and
+channels report discord.Member/discord.TextChannel as their ``__class__``
+(as ``Mock(spec=...)`` does) so the handlers' isinstance checks pass.
+``FakeRole.members`` scans the guild like discord.py does, so member-count
+work costs what it would against a real cache.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+import itertools
+import random
+
+import discord
+
+_message_ids = itertools.count(600000000000000000)
+_interaction_ids = itertools.count(700000000000000000)
+
+VERIDIAN_ROLE_ID = 900000000000000001
+FEATHERED_ROLE_ID = 900000000000000002
+MOD_ROLE_ID = 900000000000000003
+
+
+class FakeRole:
+    def __init__(self, guild: "FakeGuild", id: int, name: str):
+        self.guild = guild
+        self.id = id
+        self.name = name
+
+    @property
+    def members(self) -> List["FakeMember"]:
+        return [m for m in self.guild.members if self.id in m.role_ids]
+
+    def __repr__(self) -> str:
+        return f"<FakeRole id={self.id} name={self.name!r}>"
+
+
+class FakeMember:
+    def __init__(self, guild: "FakeGuild", id: int, name: str, roles: Sequence[FakeRole] = (), bot: bool = False):
+        self.guild = guild
+        self.id = id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.roles = list(roles)
+        self.role_ids = {r.id for r in self.roles}
+
+    @property
+    def __class__(self):
+        return discord.Member
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def __repr__(self) -> str:
+        return f"<FakeMember id={self.id} name={self.name!r}>"
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", author: Any, content: str = "", id: Optional[int] = None, **payload: Any):
+        self.id = id if id is not None else next(_message_ids)
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.payload = payload
+        self.edits = 0
+
+    async def edit(self, **payload: Any) -> "FakeMessage":
+        await self.channel._rest()
+        self.payload.update(payload)
+        self.edits += 1
+        return self
+
+    async def delete(self, *, delay: Optional[float] = None) -> None:
+        self.channel.messages.pop(self.id, None)
+
+    async def pin(self) -> None:
+        pass
+
+
+class FakeChannel:
+    """A text channel that keeps what was sent to it; ``latency`` simulates the REST round trip."""
+
+    latency = 0.0
+
+    def __init__(self, guild: "FakeGuild", id: int, name: str):
+        self.guild = guild
+        self.id = id
+        self.name = name
+        self.messages: Dict[int, FakeMessage] = {}
+        self.sent = 0
+
+    @property
+    def __class__(self):
+        return discord.TextChannel
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    async def _rest(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        await self._rest()
+        message = FakeMessage(self, None, content or "", **kwargs)
+        self.messages[message.id] = message
+        self.sent += 1
+        return message
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        message = self.messages.get(message_id)
+        if message is None:
+            message = self.messages[message_id] = FakeMessage(self, None, id=message_id)
+        return message
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self._rest()
+        return self.get_partial_message(message_id)
+
+
+class FakeGuild:
+    def __init__(self, id: int = 800000000000000000, name: str = "Benchmark Guild", shard_id: int = 0):
+        self.id = id
+        self.name = name
+        self.shard_id = shard_id
+        self.icon = None
+        self.members: List[FakeMember] = []
+        self._members: Dict[int, FakeMember] = {}
+        self._roles: Dict[int, FakeRole] = {}
+        self._channels: Dict[int, FakeChannel] = {}
+
+    @property
+    def member_count(self) -> int:
+        return len(self.members)
+
+    def add_role(self, id: int, name: str) -> FakeRole:
+        role = self._roles[id] = FakeRole(self, id, name)
+        return role
+
+    def add_member(self, id: int, name: str, roles: Sequence[FakeRole] = ()) -> FakeMember:
+        member = FakeMember(self, id, name, roles)
+        self.members.append(member)
+        self._members[id] = member
+        return member
+
+    def add_channel(self, id: int, name: str) -> FakeChannel:
+        channel = self._channels[id] = FakeChannel(self, id, name)
+        return channel
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self._roles.get(role_id)
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self._channels.get(channel_id)
+
+    async def query_members(self, query: Optional[str] = None, *, limit: int = 5, user_ids: Optional[List[int]] = None, cache: bool = True) -> List[FakeMember]:
+        return [self._members[uid] for uid in (user_ids or ()) if uid in self._members][:limit]
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+        self.deferred = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        self._done = True
+        self.deferred = True
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self._done = True
+        self._interaction.original = await self._interaction.channel.send(content, **kwargs)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        message = await self._interaction.channel.send(content, **kwargs)
+        # Like Discord, the first follow-up after a defer becomes the original response
+        if self._interaction.original is None and self._interaction.response.is_done():
+            self._interaction.original = message
+        return message
+
+
+class FakeInteraction:
+    """A slash-command interaction from ``user`` in ``channel``."""
+
+    def __init__(self, guild: FakeGuild, user: FakeMember, channel: FakeChannel):
+        self.id = next(_interaction_ids)
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id
+        self.extras: Dict[str, Any] = {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.original: Optional[FakeMessage] = None
+
+    async def original_response(self) -> Optional[FakeMessage]:
+        return self.original
+
+    async def delete_original_response(self) -> None:
+        if self.original is not None:
+            await self.original.delete()
+            self.original = None
+
+
+def make_guild(members: int = 1000, veridian_share: float = 0.5, unsorted_share: float = 0.05, seed: int = 1) -> FakeGuild:
+    """A guild with two house roles and ``members`` members split between them.
+
+    ``unsorted_share`` of the members have no house role, like newcomers who
+    have not been sorted yet.
+    """
+    rng = random.Random(seed)
+    guild = FakeGuild()
+    veridian = guild.add_role(VERIDIAN_ROLE_ID, "House Veridian")
+    feathered = guild.add_role(FEATHERED_ROLE_ID, "Feathered Host")
+    guild.add_role(MOD_ROLE_ID, "Moderator")
+    for i in range(members):
+        roll = rng.random()
+        if roll < unsorted_share:
+            roles: List[FakeRole] = []
+        elif rng.random() < veridian_share:
+            roles = [veridian]
+        else:
+            roles = [feathered]
+        guild.add_member(100000000000000000 + i, f"member{i}", roles)
+    return guild
+
+def house_config(default_config: Dict[str, Any]) -> Dict[str, Any]:
+    """``default_config`` with the fake guild's house and mod roles filled in and weighting on."""
+    config = dict(default_config)
+    config["house_roles"] = {"house_veridian": str(VERIDIAN_ROLE_ID), "feathered_host": str(FEATHERED_ROLE_ID)}
+    config["mod_role_id"] = str(MOD_ROLE_ID)
+    config["weighting"] = {"enabled": True, "rounding": "round"}
+    return config
@@ -0,0 +1,331 @@
+"""Replay recorded or synthetic traffic through the real handlers, offline.
+
+Messages go through the ``on_message`` handler from ``setup_events`` and
+slash commands through the callbacks registered by ``setup_commands``
+(permission checks are skipped, the callbacks run as-is), against the fake
+guild from ``benchmarks/fakes.py`` and the same AsyncStorage setup as
+``bot.py``. Reports throughput, latency per operation kind and how many
+storage writes each operation caused.
+
+A trace is JSONL as written by ``bot.trace.TraceRecorder`` (set TRACE_FILE
+when running the bot). Without ``--trace`` a synthetic one is generated.
+
+Usage:
+    python -m benchmarks.replay [--trace traffic.jsonl | --ops 2000 --rate 50]
+                                [--speed 1.0] [--data-dir DIR] [--backend json|snapshot]
+                                [--members 2000] [--rest-latency 0.05] [--save-trace out.jsonl]
+
+``--speed`` scales the trace's timing (2.0 plays it twice as fast); 0 sends
+every operation as soon as the previous one finished.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import discord
+
+from benchmarks.fakes import (
+    FakeChannel, FakeGuild, FakeInteraction, FakeMessage, FEATHERED_ROLE_ID, VERIDIAN_ROLE_ID,
+    house_config, make_guild
+)
+from benchmarks.workload import make_puzzles
+from bot.client import create_bot
+from bot.commands import setup_commands
+from bot.config import DEFAULT_CONFIG, ConfigManager
+from bot.events import setup_events
+from bot.puzzles import PuzzleManager
+from bot.scoring import ScoreManager
+from bot.seasons import SeasonManager
+from bot.subscribers import setup_subscribers
+from storage.async_storage import AsyncStorage
+from storage.json_storage import JsonStorage
+from storage.snapshot import SnapshotStorage
+from utils import metrics
+
+COMMAND_CHANNEL_ID = 710000000000000000
+
+# Relative frequency of each synthetic operation
+SYNTHETIC_MIX: Dict[str, float] = {
+    "message": 0.6,
+    "submit": 0.15,
+    "score_add": 0.1,
+    "standings_main": 0.05,
+    "standings_house": 0.04,
+    "standings_overall": 0.03,
+    "stage": 0.03,
+}
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Read a JSONL trace and add ``t``, seconds since its first entry."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if entries and "t" not in entries[0]:
+        start = entries[0].get("ts", 0)
+        for entry in entries:
+            entry["t"] = entry.get("ts", start) - start
+    return entries
+
+def make_trace(guild: FakeGuild, puzzles: Dict[str, Any], ops: int, rate: float, seed: int = 1) -> List[Dict[str, Any]]:
+    """Poisson arrivals at ``rate`` operations per second, mixed per SYNTHETIC_MIX."""
+    rng = random.Random(seed)
+    kinds = list(SYNTHETIC_MIX)
+    weights = [SYNTHETIC_MIX[k] for k in kinds]
+    live = [p for p in puzzles["puzzles"] if p["active"]]
+    house_members = {
+        "house_veridian_channel": [m for m in guild.members if VERIDIAN_ROLE_ID in m.role_ids],
+        "feathered_host_channel": [m for m in guild.members if FEATHERED_ROLE_ID in m.role_ids],
+    }
+    t = 0.0
+    trace = []
+    for _ in range(ops):
+        t += rng.expovariate(rate)
+        kind = rng.choices(kinds, weights)[0]
+        member = rng.choice(guild.members)
+        if kind == "message" and live:
+            puzzle = rng.choice(live)
+            side = rng.choice(list(house_members))
+            author = rng.choice(house_members[side] or guild.members)
+            correct = rng.random() < 0.01
+            trace.append({
+                "t": t, "type": "message", "channel_id": puzzle[side], "author_id": str(author.id),
+                "content": puzzle["solution"] if correct else f"guess{rng.randrange(500)}"
+            })
+            continue
+        args: Dict[str, Any] = {}
+        if kind == "submit":
+            args = {"answer": f"guess{rng.randrange(500)}"}
+        elif kind == "score_add":
+            args = {"points": rng.randint(1, 25), "reason": "Replay award", "user": str(member.id)}
+        elif kind == "message":
+            kind = "ping"
+        trace.append({
+            "t": t, "type": "command", "name": kind, "user_id": str(member.id),
+            "channel_id": str(COMMAND_CHANNEL_ID), "args": args
+        })
+    return trace
+
+
+class Replayer:
+    def __init__(self, data_dir: str, backend: str, guild: FakeGuild, rest_latency: float = 0.0):
+        FakeChannel.latency = rest_latency
+        self.guild = guild
+        self.command_channel = guild.get_channel(COMMAND_CHANNEL_ID) or guild.add_channel(COMMAND_CHANNEL_ID, "commands")
+        paths = dict(
+            config_path=os.path.join(data_dir, "houseledger_config.json"),
+            scores_path=os.path.join(data_dir, "houseledger_scores.json"),
+            season_path=os.path.join(data_dir, "houseledger_season.json"),
+        )
+        if backend == "snapshot":
+            inner = SnapshotStorage(snapshot_path=os.path.join(data_dir, "houseledger_scores.snap"), **paths)
+        else:
+            inner = JsonStorage(**paths)
+        self.storage = AsyncStorage(inner)
+        self.config_mgr = ConfigManager(storage=self.storage)
+        self.score_mgr = ScoreManager(storage=self.storage, config_mgr=self.config_mgr)
+        self.season_mgr = SeasonManager(storage=self.storage)
+        self.puzzle_mgr = PuzzleManager(puzzle_file=os.path.join(data_dir, "puzzles.json"), io=self.storage)
+
+        # Route display updates to a message in the fake command channel
+        display = self.config_mgr.data.setdefault("display", {})
+        display["channel_id"] = str(self.command_channel.id)
+        display["message_id"] = display.get("message_id") or "650000000000000000"
+
+        self.bot = create_bot(intents=discord.Intents.default())
+        setup_events(bot=self.bot, tree=self.bot.tree, dev_guild_id=None, puzzle_mgr=self.puzzle_mgr,
+                     score_mgr=self.score_mgr, config_mgr=self.config_mgr)
+        setup_commands(tree=self.bot.tree, bot=self.bot, config_mgr=self.config_mgr, score_mgr=self.score_mgr,
+                       season_mgr=self.season_mgr, puzzle_mgr=self.puzzle_mgr, dev_guild_id=None)
+        # Display and log-channel updates run on subscriber tasks, which look the guild up by id
+        self.bot.get_guild = lambda guild_id: self.guild if guild_id == self.guild.id else None
+        self.subscribers = setup_subscribers(bot=self.bot, config_mgr=self.config_mgr, score_mgr=self.score_mgr)
+        self.latencies: Dict[str, List[float]] = {}
+        self.failures: Dict[str, int] = {}
+
+    def _channel(self, channel_id: str) -> FakeChannel:
+        cid = int(channel_id or COMMAND_CHANNEL_ID)
+        return self.guild.get_channel(cid) or self.guild.add_channel(cid, f"channel-{cid}")
+
+    def _member(self, user_id: str, channel_id: str = ""):
+        member = self.guild.get_member(int(user_id))
+        if member is None:
+            # Recorded users are not in the fake guild; sort them into the
+            # house whose puzzle channel they wrote in, if any.
+            puzzle = self.puzzle_mgr.get_puzzle_for_channel(channel_id) if channel_id else None
+            role_id = VERIDIAN_ROLE_ID
+            if puzzle and channel_id == puzzle.feathered_host_channel:
+                role_id = FEATHERED_ROLE_ID
+            member = self.guild.add_member(int(user_id), f"user{user_id[-4:]}", [self.guild.get_role(role_id)])
+        return member
+
+    def _command_kwargs(self, command: discord.app_commands.Command, args: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = {}
+        for param in command.parameters:
+            if param.display_name not in args:
+                continue
+            value = args[param.display_name]
+            if param.type is discord.AppCommandOptionType.user:
+                value = self._member(str(value))
+            elif param.type is discord.AppCommandOptionType.channel:
+                value = self._channel(str(value))
+            elif param.choices and command._params[param.name].is_choice_annotation():
+                value = next((c for c in param.choices if c.value == value), discord.app_commands.Choice(name=str(value), value=value))
+            kwargs[param.name] = value
+        return kwargs
+
+    async def dispatch(self, entry: Dict[str, Any]) -> str:
+        """Run one trace entry through its handler; returns the latency key."""
+        if entry["type"] == "message":
+            channel = self._channel(entry["channel_id"])
+            author = self._member(entry["author_id"], entry["channel_id"])
+            await self.bot.on_message(FakeMessage(channel, author, entry.get("content", "")))
+            return "message"
+
+        name = entry["name"]
+        command = self.bot.tree.get_command(name)
+        if command is None:
+            return f"unknown.{name}"
+        interaction = FakeInteraction(self.guild, self._member(entry["user_id"]), self._channel(entry.get("channel_id", "")))
+        await command.callback(interaction, **self._command_kwargs(command, entry.get("args", {})))
+        return f"command.{name}"
+
+    async def _timed(self, entry: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        key = f"command.{entry.get('name')}" if entry["type"] == "command" else "message"
+        try:
+            key = await self.dispatch(entry)
+        except Exception as e:
+            self.failures[key] = self.failures.get(key, 0) + 1
+            if self.failures[key] == 1:
+                print(f"[House Ledger] Replaying {key} failed: {e!r}")
+        self.latencies.setdefault(key, []).append(time.perf_counter() - start)
+
+    async def run(self, trace: List[Dict[str, Any]], speed: float) -> Dict[str, Any]:
+        for subscriber in self.subscribers:
+            subscriber.start()
+        writes_before = _storage_writes()
+        coalesced_before = _coalesced_writes()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = []
+        for entry in trace:
+            if speed > 0:
+                delay = start + entry.get("t", 0) / speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(loop.create_task(self._timed(entry)))
+            else:
+                await self._timed(entry)
+        if tasks:
+            await asyncio.gather(*tasks)
+        handled = loop.time() - start
+        for subscriber in self.subscribers:
+            await subscriber.stop()
+        await self.storage.flush()
+        elapsed = loop.time() - start
+
+        ops = sum(len(v) for v in self.latencies.values())
+        writes = _storage_writes() - writes_before
+        report = {
+            "ops": ops,
+            "seconds": elapsed,
+            "throughput": ops / handled if handled > 0 else 0.0,
+            "storage_writes": writes,
+            "coalesced_writes": _coalesced_writes() - coalesced_before,
+            "writes_per_op": writes / ops if ops else 0.0,
+            "failures": dict(self.failures),
+            "latency": {k: _stats(v) for k, v in sorted(self.latencies.items())},
+        }
+        await self.storage.aclose()
+        return report
+
+
+def _storage_writes() -> int:
+    return sum(h.count for name, h in metrics.histograms.items() if name.startswith("storage.save."))
+
+def _coalesced_writes() -> int:
+    return sum(v for name, v in metrics.counters.items() if name.startswith("storage.save.") and name.endswith(".coalesced"))
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        "count": n,
+        "p50_ms": samples[int(0.50 * (n - 1))] * 1000,
+        "p95_ms": samples[int(0.95 * (n - 1))] * 1000,
+        "p99_ms": samples[int(0.99 * (n - 1))] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{report['ops']} operations in {report['seconds']:.2f}s, {report['throughput']:.1f} ops/s handled")
+    print(f"storage writes: {report['storage_writes']} ({report['writes_per_op']:.2f}/op, {report['coalesced_writes']} coalesced away)")
+    print(f"{'operation':<28} {'count':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9}")
+    for key, s in report["latency"].items():
+        print(f"{key:<28} {s['count']:>7} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} {s['p99_ms']:>9.2f} {s['max_ms']:>9.2f}")
+    for key, n in report["failures"].items():
+        print(f"failed: {key} x{n}")
+
+def _seed_data_dir(path: str) -> None:
+    config_path = os.path.join(path, "houseledger_config.json")
+    if not os.path.exists(config_path):
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(house_config(DEFAULT_CONFIG), f)
+    puzzles_path = os.path.join(path, "puzzles.json")
+    if not os.path.exists(puzzles_path):
+        with open(puzzles_path, "w", encoding="utf-8") as f:
+            json.dump(make_puzzles(), f)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="JSONL trace to replay; a synthetic one is generated if omitted.")
+    parser.add_argument("--ops", type=int, default=2000, help="Operations in the synthetic trace.")
+    parser.add_argument("--rate", type=float, default=50.0, help="Synthetic arrival rate, operations per second.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed factor; 0 = back to back.")
+    parser.add_argument("--data-dir", help="Data files to start from (copied, never modified).")
+    parser.add_argument("--backend", choices=["json", "snapshot"], default="json")
+    parser.add_argument("--members", type=int, default=2000, help="Members in the fake guild.")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="Simulated seconds per Discord REST call.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-trace", help="Write the trace that was replayed to this file.")
+    parser.add_argument("--json", help="Write the report to this file.")
+    args = parser.parse_args()
+
+    guild = make_guild(args.members, seed=args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data_dir:
+            for name in os.listdir(args.data_dir):
+                src = os.path.join(args.data_dir, name)
+                if os.path.isfile(src) and (name.startswith("houseledger_") or name == "puzzles.json"):
+                    shutil.copy2(src, tmp)
+        _seed_data_dir(tmp)
+
+        if args.trace:
+            trace = load_trace(args.trace)
+        else:
+            with open(os.path.join(tmp, "puzzles.json"), "r", encoding="utf-8") as f:
+                trace = make_trace(guild, json.load(f), args.ops, args.rate, args.seed)
+        if args.save_trace:
+            with open(args.save_trace, "w", encoding="utf-8") as f:
+                for entry in trace:
+                    f.write(json.dumps(entry) + "\n")
+
+        async def replay() -> Dict[str, Any]:
+            replayer = Replayer(tmp, args.backend, guild, args.rest_latency)
+            return await replayer.run(trace, args.speed)
+
+        report = asyncio.run(replay())
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Synthetic workload: a seeded, reproducible stream of what a busy guild does.
+
+Operations are plain tuples so a run can be replayed exactly:
+
+    ("award", user_id, points)
+    ("submission", user_id, answer)
+    ("answer", user_id, puzzle_id, answer)
+    ("render",)
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Tuple
+import random
+
+from benchmarks.fakes import FakeGuild
+
+DEFAULT_MIX: Dict[str, float] = {"award": 0.45, "submission": 0.2, "answer": 0.3, "render": 0.05}
+
+Op = Tuple[Any, ...]
+
+def make_puzzles(count: int = 20, active: int = 4) -> Dict[str, Any]:
+    """A puzzles.json payload; the first ``active`` puzzles are live with channels set."""
+    puzzles = []
+    for i in range(count):
+        live = i < active
+        puzzles.append({
+            "id": f"puzzle_{i + 1}",
+            "title": f"Benchmark Puzzle {i + 1}",
+            "description": "Synthetic puzzle for benchmarking.",
+            "puzzle_content": "What has keys but can't open locks?",
+            "hint": "Think music.",
+            "footer_text": "Benchmark",
+            "house_veridian_channel": str(700000000000000000 + 2 * i) if live else "",
+            "feathered_host_channel": str(700000000000000001 + 2 * i) if live else "",
+            "points": 10 + i,
+            "solution": f"answer{i + 1}",
+            "active": live,
+            "solved_by": None
+        })
+    return {"puzzles": puzzles}
+
+def iter_workload(guild: FakeGuild, ops: int, mix: Dict[str, float] = DEFAULT_MIX, puzzle_ids: List[str] = (), seed: int = 1) -> Iterator[Op]:
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    member_ids = [m.id for m in guild.members]
+    # A few members are far more active than the rest, like in a real server
+    hot = member_ids[: max(1, len(member_ids) // 20)]
+    for _ in range(ops):
+        kind = rng.choices(kinds, weights)[0]
+        user_id = rng.choice(hot) if rng.random() < 0.5 else rng.choice(member_ids)
+        if kind == "award":
+            yield ("award", user_id, rng.randint(1, 25))
+        elif kind == "submission":
+            yield ("submission", user_id, f"guess{rng.randrange(200)}")
+        elif kind == "answer" and puzzle_ids:
+            puzzle_id = rng.choice(puzzle_ids)
+            correct = rng.random() < 0.02
+            yield ("answer", user_id, puzzle_id, f"answer{puzzle_id.split('_')[-1]}" if correct else f"guess{rng.randrange(200)}")
+        else:
+            yield ("render",)
+
+def make_workload(guild: FakeGuild, ops: int, mix: Dict[str, float] = DEFAULT_MIX, puzzle_ids: List[str] = (), seed: int = 1) -> List[Op]:
+    return list(iter_workload(guild, ops, mix, puzzle_ids, seed))
@@ -1,16 +1,25 @@
+import time
+STARTED_AT = time.perf_counter()
+
 import os
 from dotenv import load_dotenv
 
 import discord
-from discord.ext import commands
 
 from storage.json_storage import JsonStorage
+from storage.async_storage import AsyncStorage
+from storage.snapshot import SnapshotStorage
+from bot.client import create_bot
 from bot.config import ConfigManager
 from bot.scoring import ScoreManager
 from bot.seasons import SeasonManager
 from bot.puzzles import PuzzleManager
 from bot.events import setup_events
 from bot.commands import setup_commands
+from bot.subscribers import setup_subscribers
+from utils.charts import house_charts
+from utils.names import display_names
+from utils.metrics import serve_prometheus, write_prometheus_periodically
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -24,26 +33,95 @@ intents.guilds = True
 intents.members = True
 intents.message_content = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = create_bot(intents=intents)
+bot.started_at = STARTED_AT
 tree = bot.tree
 
 # STORAGE
-storage = JsonStorage(
+storage_paths = dict(
         config_path="houseledger_config.json",
         scores_path="houseledger_scores.json",
         season_path="houseledger_season.json"
     )
+if os.getenv("SCORES_FORMAT", "json").strip().lower() == "snapshot":
+    storage = AsyncStorage(SnapshotStorage(snapshot_path="houseledger_scores.snap", **storage_paths))
+else:
+    storage = AsyncStorage(JsonStorage(**storage_paths))
+# Shutdown hooks run last-registered first, so storage closes after everything that saves
+bot.add_shutdown_hook(storage.aclose)
+bot.add_shutdown_hook(house_charts.aclose)
+
+# METRICS (optional Prometheus text export)
+METRICS_FILE = os.getenv("METRICS_FILE", "").strip()
+METRICS_PORT = os.getenv("METRICS_PORT", "").strip()
+
+async def start_metrics_export():
+    if METRICS_FILE:
+        task = bot.loop.create_task(write_prometheus_periodically(METRICS_FILE))
+        async def stop_writer():
+            task.cancel()
+        bot.add_shutdown_hook(stop_writer)
+        print(f"[House Ledger] Writing metrics to {METRICS_FILE}")
+    if METRICS_PORT.isdigit():
+        host = os.getenv("METRICS_HOST", "127.0.0.1")
+        server = await serve_prometheus(host, int(METRICS_PORT))
+        async def stop_server():
+            server.close()
+            await server.wait_closed()
+        bot.add_shutdown_hook(stop_server)
+        print(f"[House Ledger] Serving metrics on http://{host}:{METRICS_PORT}/metrics")
+
+bot.add_startup_hook(start_metrics_export)
+
+# TRAFFIC TRACE (optional, for benchmarks/replay.py)
+TRACE_FILE = os.getenv("TRACE_FILE", "").strip()
+if TRACE_FILE:
+    from bot.trace import TraceRecorder
+    bot.trace_recorder = TraceRecorder(TRACE_FILE)
+    async def close_trace():
+        bot.trace_recorder.close()
+    bot.add_shutdown_hook(close_trace)
+    print(f"[House Ledger] Recording traffic to {TRACE_FILE}")
 
 
 # MANAGERS
 config_mgr = ConfigManager(storage=storage)
 score_mgr = ScoreManager(storage=storage, config_mgr=config_mgr)
 season_mgr = SeasonManager(storage=storage)
-puzzle_mgr = PuzzleManager(puzzle_file="puzzles.json")
+score_mgr.bind_season(season_mgr.get_current_season_id())
+puzzle_mgr = PuzzleManager(puzzle_file="puzzles.json", io=storage)
 
 # REGISTER
 setup_events(bot=bot, tree=tree, dev_guild_id=DEV_GUILD_ID, puzzle_mgr=puzzle_mgr, score_mgr=score_mgr, config_mgr=config_mgr)
 setup_commands(tree=tree, bot=bot, config_mgr=config_mgr, score_mgr=score_mgr, season_mgr=season_mgr, puzzle_mgr=puzzle_mgr, dev_guild_id=DEV_GUILD_ID)
+setup_subscribers(
+    bot=bot,
+    config_mgr=config_mgr,
+    score_mgr=score_mgr,
+    digest_seconds=float(os.getenv("LOG_DIGEST_SECONDS", "10")),
+    digest_entries=int(os.getenv("LOG_DIGEST_ENTRIES", "15"))
+)
+
+# SCOREBOARD API (optional, read-only JSON for the website)
+API_PORT = os.getenv("API_PORT", "").strip()
+
+def member_name(user_id: int):
+    for guild in bot.guilds:
+        name = display_names.display_name(guild, user_id)
+        if name:
+            return name
+    return None
+
+async def start_api():
+    from bot.api import ScoreboardAPI
+    host = os.getenv("API_HOST", "127.0.0.1")
+    api = ScoreboardAPI(score_mgr, season_mgr, name_of=member_name, cors_origin=os.getenv("API_CORS_ORIGIN") or None)
+    await api.start(host, int(API_PORT))
+    bot.add_shutdown_hook(api.stop)
+    print(f"[House Ledger] Serving the scoreboard API on http://{host}:{API_PORT}/api/houses")
+
+if API_PORT.isdigit():
+    bot.add_startup_hook(start_api)
 
 # RUN
 def main():
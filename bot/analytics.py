@@ -0,0 +1,287 @@
+"""Aggregate reports over the score event log, computed on NumPy columns.
+
+The event log is loaded once into parallel arrays (timestamp, target type,
+target id, house, base/house/player points, weighted). Snapshot storage
+hands its event columns over without copying; other logs are converted in
+one pass. Every report is then a handful of vectorized operations instead
+of a Python loop per event.
+
+NumPy is optional: without it ``available()`` is False, ``/stats`` says so
+and the CLI exits with an error.
+
+Usage::
+
+    python -m bot.analytics houseledger_scores.json [--out report.json] [--days 30]
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from storage.records import ScoreEvent, now_micros
+from storage.snapshot import TARGET_HOUSE, TARGET_PLAYER, SnapshotEvents
+
+DAY = 24 * 3600 * 1_000_000
+NO_HOUSE = -1
+
+def available() -> bool:
+    return np is not None
+
+
+class EventColumns:
+    """The event log as parallel NumPy arrays, one entry per event.
+
+    ``house`` indexes into ``houses``: the target of house awards, and for
+    player awards the player's house from ``member_houses`` (NO_HOUSE if
+    unknown, since events do not record it).
+    """
+
+    def __init__(self, timestamp, target, target_id, house, base_points, house_points, player_points, weighted, houses):
+        self.timestamp = timestamp
+        self.target = target
+        self.target_id = target_id
+        self.house = house
+        self.base_points = base_points
+        self.house_points = house_points
+        self.player_points = player_points
+        self.weighted = weighted
+        self.houses: List[str] = houses
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def from_events(cls, events: Sequence[ScoreEvent], member_houses: Optional[Mapping[int, str]] = None) -> "EventColumns":
+        if np is None:
+            raise RuntimeError("analytics need numpy; install it with `pip install numpy`")
+        houses: List[str] = []
+        house_index: Dict[str, int] = {}
+
+        def intern(key: str) -> int:
+            idx = house_index.get(key)
+            if idx is None:
+                idx = house_index[key] = len(houses)
+                houses.append(key)
+            return idx
+
+        parts = []
+        base = getattr(events, "base", events)
+        start = 0
+        if isinstance(base, SnapshotEvents):
+            parts.append(cls._snapshot_part(base, intern))
+            start = len(base)
+        if start < len(events):
+            parts.append(cls._records_part(events, start, intern))
+
+        if parts:
+            merged = [np.concatenate(cols) for cols in zip(*parts)]
+        else:
+            merged = [np.zeros(0, dtype=np.int64) for _ in range(8)]
+        timestamp, target, target_id, house, base_points, house_points, player_points, weighted = merged
+        weighted = weighted.astype(bool)
+
+        if member_houses:
+            # Attribute player awards to the player's house, via a sorted id lookup
+            uids = np.fromiter(member_houses.keys(), dtype=np.int64, count=len(member_houses))
+            hidx = np.fromiter((intern(h) for h in member_houses.values()), dtype=np.int64, count=len(member_houses))
+            order = np.argsort(uids)
+            uids, hidx = uids[order], hidx[order]
+            players = target == TARGET_PLAYER
+            pos = np.searchsorted(uids, target_id[players])
+            pos = np.minimum(pos, len(uids) - 1)
+            found = uids[pos] == target_id[players]
+            house[players] = np.where(found, hidx[pos], NO_HOUSE)
+
+        return cls(timestamp, target, target_id, house, base_points, house_points, player_points, weighted, houses)
+
+    @staticmethod
+    def _snapshot_part(events: SnapshotEvents, intern) -> List[Any]:
+        snap = events.snapshot
+
+        def col(name: str):
+            return np.asarray(snap.column(name))
+
+        target = col("ev_target").astype(np.int64)
+        refs = col("ev_target_ref").astype(np.int64)
+        ids = col("ids").astype(np.int64)
+        is_player = target == TARGET_PLAYER
+        target_id = np.where(is_player, ids[np.where(is_player, refs, 0)], 0)
+        # House targets reference the string table; map each distinct string once
+        house = np.full(len(target), NO_HOUSE, dtype=np.int64)
+        house_refs = refs[target == TARGET_HOUSE]
+        if len(house_refs):
+            distinct, inverse = np.unique(house_refs, return_inverse=True)
+            keys = np.array([intern(snap.string(int(r))) for r in distinct], dtype=np.int64)
+            house[target == TARGET_HOUSE] = keys[inverse]
+        return [
+            col("ev_timestamp").astype(np.int64), target, target_id, house,
+            col("ev_base_points").astype(np.int64), col("ev_house_points").astype(np.int64),
+            col("ev_player_points").astype(np.int64), col("ev_weighted").astype(np.int64)
+        ]
+
+    @staticmethod
+    def _records_part(events: Sequence[ScoreEvent], start: int, intern) -> List[Any]:
+        n = len(events) - start
+        rows = np.empty((n, 8), dtype=np.int64)
+        for i in range(n):
+            e = events[start + i]
+            if e.target == "house":
+                rows[i] = (e.timestamp, TARGET_HOUSE, 0, intern(e.target_id), e.base_points,
+                           e.house_points_awarded, e.player_points_awarded, e.weighted)
+            else:
+                rows[i] = (e.timestamp, TARGET_PLAYER, e.target_id, NO_HOUSE, e.base_points,
+                           e.house_points_awarded, e.player_points_awarded, e.weighted)
+        return [rows[:, j].copy() for j in range(8)]
+
+
+def _day_label(day: int) -> str:
+    return datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y-%m-%d")
+
+def points_per_day(cols: EventColumns, days: int = 30, now: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Events, house points and player points per UTC day over the last ``days`` days."""
+    now = now_micros() if now is None else now
+    first = now // DAY - days + 1
+    day = cols.timestamp // DAY - first
+    keep = (day >= 0) & (day < days)
+    day = day[keep]
+    events = np.bincount(day, minlength=days)
+    house_pts = np.bincount(day, weights=cols.house_points[keep], minlength=days)
+    player_pts = np.bincount(day, weights=cols.player_points[keep], minlength=days)
+    return [
+        {"day": _day_label(first + i), "events": int(events[i]), "house_points": int(house_pts[i]), "player_points": int(player_pts[i])}
+        for i in range(days)
+    ]
+
+def house_daily_points(cols: EventColumns, days: int = 30, now: Optional[int] = None) -> Dict[str, List[int]]:
+    """House points per UTC day for each house over the last ``days`` days, oldest first."""
+    now = now_micros() if now is None else now
+    first = now // DAY - days + 1
+    day = cols.timestamp // DAY - first
+    keep = (day >= 0) & (day < days) & (cols.house != NO_HOUSE)
+    n_houses = len(cols.houses)
+    # One bincount over (house, day) pairs fills the whole house x day grid
+    grid = np.bincount(
+        cols.house[keep] * days + day[keep], weights=cols.house_points[keep], minlength=n_houses * days
+    ).reshape(n_houses, days) if n_houses else np.zeros((0, days))
+    return {house: [int(v) for v in grid[i]] for i, house in enumerate(cols.houses)}
+
+def house_momentum(cols: EventColumns, days: int = 7, now: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+    """House points in the last ``days`` days against the ``days`` before."""
+    daily = house_daily_points(cols, days * 2, now)
+    out = {}
+    for house, series in daily.items():
+        previous, recent = sum(series[:days]), sum(series[days:])
+        out[house] = {"recent": recent, "previous": previous, "change": recent - previous}
+    return out
+
+def award_distribution(cols: EventColumns) -> Dict[str, Any]:
+    """Shape of award sizes (base points): percentiles, removals and the most common values."""
+    awards = cols.base_points[cols.base_points > 0]
+    if not len(awards):
+        return {"awards": 0, "removals": int((cols.base_points < 0).sum())}
+    p50, p90, p99 = np.percentile(awards, [50, 90, 99])
+    values, counts = np.unique(awards, return_counts=True)
+    top = np.argsort(counts)[::-1][:5]
+    return {
+        "awards": int(len(awards)),
+        "removals": int((cols.base_points < 0).sum()),
+        "mean": round(float(awards.mean()), 2),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": int(awards.max()),
+        "common": [[int(values[i]), int(counts[i])] for i in top]
+    }
+
+def weighting_impact(cols: EventColumns) -> Dict[str, Dict[str, Any]]:
+    """Per house: weighted awards, their base and applied house points, and the net effect of weighting."""
+    weighted = cols.weighted & (cols.house != NO_HOUSE)
+    out = {}
+    for i, house in enumerate(cols.houses):
+        mask = weighted & (cols.house == i)
+        base = int(cols.base_points[mask].sum())
+        applied = int(cols.house_points[mask].sum())
+        out[house] = {
+            "weighted_awards": int(mask.sum()),
+            "base_points": base,
+            "house_points": applied,
+            "net": applied - base,
+            "multiplier": round(applied / base, 3) if base else None
+        }
+    return out
+
+def build_report(cols: EventColumns, days: int = 30, now: Optional[int] = None) -> Dict[str, Any]:
+    now = now_micros() if now is None else now
+    return {
+        "generated": datetime.fromtimestamp(now / 1_000_000, tz=timezone.utc).isoformat(),
+        "events": len(cols),
+        "points_per_day": points_per_day(cols, days, now),
+        "house_momentum": house_momentum(cols, 7, now),
+        "award_distribution": award_distribution(cols),
+        "weighting_impact": weighting_impact(cols)
+    }
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Plain-text rendering of ``build_report`` for the CLI."""
+    lines = [f"House Ledger analytics — {report['events']} events — {report['generated']}", ""]
+    lines.append("House momentum (last 7 days vs the 7 before):")
+    lines.append(f"  {'house':<20} {'recent':>8} {'previous':>8} {'change':>8}")
+    for house, m in report["house_momentum"].items():
+        lines.append(f"  {house:<20} {m['recent']:>8} {m['previous']:>8} {m['change']:>+8}")
+    lines.append("")
+    lines.append("Award distribution (base points):")
+    for key, value in report["award_distribution"].items():
+        lines.append(f"  {key:<10} {value}")
+    lines.append("")
+    lines.append("Weighting impact:")
+    for house, w in report["weighting_impact"].items():
+        lines.append(f"  {house:<20} awards={w['weighted_awards']} base={w['base_points']} applied={w['house_points']} net={w['net']:+d}")
+    lines.append("")
+    lines.append(f"{'day':<12} {'events':>7} {'house':>8} {'player':>8}")
+    for row in report["points_per_day"]:
+        lines.append(f"{row['day']:<12} {row['events']:>7} {row['house_points']:>8} {row['player_points']:>8}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Write an analytics report for a scores file (JSON or snapshot).")
+    parser.add_argument("scores", help="Scores file: houseledger_scores.json or a .snap snapshot.")
+    parser.add_argument("--out", help="Write the report here; .json for JSON, anything else for text. Default: stdout.")
+    parser.add_argument("--days", type=int, default=30, help="Days covered by the per-day table.")
+    args = parser.parse_args()
+
+    if not available():
+        sys.exit("analytics need numpy; install it with `pip install numpy`")
+
+    from storage.snapshot import load_scores_snapshot
+
+    if args.scores.endswith(".snap"):
+        _, payload = load_scores_snapshot(args.scores)
+        events = payload["events"]
+    else:
+        from storage.json_storage import get_serializer
+        with open(args.scores, "rb") as f:
+            payload = get_serializer(None).loads(f.read())
+        events = [ScoreEvent.from_dict(e) for e in payload.get("events", [])]
+
+    report = build_report(EventColumns.from_events(events), days=args.days)
+    if args.out and args.out.endswith(".json"):
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(format_report(report) + "\n")
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Read-only JSON scoreboard API, served by aiohttp on the bot's event loop.
+
+Routes (all GET)::
+
+    /api/houses                         house totals, all time and this season
+    /api/players?limit=10&period=week   top players; period is week, month or season
+    /api/season                         current season and stage stats
+    /api/seasons/{id}                   final standings of a finished season
+    /api/stream                         server-sent events: awards, solves, stage changes
+
+Every JSON response carries an ETag built from the score and season versions,
+and bodies are cached per URL until the ETag changes, so a polling client
+that sends If-None-Match gets a 304 without any JSON being built.
+
+The stream relays the event bus. Each stream has its own bounded queue, so
+a slow client only loses its own oldest events; event ids let a client
+that reconnects with Last-Event-ID catch up on what it missed. Ids carry
+the process's boot id, since bus sequence numbers restart with it; a client
+whose id is from another boot, or too old to replay, is sent a ``resync``
+event with the current house totals instead.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Optional, Set, Tuple, TYPE_CHECKING
+from collections import OrderedDict
+import asyncio
+import json
+import os
+
+from aiohttp import web
+
+from bot.bus import BusEvent, bus
+from bot.rollups import WINDOWS
+from storage.records import now_micros
+from utils.metrics import incr, timer
+
+if TYPE_CHECKING:
+    from bot.scoring import ScoreManager
+    from bot.seasons import SeasonManager
+
+MAX_PLAYERS = 100
+MAX_STREAMS = 100
+STREAM_QUEUE = 256
+KEEPALIVE_SECONDS = 15
+
+class ScoreboardAPI:
+    def __init__(
+        self,
+        score_mgr: ScoreManager,
+        season_mgr: SeasonManager,
+        name_of: Optional[Callable[[int], Optional[str]]] = None,
+        cors_origin: Optional[str] = None,
+        max_cached: int = 64
+    ):
+        self._score_mgr = score_mgr
+        self._season_mgr = season_mgr
+        self._name_of = name_of
+        self._cors_origin = cors_origin
+        self._max_cached = max_cached
+        # Versions restart at 0 with the process; the boot id keeps old ETags from matching
+        self._boot = os.urandom(4).hex()
+        self._cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._runner: Optional[web.AppRunner] = None
+        self._streams: Set[asyncio.Task] = set()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/houses", self._houses)
+        app.router.add_get("/api/players", self._players)
+        app.router.add_get("/api/season", self._season)
+        app.router.add_get("/api/seasons/{season_id}", self._finished_season)
+        app.router.add_get("/api/stream", self._stream)
+        return app
+
+    async def start(self, host: str, port: int) -> None:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self) -> None:
+        # Streams never finish on their own; cleanup would wait out its timeout
+        for task in list(self._streams):
+            task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _etag(self, *parts: Any) -> str:
+        return '"' + "-".join(str(p) for p in (self._boot, self._score_mgr.version, self._season_mgr.version, *parts)) + '"'
+
+    def _respond(self, request: web.Request, etag: str, build: Callable[[], Any]) -> web.Response:
+        incr("api.requests")
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if self._cors_origin:
+            headers["Access-Control-Allow-Origin"] = self._cors_origin
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            incr("api.not_modified")
+            return web.Response(status=304, headers=headers)
+
+        key = str(request.rel_url)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == etag:
+            self._cache.move_to_end(key)
+            body = cached[1]
+        else:
+            with timer(f"api.{request.match_info.route.resource.canonical}"):
+                body = json.dumps(build(), separators=(",", ":")).encode("utf-8")
+            self._cache[key] = (etag, body)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    def _player_rows(self, players) -> list:
+        rows = []
+        for rank, (uid, pts) in enumerate(players, start=1):
+            name = self._name_of(int(uid)) if self._name_of else None
+            rows.append({"rank": rank, "user_id": uid, "name": name, "points": pts})
+        return rows
+
+    def _house_totals(self) -> dict:
+        season = self._score_mgr.data.get("season") or {}
+        return {
+            "houses": self._score_mgr.get_house_totals(),
+            "season_id": season.get("id"),
+            "season_houses": dict(season.get("houses", {}))
+        }
+
+    async def _houses(self, request: web.Request) -> web.Response:
+        return self._respond(request, self._etag(), self._house_totals)
+
+    async def _players(self, request: web.Request) -> web.Response:
+        try:
+            limit = min(max(int(request.query.get("limit", 10)), 1), MAX_PLAYERS)
+        except ValueError:
+            raise web.HTTPBadRequest(text="limit must be an integer")
+        period = request.query.get("period") or None
+        if period not in (None, "week", "month", "season"):
+            raise web.HTTPBadRequest(text="period must be week, month or season")
+
+        # Rolling windows also change as buckets expire, not only on awards
+        bucket = now_micros() // WINDOWS[period][0] if period in WINDOWS else 0
+
+        def build():
+            ranking = self._score_mgr.period_ranking(period)
+            return {"period": period or "all", "total_players": len(ranking), "players": self._player_rows(ranking.top(limit))}
+        return self._respond(request, self._etag(bucket), build)
+
+    async def _season(self, request: web.Request) -> web.Response:
+        def build():
+            stage = self._season_mgr.get_stage_stats()
+            stage.pop("has_solution", None)
+            return {
+                "season_id": self._season_mgr.get_current_season_id(),
+                "season": self._season_mgr.get_season_stats(),
+                "stage": stage
+            }
+        return self._respond(request, self._etag(), build)
+
+    async def _finished_season(self, request: web.Request) -> web.Response:
+        season_id = request.match_info["season_id"]
+        summary = self._score_mgr.get_season_summary(season_id)
+        if summary is None:
+            raise web.HTTPNotFound(text=f"no final standings for season {season_id}")
+
+        def build():
+            return {
+                "season_id": season_id,
+                "ended": summary["ended"],
+                "houses": summary["houses"],
+                "player_count": summary["player_count"],
+                "players": self._player_rows(summary["top_players"])
+            }
+        return self._respond(request, self._etag(), build)
+
+    def _frame(self, seq: int, kind: str, payload: Any) -> bytes:
+        data = json.dumps(payload, separators=(",", ":"))
+        return f"id: {self._boot}-{seq}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8")
+
+    def _event_frame(self, seq: int, event: BusEvent) -> bytes:
+        return self._frame(seq, event.kind, event.to_dict())
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        if len(self._streams) >= MAX_STREAMS:
+            raise web.HTTPServiceUnavailable(text="too many open streams")
+        incr("api.streams")
+        headers = {"Content-Type": "text/event-stream", "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        if self._cors_origin:
+            headers["Access-Control-Allow-Origin"] = self._cors_origin
+
+        # Subscribe before reading the backlog, with no await between, so nothing falls in the gap
+        sub = bus.subscribe(maxsize=STREAM_QUEUE)
+        boot, _, last_seq = request.headers.get("Last-Event-ID", "").partition("-")
+        backlog = bus.since(int(last_seq)) if boot == self._boot and last_seq.isdigit() else None
+        if backlog is not None:
+            replay = b"".join(self._event_frame(seq, event) for seq, event in backlog)
+        elif boot:
+            incr("api.stream_resyncs")
+            replay = self._frame(bus.last_seq, "resync", {"type": "resync", **self._house_totals()})
+        else:
+            replay = b""
+        task = asyncio.current_task()
+        self._streams.add(task)
+        response = web.StreamResponse(headers=headers)
+        try:
+            await response.prepare(request)
+            await response.write(b"retry: 3000\n\n" + replay)
+            while True:
+                try:
+                    seq, event = await asyncio.wait_for(sub.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                await response.write(self._event_frame(seq, event))
+        except ConnectionResetError:
+            pass
+        finally:
+            sub.close()
+            self._streams.discard(task)
+        return response
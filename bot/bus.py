@@ -0,0 +1,213 @@
+"""In-process event bus for score, puzzle and stage changes.
+
+Managers publish typed events synchronously as state changes; each consumer
+reads its own bounded queue. Publishing never blocks or awaits: a consumer
+that falls behind loses its oldest events rather than slowing an award.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
+from collections import deque
+import asyncio
+
+from storage.records import now_micros
+from utils.metrics import incr
+
+
+class BusEvent:
+    """Base of all bus events; ``kind`` is the event's name on the wire."""
+
+    __slots__ = ("timestamp",)
+    kind = "event"
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields = {s: getattr(self, s) for cls in type(self).__mro__ for s in getattr(cls, "__slots__", ())}
+        # Snowflakes exceed JavaScript's safe integers; send them as strings
+        for key, value in fields.items():
+            if key.endswith("_id") and isinstance(value, int):
+                fields[key] = str(value)
+        return {"type": self.kind, **fields}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class PointsAwarded(BusEvent):
+    """An award or removal applied by ``ScoreManager.add_points``."""
+
+    __slots__ = (
+        "guild_id", "actor_id", "target", "target_id", "reason", "base_points", "weighted",
+        "player_points", "player_total", "house_key", "house_points", "house_total", "solve"
+    )
+    kind = "points_awarded"
+
+    def __init__(
+        self,
+        *,
+        guild_id: Optional[int],
+        actor_id: int,
+        target: str,
+        target_id: str,
+        reason: str,
+        base_points: int,
+        weighted: bool,
+        player_points: int,
+        player_total: Optional[int],
+        house_key: Optional[str],
+        house_points: int,
+        house_total: Optional[int],
+        solve: bool = False
+    ):
+        self.timestamp = now_micros()
+        self.guild_id = guild_id
+        self.actor_id = actor_id
+        self.target = target
+        self.target_id = target_id
+        self.reason = reason
+        self.base_points = base_points
+        self.weighted = weighted
+        self.player_points = player_points
+        self.player_total = player_total
+        self.house_key = house_key
+        self.house_points = house_points
+        self.house_total = house_total
+        # The award for a puzzle or stage solve rather than a manual one
+        self.solve = solve
+
+
+class PuzzleSolved(BusEvent):
+    """A puzzle marked solved by ``PuzzleManager.mark_solved``."""
+
+    __slots__ = ("guild_id", "puzzle_id", "title", "user_id", "house_key", "points")
+    kind = "puzzle_solved"
+
+    def __init__(self, *, guild_id: Optional[int], puzzle_id: str, title: str, user_id: int, house_key: str, points: int):
+        self.timestamp = now_micros()
+        self.guild_id = guild_id
+        self.puzzle_id = puzzle_id
+        self.title = title
+        self.user_id = user_id
+        self.house_key = house_key
+        self.points = points
+
+
+class StageCompleted(BusEvent):
+    """A correct answer to the current stage, from ``SeasonManager.submit_answer``."""
+
+    __slots__ = ("guild_id", "season_id", "stage_id", "stage_name", "user_id", "points")
+    kind = "stage_completed"
+
+    def __init__(self, *, guild_id: Optional[int], season_id: str, stage_id: str, stage_name: str, user_id: int, points: int):
+        self.timestamp = now_micros()
+        self.guild_id = guild_id
+        self.season_id = season_id
+        self.stage_id = stage_id
+        self.stage_name = stage_name
+        self.user_id = user_id
+        self.points = points
+
+
+class StageChanged(BusEvent):
+    """The current stage moved on, by ``advance_stage`` or ``advance_season``."""
+
+    __slots__ = ("season_id", "stage_id", "stage_name")
+    kind = "stage_changed"
+
+    def __init__(self, *, season_id: str, stage_id: str, stage_name: str):
+        self.timestamp = now_micros()
+        self.season_id = season_id
+        self.stage_id = stage_id
+        self.stage_name = stage_name
+
+
+class Subscription:
+    """One consumer's bounded queue of (sequence number, event)."""
+
+    def __init__(
+        self,
+        bus: EventBus,
+        types: Tuple[Type[BusEvent], ...],
+        maxsize: int,
+        accepts: Optional[Callable[[BusEvent], bool]] = None
+    ):
+        self._bus = bus
+        self.types = types
+        self.accepts = accepts
+        self._queue: "asyncio.Queue[Tuple[int, BusEvent]]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def wants(self, event: BusEvent) -> bool:
+        if self.types and not isinstance(event, self.types):
+            return False
+        return self.accepts is None or self.accepts(event)
+
+    def put(self, seq: int, event: BusEvent) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            incr("bus.dropped")
+        self._queue.put_nowait((seq, event))
+
+    async def get(self) -> Tuple[int, BusEvent]:
+        return await self._queue.get()
+
+    def get_nowait(self) -> Tuple[int, BusEvent]:
+        return self._queue.get_nowait()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """Fans published events out to subscriptions, and keeps the last few for reconnecting clients."""
+
+    def __init__(self, history: int = 256):
+        self._subscriptions: List[Subscription] = []
+        self._recent: Deque[Tuple[int, BusEvent]] = deque(maxlen=history)
+        self._seq = 0
+
+    def subscribe(
+        self,
+        *types: Type[BusEvent],
+        maxsize: int = 1000,
+        accepts: Optional[Callable[[BusEvent], bool]] = None
+    ) -> Subscription:
+        """Queue future events of ``types`` (all events if none are given) that pass ``accepts``."""
+        sub = Subscription(self, types, maxsize, accepts)
+        self._subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self._subscriptions:
+            self._subscriptions.remove(sub)
+
+    def publish(self, event: BusEvent) -> None:
+        """Deliver ``event`` to every interested subscription; call from the event loop's thread."""
+        self._seq += 1
+        self._recent.append((self._seq, event))
+        incr("bus.published")
+        for sub in self._subscriptions:
+            if sub.wants(event):
+                sub.put(self._seq, event)
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest published event; 0 before any."""
+        return self._seq
+
+    def since(self, seq: int) -> Optional[List[Tuple[int, BusEvent]]]:
+        """Retained events after sequence number ``seq``, oldest first.
+
+        None when some of those events are no longer retained, or ``seq`` is
+        ahead of this bus (it came from an earlier process).
+        """
+        if seq > self._seq:
+            return None
+        if seq < self._seq and (not self._recent or self._recent[0][0] > seq + 1):
+            return None
+        return [item for item in self._recent if item[0] > seq]
+
+
+bus = EventBus()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import deque
+import math
+import os
+import time
+
+import discord
+from discord.ext import commands
+
+class ShardStats:
+    """Per-shard event counters with a sliding one-minute throughput window."""
+
+    WINDOW_SECONDS = 60
+
+    def __init__(self):
+        self._totals: Dict[int, int] = {}
+        self._buckets: Dict[int, deque] = {}
+
+    def record(self, shard_id: Optional[int]) -> None:
+        shard = shard_id or 0
+        self._totals[shard] = self._totals.get(shard, 0) + 1
+
+        now = int(time.monotonic())
+        buckets = self._buckets.setdefault(shard, deque())
+        if buckets and buckets[-1][0] == now:
+            buckets[-1][1] += 1
+        else:
+            buckets.append([now, 1])
+        while buckets and buckets[0][0] <= now - self.WINDOW_SECONDS:
+            buckets.popleft()
+
+    def total(self, shard_id: int) -> int:
+        return self._totals.get(shard_id, 0)
+
+    def per_minute(self, shard_id: int) -> int:
+        cutoff = int(time.monotonic()) - self.WINDOW_SECONDS
+        return sum(count for second, count in self._buckets.get(shard_id, ()) if second > cutoff)
+
+    def snapshot(self, latencies: List[Tuple[int, float]]) -> List[Dict[str, float]]:
+        """Combine gateway latencies with event counters, one row per shard."""
+        rows = []
+        seen = set()
+        for shard_id, latency in latencies:
+            seen.add(shard_id)
+            rows.append({
+                "shard_id": shard_id,
+                "latency_ms": latency * 1000 if math.isfinite(latency) else -1,
+                "events_total": self.total(shard_id),
+                "events_per_min": self.per_minute(shard_id),
+            })
+        for shard_id in sorted(set(self._totals) - seen):
+            rows.append({
+                "shard_id": shard_id,
+                "latency_ms": -1,
+                "events_total": self.total(shard_id),
+                "events_per_min": self.per_minute(shard_id),
+            })
+        return rows
+
+
+class HouseLedgerBot(commands.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shard_stats = ShardStats()
+        # Set to a bot.trace.TraceRecorder to record incoming traffic for replay
+        self.trace_recorder = None
+        # bot.py overrides this with the time its imports started
+        self.started_at = time.perf_counter()
+        self.startup_logged = False
+        self._startup_hooks: List[Callable[[], Awaitable[None]]] = []
+        self._shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+    def add_startup_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function awaited in ``setup_hook``, once the event loop is running."""
+        self._startup_hooks.append(hook)
+
+    async def setup_hook(self) -> None:
+        for hook in self._startup_hooks:
+            await hook()
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function awaited when the bot closes, last registered first.
+
+        Hooks registered early (storage) outlive the ones registered after
+        them (subscribers, the API), which may still save while they stop.
+        """
+        self._shutdown_hooks.append(hook)
+
+    async def close(self) -> None:
+        for hook in reversed(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:
+                print(f"[House Ledger] Shutdown hook failed: {e}")
+        self._shutdown_hooks.clear()
+        await super().close()
+
+    def shard_latencies(self) -> List[Tuple[int, float]]:
+        return [(0, self.latency)]
+
+
+class ShardedHouseLedgerBot(HouseLedgerBot, commands.AutoShardedBot):
+    def shard_latencies(self) -> List[Tuple[int, float]]:
+        return list(self.latencies)
+
+
+def _parse_shard_ids(raw: str) -> Optional[List[int]]:
+    ids = [part.strip() for part in raw.split(",") if part.strip()]
+    if not ids:
+        return None
+    if not all(part.isdigit() for part in ids):
+        raise RuntimeError(f"SHARD_IDS must be a comma-separated list of integers, got {raw!r}")
+    return [int(part) for part in ids]
+
+
+def create_bot(*, intents: discord.Intents, command_prefix: str = "!") -> HouseLedgerBot:
+    """Build the bot, sharded when SHARDED/SHARD_COUNT/SHARD_IDS are set in the environment.
+
+    SHARDED=1 alone lets Discord pick the shard count. SHARD_COUNT and SHARD_IDS
+    pin the layout, e.g. SHARD_COUNT=4 SHARD_IDS=0,1 for one of two processes.
+    """
+    sharded = os.getenv("SHARDED", "").strip().lower() in ("1", "true", "yes", "auto")
+    shard_count_raw = os.getenv("SHARD_COUNT", "").strip()
+    shard_ids = _parse_shard_ids(os.getenv("SHARD_IDS", ""))
+
+    if not (sharded or shard_count_raw or shard_ids):
+        return HouseLedgerBot(command_prefix=command_prefix, intents=intents)
+
+    kwargs = {}
+    if shard_count_raw:
+        if not shard_count_raw.isdigit():
+            raise RuntimeError(f"SHARD_COUNT must be an integer, got {shard_count_raw!r}")
+        kwargs["shard_count"] = int(shard_count_raw)
+    if shard_ids:
+        if "shard_count" not in kwargs:
+            raise RuntimeError("SHARD_IDS requires SHARD_COUNT to be set")
+        kwargs["shard_ids"] = shard_ids
+
+    return ShardedHouseLedgerBot(command_prefix=command_prefix, intents=intents, **kwargs)
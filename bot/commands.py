@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import functools
+import time
 
 import discord
 from discord import app_commands
@@ -9,10 +12,73 @@ from bot.config import ConfigManager
 from bot.scoring import ScoreManager
 from bot.seasons import SeasonManager
 from bot.puzzles import PuzzleManager
-from utils.helpers import is_admin_or_mod_check, title_case_house
-from utils.embeds import create_diag_embed, create_standings_embed, create_main_standings_embed, create_overall_leaderboard_embed, create_house_leaderboard_embed
-from utils.display import update_display_message
-from utils.puzzle_embeds import create_puzzle_embed, create_puzzle_list_embed, create_puzzle_activated_embed
+from bot.leaderboard import BrowseRankingView, RankingPages, RankingView
+from utils.helpers import is_admin_or_mod_check, member_house, title_case_house
+from utils.metrics import get_histogram
+from utils.names import QUERY_TIMEOUT, prefetch_players
+
+# Discord drops interactions that are not acknowledged within 3 seconds.
+DEFER_AFTER_SECONDS = 1.5
+# Assumed first-run latency of commands that resolve member names: after a
+# restart the name cache is cold and a gateway query may take its full timeout
+NAME_LOOKUP_SECONDS = QUERY_TIMEOUT
+
+async def respond(interaction: discord.Interaction, content: Optional[str] = None, **kwargs: Any) -> None:
+    """Send the command's reply, as a follow-up if the interaction was already deferred.
+
+    The first follow-up after a defer replaces the "thinking" message and
+    keeps its visibility, so a reply that should be more or less private
+    than the defer removes that message and goes out as a fresh follow-up.
+    """
+    interaction.extras.setdefault("responded_at", time.perf_counter())
+    if interaction.response.is_done():
+        deferred_ephemeral = interaction.extras.pop("deferred_ephemeral", None)
+        if deferred_ephemeral is not None and deferred_ephemeral != kwargs.get("ephemeral", False):
+            await interaction.delete_original_response()
+        await interaction.followup.send(content, **kwargs)
+    else:
+        await interaction.response.send_message(content, **kwargs)
+
+def _member_scan_estimate(show_members: bool = True, **_: Any) -> float:
+    # Walking role member lists is the slow part of /diag; defer before the first run.
+    return DEFER_AFTER_SECONDS if show_members else 0.0
+
+def timed_command(
+    name: str,
+    *,
+    defer: bool = False,
+    ephemeral: bool = False,
+    estimate: Optional[Callable[..., float]] = None,
+    cold: float = 0.0
+) -> Callable:
+    """Record the command's response latency and defer up front when it is predicted to be slow.
+
+    The prediction is the larger of the command's smoothed past latency
+    (``cold`` until it has run once since startup) and ``estimate(**kwargs)``,
+    which lets a command flag argument-dependent work (e.g. a member scan)
+    regardless of its history. Deferred commands must reply through
+    ``respond`` so the answer goes out as a follow-up.
+    """
+    hist = get_histogram(f"command.{name}")
+
+    def decorator(func: Callable[..., Awaitable[None]]) -> Callable[..., Awaitable[None]]:
+        @functools.wraps(func)
+        async def wrapper(interaction: discord.Interaction, *args: Any, **kwargs: Any) -> None:
+            start = time.perf_counter()
+            if defer:
+                predicted = hist.ewma if hist.count else cold
+                if estimate is not None:
+                    predicted = max(predicted, estimate(**kwargs))
+                if predicted >= DEFER_AFTER_SECONDS and not interaction.response.is_done():
+                    await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+                    interaction.extras["deferred_ephemeral"] = ephemeral
+            try:
+                await func(interaction, *args, **kwargs)
+            finally:
+                responded_at = interaction.extras.get("responded_at")
+                hist.observe((responded_at or time.perf_counter()) - start)
+        return wrapper
+    return decorator
 
 def setup_commands(
     *,
@@ -28,17 +94,31 @@ def setup_commands(
     if dev_guild_id and dev_guild_id.isdigit():
         guild_kw = {"guild": discord.Object(id=int(dev_guild_id))}
 
+    ranking_pages = RankingPages(score_mgr, config_mgr)
+
+    async def register_persistent_views():
+        bot.add_view(BrowseRankingView(ranking_pages))
+
+    # Views need the event loop, so the bot registers them once it starts
+    add_startup_hook = getattr(bot, "add_startup_hook", None)
+    if add_startup_hook is not None:
+        add_startup_hook(register_persistent_views)
+
     # Basic
     @tree.command(name="ping", description="Check if House Ledger is awake.", **guild_kw)
+    @timed_command("ping")
     async def ping(interaction: discord.Interaction):
         await interaction.response.send_message("House Ledger is awake. ✅", ephemeral=True)
 
     @tree.command(name="diag", description="Diagnostics.", **guild_kw)
     @app_commands.describe(show_members="If true, show house role member counts.")
+    @timed_command("diag", defer=True, ephemeral=True, estimate=_member_scan_estimate)
     async def diag(interaction: discord.Interaction, show_members: bool = True):
+        from utils.embeds import create_diag_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         # member counts
@@ -53,9 +133,58 @@ def setup_commands(
         weighting = config_mgr.data.get("weighting", {})
         houses = score_mgr.get_house_totals()
 
-        embed = create_diag_embed(guild, weighting, vr_count, fh_count, houses, show_members)
+        shard_rows = None
+        shard_stats = getattr(bot, "shard_stats", None)
+        if shard_stats is not None:
+            shard_rows = shard_stats.snapshot(bot.shard_latencies())
+
+        embed = create_diag_embed(guild, weighting, vr_count, fh_count, houses, show_members, shard_rows=shard_rows)
+        await respond(interaction, embed=embed, ephemeral=True)
+
+    @tree.command(name="perf", description="Latency percentiles and counters since startup.", **guild_kw)
+    @is_admin_or_mod_check(config_mgr)
+    @timed_command("perf")
+    async def perf(interaction: discord.Interaction):
+        from utils.embeds import create_perf_embed
+        from utils.metrics import counters, snapshot_rows
+
+        embed = create_perf_embed(snapshot_rows(), dict(counters))
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    # Last analytics report per guild, reused until scores change or the UTC day rolls over
+    stats_cache: Dict[int, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+    @tree.command(name="stats", description="House momentum, points per day and award analytics (Admin only).", **guild_kw)
+    @is_admin_or_mod_check(config_mgr)
+    @timed_command("stats", defer=True, ephemeral=True)
+    async def stats(interaction: discord.Interaction):
+        from bot import analytics
+        from storage.records import now_micros
+        from utils.embeds import create_stats_embed
+        from utils.weights import get_member_houses
+
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
+            return
+        if not analytics.available():
+            await respond(interaction, "Analytics need numpy on the bot host (`pip install numpy`).", ephemeral=True)
+            return
+
+        key = (score_mgr.version, now_micros() // analytics.DAY)
+        cached = stats_cache.get(guild.id)
+        if cached is not None and cached[0] == key:
+            report = cached[1]
+        else:
+            member_houses = get_member_houses(guild=guild, house_role_ids=config_mgr.get_house_role_ids())
+            events = score_mgr.events
+            # Column building walks the log once; keep it off the event loop
+            report = await asyncio.to_thread(
+                lambda: analytics.build_report(analytics.EventColumns.from_events(events, member_houses))
+            )
+            stats_cache[guild.id] = (key, report)
+        await respond(interaction, embed=create_stats_embed(report), ephemeral=True)
+
     #  Config: weighting
     @tree.command(name="config_weighting", description="Enable/disable weighting + rounding.", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
@@ -68,6 +197,7 @@ def setup_commands(
         app_commands.Choice(name="floor", value="floor"),
         app_commands.Choice(name="ceil", value="ceil")
     ])
+    @timed_command("config_weighting")
     async def config_weighting(interaction: discord.Interaction, enabled: bool, rounding: app_commands.Choice[str]):
         config_mgr.set_weighting(enabled=enabled, rounding=rounding.value)
         await interaction.response.send_message(
@@ -77,94 +207,191 @@ def setup_commands(
 
     #  Standings
     @tree.command(name="standings_house", description="Show current house leaderboard.", **guild_kw)
+    @timed_command("standings_house", defer=True, cold=NAME_LOOKUP_SECONDS)
     async def standings_house(interaction: discord.Interaction):
+        from utils.embeds import create_standings_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         houses = score_mgr.get_house_totals()
         top_players = score_mgr.get_top_players(50)
+        await prefetch_players(guild, top_players)
         embeds, files = create_standings_embed(guild, houses, top_players, config_mgr)
-        await interaction.response.send_message(embeds=embeds, files=files)
+        await respond(interaction, embeds=embeds, files=files)
+
+    def chart_estimate(chart: bool = False, **_: Any) -> float:
+        # A chart that is not cached yet is rendered (matplotlib imported on the first one) before the reply
+        from utils.charts import house_charts
+        return DEFER_AFTER_SECONDS if chart and not house_charts.is_cached(score_mgr) else 0.0
 
     @tree.command(name="standings_main", description="Show main house standings with progress bars.", **guild_kw)
-    async def standings_main(interaction: discord.Interaction):
+    @app_commands.describe(chart="Include a chart of house points over the last 30 days.")
+    @timed_command("standings_main", defer=True, estimate=chart_estimate)
+    async def standings_main(interaction: discord.Interaction, chart: bool = False):
+        from utils.charts import house_charts
+        from utils.embeds import create_main_standings_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
+        png = await house_charts.house_chart(score_mgr) if chart else None
         houses = score_mgr.get_house_totals()
-        embed, files = create_main_standings_embed(guild, houses, config_mgr)
-        await interaction.response.send_message(embed=embed, files=files)
+        embed, files = create_main_standings_embed(guild, houses, config_mgr, chart=png)
+        content = "Charts need matplotlib on the bot host (`pip install matplotlib`)." if chart and png is None else None
+        await respond(interaction, content, embed=embed, files=files)
 
     @tree.command(name="standings_overall", description="Show overall player leaderboard.", **guild_kw)
-    async def standings_overall(interaction: discord.Interaction):
+    @app_commands.describe(period="Only count points from this period (default: all time).")
+    @app_commands.choices(period=[
+        app_commands.Choice(name="week", value="week"),
+        app_commands.Choice(name="month", value="month"),
+        app_commands.Choice(name="season", value="season")
+    ])
+    @timed_command("standings_overall", defer=True, cold=NAME_LOOKUP_SECONDS)
+    async def standings_overall(interaction: discord.Interaction, period: Optional[app_commands.Choice[str]] = None):
+        from utils.embeds import create_overall_leaderboard_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
-        top_players = score_mgr.get_top_players(15)
-        embed, files = create_overall_leaderboard_embed(guild, top_players, config_mgr)
-        await interaction.response.send_message(embed=embed, files=files)
+        period_key = period.value if period else None
+        ranking = score_mgr.period_ranking(period_key)
+        top_players = ranking.top(15)
+        await prefetch_players(guild, top_players)
+        embed, files = create_overall_leaderboard_embed(guild, top_players, config_mgr, period=period_key)
+        await respond(interaction, embed=embed, files=files)
+
+    @tree.command(name="leaderboard", description="Browse the full player ranking.", **guild_kw)
+    @app_commands.describe(page="Page to open (default: the page you are on, or the first).")
+    @timed_command("leaderboard", defer=True, cold=NAME_LOOKUP_SECONDS)
+    async def leaderboard(interaction: discord.Interaction, page: Optional[app_commands.Range[int, 1]] = None):
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
+            return
+
+        if page is None:
+            start = ranking_pages.page_of(str(interaction.user.id)) or 0
+        else:
+            start = page - 1
+        view = RankingView(ranking_pages, page=start, owner_id=interaction.user.id)
+        await ranking_pages.prefetch(guild, view.page)
+        await respond(interaction, embed=ranking_pages.render(guild, view.page), view=view)
+
+    @tree.command(name="profile", description="Show a player's points, rank, house and recent history.", **guild_kw)
+    @app_commands.describe(user="Player to look up (default: you).")
+    @timed_command("profile", defer=True, cold=NAME_LOOKUP_SECONDS)
+    async def profile(interaction: discord.Interaction, user: Optional[discord.Member] = None):
+        from utils.embeds import create_profile_embed
+
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
+            return
+
+        user_id = (user or interaction.user).id
+        total = score_mgr.get_player_total(user_id)
+        awards, solves, solve_count = score_mgr.get_player_history(user_id)
+        await prefetch_players(guild, [(str(user_id), total)])
+        embed = create_profile_embed(
+            guild, str(user_id), total, score_mgr.ranking.rank_of(str(user_id)), len(score_mgr.ranking),
+            awards, solves, solve_count, config_mgr
+        )
+        await respond(interaction, embed=embed)
 
     @tree.command(name="standings_veridian", description="Show House Veridian leaderboard.", **guild_kw)
+    @timed_command("standings_veridian", defer=True, cold=NAME_LOOKUP_SECONDS)
     async def standings_veridian(interaction: discord.Interaction):
+        from utils.embeds import create_house_leaderboard_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         houses = score_mgr.get_house_totals()
         top_players = score_mgr.get_top_players(15)
+        await prefetch_players(guild, top_players)
         embed, files = create_house_leaderboard_embed(guild, houses, top_players, config_mgr, "house_veridian")
         if embed:
-            await interaction.response.send_message(embed=embed, files=files)
+            await respond(interaction, embed=embed, files=files)
         else:
-            await interaction.response.send_message("House Veridian data not available.", ephemeral=True)
+            await respond(interaction, "House Veridian data not available.", ephemeral=True)
 
     @tree.command(name="standings_feathered", description="Show Feathered Host leaderboard.", **guild_kw)
+    @timed_command("standings_feathered", defer=True, cold=NAME_LOOKUP_SECONDS)
     async def standings_feathered(interaction: discord.Interaction):
+        from utils.embeds import create_house_leaderboard_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         houses = score_mgr.get_house_totals()
         top_players = score_mgr.get_top_players(15)
+        await prefetch_players(guild, top_players)
         embed, files = create_house_leaderboard_embed(guild, houses, top_players, config_mgr, "feathered_host")
         if embed:
-            await interaction.response.send_message(embed=embed, files=files)
+            await respond(interaction, embed=embed, files=files)
         else:
-            await interaction.response.send_message("Feathered Host data not available.", ephemeral=True)
+            await respond(interaction, "Feathered Host data not available.", ephemeral=True)
 
     @tree.command(name="set_display_channel", description="Set the channel for auto-updating scoreboard.", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
-    async def set_display_channel(interaction: discord.Interaction):
+    @app_commands.describe(split="Post each scoreboard section as its own message, so updates only edit the sections that changed.")
+    @timed_command("set_display_channel", defer=True, cold=NAME_LOOKUP_SECONDS)
+    async def set_display_channel(interaction: discord.Interaction, split: bool = False):
+        from utils.display import remember_display, split_display
+        from utils.embeds import create_standings_embed
+
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         houses = score_mgr.get_house_totals()
         top_players = score_mgr.get_top_players(15)
+        await prefetch_players(guild, top_players)
         embeds, files = create_standings_embed(guild, houses, top_players, config_mgr)
+        groups = split_display(embeds, files, len(embeds) if split else 1)
 
-        await interaction.response.send_message(embeds=embeds, files=files)
-        message = await interaction.original_response()
+        first_embeds, first_files = groups[0]
+        # Deferred or not, the reply becomes the original response: the first display message
+        await respond(interaction, embeds=first_embeds, files=first_files, view=BrowseRankingView(ranking_pages))
+        messages = [await interaction.original_response()]
+        for group_embeds, group_files in groups[1:]:
+            messages.append(await interaction.channel.send(embeds=group_embeds, files=group_files))
+        for message, (group_embeds, group_files) in zip(messages, groups):
+            remember_display(message.id, group_embeds, group_files)
 
         # Pin the message
         try:
-            await message.pin()
+            await messages[0].pin()
         except discord.Forbidden:
             await interaction.followup.send("Couldn't pin the message (missing permissions).", ephemeral=True)
 
-        config_mgr.set_display_settings(str(interaction.channel_id), str(message.id))
+        config_mgr.set_display_settings(str(interaction.channel_id), [str(m.id) for m in messages])
         await interaction.followup.send(f"Display channel set to {interaction.channel.mention}. The scoreboard will auto-update here.", ephemeral=True)
 
     #  Scoring
+    # The display message and log channel follow awards through bot.subscribers
+    def award_message(guild: discord.Guild, action: str, target: str, target_id: str, player_award: int, house_award: int) -> str:
+        if target == "player":
+            member = guild.get_member(int(target_id))
+            user_name = member.display_name if member else f"User {target_id}"
+            house_key = member_house(member, config_mgr)
+            house_name = title_case_house(house_key) if house_key else "No House"
+            return f"{action} **{user_name}** (**{house_name}**). House applied: **{house_award}**, Player applied: **{player_award}**."
+        return f"{action} **{title_case_house(target_id)}**. House applied: **{house_award}**."
+
     @tree.command(name="score_add", description="Add points to a house or player.", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
     @app_commands.describe(
@@ -174,6 +401,7 @@ def setup_commands(
         reason="Reason (shown in audit log).",
         weighted="Apply house-size weighting (default false)."
     )
+    @timed_command("score_add", defer=True)
     async def score_add(
         interaction: discord.Interaction,
         points: int,
@@ -184,11 +412,12 @@ def setup_commands(
     ):
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         if (house is None) == (user is None):
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "Pick exactly one target: `house` **or** `user`.", ephemeral=True
             )
             return
@@ -199,7 +428,7 @@ def setup_commands(
         else:
             hk = (house or "").strip().lower()
             if hk not in ("house_veridian", "feathered_host"):
-                await interaction.response.send_message("House must be `house_veridian` or `feathered_host`.")
+                await respond(interaction, "House must be `house_veridian` or `feathered_host`.")
                 return
             target = "house"
             target_id = hk
@@ -211,35 +440,11 @@ def setup_commands(
             target_id=target_id,
             base_points=points,
             reason=reason,
-            weighted=weighted
+            weighted=weighted,
+            idempotency_key=f"interaction:{interaction.id}"
         )
 
-        if target == "player":
-            member = guild.get_member(int(target_id))
-            user_name = member.display_name if member else f"User {target_id}"
-            house_key = None
-            if member:
-                role_ids = config_mgr.get_house_role_ids()
-                for house, role_id_list in role_ids.items():
-                    for role_id in role_id_list:
-                        if role_id and role_id.isdigit():
-                            try:
-                                role = guild.get_role(int(role_id))
-                                if role and role in member.roles:
-                                    house_key = house
-                                    break
-                            except ValueError:
-                                continue
-                    if house_key:
-                        break
-            house_name = title_case_house(house_key) if house_key else "No House"
-            msg = f"Added **{points}** base points to **{user_name}** (**{house_name}**). House applied: **{house_award}**, Player applied: **{player_award}**."
-        else:
-            house_name = title_case_house(target_id)
-            msg = f"Added **{points}** base points to **{house_name}**. House applied: **{house_award}**."
-
-        await interaction.response.send_message(msg)
-        await update_display_message(guild, config_mgr, score_mgr)
+        await respond(interaction, award_message(guild, f"Added **{points}** base points to", target, target_id, player_award, house_award))
 
     @tree.command(name="score_remove", description="Remove points from a house or player.", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
@@ -250,6 +455,7 @@ def setup_commands(
         reason="Reason (shown in audit log).",
         weighted="Apply house-size weighting (default false)."
     )
+    @timed_command("score_remove", defer=True)
     async def score_remove(
         interaction: discord.Interaction,
         points: int,
@@ -260,11 +466,12 @@ def setup_commands(
     ):
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
         if (house is None) == (user is None):
-            await interaction.response.send_message(
+            await respond(
+                interaction,
                 "Pick exactly one target: `house` **or** `user`.", ephemeral=True
             )
             return
@@ -275,7 +482,7 @@ def setup_commands(
         else:
             hk = (house or "").strip().lower()
             if hk not in ("house_veridian", "feathered_host"):
-                await interaction.response.send_message("House must be `house_veridian` or `feathered_host`.", ephemeral=True)
+                await respond(interaction, "House must be `house_veridian` or `feathered_host`.", ephemeral=True)
                 return
             target = "house"
             target_id = hk
@@ -287,38 +494,15 @@ def setup_commands(
             target_id=target_id,
             base_points=points,
             reason=reason,
-            weighted=weighted
+            weighted=weighted,
+            idempotency_key=f"interaction:{interaction.id}"
         )
 
-        if target == "player":
-            member = guild.get_member(int(target_id))
-            user_name = member.display_name if member else f"User {target_id}"
-            house_key = None
-            if member:
-                role_ids = config_mgr.get_house_role_ids()
-                for house, role_id_list in role_ids.items():
-                    for role_id in role_id_list:
-                        if role_id and role_id.isdigit():
-                            try:
-                                role = guild.get_role(int(role_id))
-                                if role and role in member.roles:
-                                    house_key = house
-                                    break
-                            except ValueError:
-                                continue
-                    if house_key:
-                        break
-            house_name = title_case_house(house_key) if house_key else "No House"
-            msg = f"Removed **{points}** base points from **{user_name}** (**{house_name}**). House applied: **{house_award}**, Player applied: **{player_award}**."
-        else:
-            house_name = title_case_house(target_id)
-            msg = f"Removed **{points}** base points from **{house_name}**. House applied: **{house_award}**."
-
-        await interaction.response.send_message(msg)
-        await update_display_message(guild, config_mgr, score_mgr)
+        await respond(interaction, award_message(guild, f"Removed **{points}** base points from", target, target_id, player_award, house_award))
 
     # Seasons
     @tree.command(name="season", description="Show current season information.", **guild_kw)
+    @timed_command("season")
     async def season(interaction: discord.Interaction):
         guild = interaction.guild
         if guild is None:
@@ -352,6 +536,7 @@ def setup_commands(
         await interaction.response.send_message(embed=embed)
 
     @tree.command(name="stage", description="Show current stage information.", **guild_kw)
+    @timed_command("stage")
     async def stage(interaction: discord.Interaction):
         guild = interaction.guild
         if guild is None:
@@ -398,13 +583,14 @@ def setup_commands(
 
     @tree.command(name="submit", description="Submit an answer for the current stage.", **guild_kw)
     @app_commands.describe(answer="Your answer for the current stage")
+    @timed_command("submit", defer=True, ephemeral=True)
     async def submit(interaction: discord.Interaction, answer: str):
         guild = interaction.guild
         if guild is None:
-            await interaction.response.send_message("Run this inside a server.", ephemeral=True)
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
             return
 
-        result, was_correct = season_mgr.submit_answer(str(interaction.user.id), answer)
+        result, was_correct = season_mgr.submit_answer(str(interaction.user.id), answer, guild_id=guild.id)
         
         if was_correct:
             stage = season_mgr.get_current_stage()
@@ -417,57 +603,46 @@ def setup_commands(
                 target_id=str(interaction.user.id),
                 base_points=stage_points,
                 reason=f"Solved {stage.get('name', 'Stage')}",
-                weighted=True
+                weighted=True,
+                idempotency_key=f"interaction:{interaction.id}",
+                solve=True
             )
         
-        log_channel_id = config_mgr.get_log_channel_id()
-        if log_channel_id and was_correct:
-            try:
-                log_channel = guild.get_channel(int(log_channel_id))
-                if log_channel:
-                    member = guild.get_member(interaction.user.id)
-                    user_name = member.display_name if member else f"User {interaction.user.id}"
-                    
-                    house_name = "No House"
-                    if member:
-                        role_ids = config_mgr.get_house_role_ids()
-                        for house_key, role_id_list in role_ids.items():
-                            for role_id in role_id_list:
-                                if role_id and role_id.isdigit():
-                                    role = guild.get_role(int(role_id))
-                                    if role and role in member.roles:
-                                        house_name = title_case_house(house_key)
-                                        break
-                            if house_name != "No House":
-                                break
-                    
-                    stage_name = season_mgr.get_current_stage().get('name', 'Unknown Stage')
-                    stage_points = season_mgr.get_current_stage().get('points', 10)
-                    embed = discord.Embed(
-                        title="🎉 Stage Solved!",
-                        description=f"**{user_name}** from **{house_name}** has solved **{stage_name}**!",
-                        color=0x27ae60,
-                        timestamp=interaction.created_at
-                    )
-                    embed.add_field(name="Points Awarded", value=f"{stage_points} points (weighted)", inline=False)
-                    
-                    await log_channel.send(embed=embed)
-            except Exception:
-                pass
-        
-        if was_correct:
-            await update_display_message(guild, config_mgr, score_mgr)
-        
-        await interaction.response.send_message(result, ephemeral=True)
+        await respond(interaction, result, ephemeral=True)
 
     @tree.command(name="advance_season", description="Advance to the next season (Admin only).", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
+    @timed_command("advance_season")
     async def advance_season(interaction: discord.Interaction):
         result = season_mgr.advance_season()
+        await score_mgr.rollover_season(season_mgr.get_current_season_id())
         await interaction.response.send_message(f"✅ {result}", ephemeral=True)
 
+    @tree.command(name="season_results", description="Show the final standings of a finished season.", **guild_kw)
+    @app_commands.describe(season="Season number.")
+    @timed_command("season_results", defer=True, cold=NAME_LOOKUP_SECONDS)
+    async def season_results(interaction: discord.Interaction, season: app_commands.Range[int, 1]):
+        from utils.embeds import create_season_results_embed
+
+        guild = interaction.guild
+        if guild is None:
+            await respond(interaction, "Run this inside a server.", ephemeral=True)
+            return
+
+        summary = score_mgr.get_season_summary(str(season))
+        if summary is None:
+            await respond(interaction, f"No final standings recorded for Season {season}.", ephemeral=True)
+            return
+
+        season_name = season_mgr.data["seasons"].get(str(season), {}).get("name", f"Season {season}")
+        top_players = [(uid, pts) for uid, pts in summary["top_players"][:15]]
+        await prefetch_players(guild, top_players)
+        embed = create_season_results_embed(guild, season_name, summary, config_mgr)
+        await respond(interaction, embed=embed)
+
     @tree.command(name="advance_stage", description="Advance to the next stage (Admin only).", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
+    @timed_command("advance_stage")
     async def advance_stage(interaction: discord.Interaction):
         result = season_mgr.advance_stage()
         await interaction.response.send_message(f"✅ {result}", ephemeral=True)
@@ -478,13 +653,17 @@ def setup_commands(
         solution="The correct answer for the current stage",
         points="Points awarded for solving (default: 10)"
     )
+    @timed_command("set_solution")
     async def set_solution(interaction: discord.Interaction, solution: str, points: int = 10):
         result = season_mgr.set_stage_solution(solution, points)
         await interaction.response.send_message(f"✅ {result}", ephemeral=True)
 
     # Puzzle Commands
     @tree.command(name="puzzle_list", description="List all available puzzles.", **guild_kw)
+    @timed_command("puzzle_list")
     async def puzzle_list(interaction: discord.Interaction):
+        from utils.puzzle_embeds import create_puzzle_list_embed
+
         puzzles = puzzle_mgr.get_all_puzzles()
         if not puzzles:
             await interaction.response.send_message("No puzzles available.", ephemeral=True)
@@ -500,12 +679,15 @@ def setup_commands(
         veridian_channel="Channel for House Veridian",
         feathered_channel="Channel for Feathered Host"
     )
+    @timed_command("puzzle_activate")
     async def puzzle_activate(
         interaction: discord.Interaction, 
         puzzle_id: str,
         veridian_channel: discord.TextChannel,
         feathered_channel: discord.TextChannel
     ):
+        from utils.puzzle_embeds import create_puzzle_embed
+
         puzzle = puzzle_mgr.get_puzzle_by_id(puzzle_id)
         if not puzzle:
             await interaction.response.send_message(f"❌ Puzzle `{puzzle_id}` not found.", ephemeral=True)
@@ -521,13 +703,14 @@ def setup_commands(
         await feathered_channel.send(embed=feathered_embed)
         
         await interaction.response.send_message(
-            f"✅ Puzzle **{puzzle['title']}** activated in both house channels!", 
+            f"✅ Puzzle **{puzzle.title}** activated in both house channels!", 
             ephemeral=True
         )
 
     @tree.command(name="puzzle_deactivate", description="Deactivate a puzzle (Admin only).", **guild_kw)
     @is_admin_or_mod_check(config_mgr)
     @app_commands.describe(puzzle_id="The ID of the puzzle to deactivate")
+    @timed_command("puzzle_deactivate")
     async def puzzle_deactivate(interaction: discord.Interaction, puzzle_id: str):
         puzzle = puzzle_mgr.get_puzzle_by_id(puzzle_id)
         if not puzzle:
@@ -536,6 +719,6 @@ def setup_commands(
         
         puzzle_mgr.deactivate_puzzle(puzzle_id)
         await interaction.response.send_message(
-            f"✅ Puzzle **{puzzle['title']}** deactivated.", 
+            f"✅ Puzzle **{puzzle.title}** deactivated.", 
             ephemeral=True
         )
@@ -64,11 +64,21 @@ class ConfigManager:
     def get_display_message_id(self) -> str:
         return str(self._config.get("display", {}).get("message_id") or "").strip()
 
+    def get_display_message_ids(self) -> List[str]:
+        """All display message ids in order; older configs only have ``message_id``."""
+        display = self._config.get("display", {})
+        ids = display.get("message_ids")
+        if isinstance(ids, list) and ids:
+            return [str(i).strip() for i in ids if str(i).strip()]
+        single = self.get_display_message_id()
+        return [single] if single else []
+
     def get_log_channel_id(self) -> str:
         return str(self._config.get("channels", {}).get("log") or "").strip()
 
-    def set_display_settings(self, channel_id: str, message_id: str) -> None:
+    def set_display_settings(self, channel_id: str, message_ids: List[str]) -> None:
         d = self._config.setdefault("display", {})
         d["channel_id"] = channel_id
-        d["message_id"] = message_id
+        d["message_id"] = message_ids[0] if message_ids else ""
+        d["message_ids"] = list(message_ids)
         self.save()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+from typing import Dict, Sequence, Union
+from array import array
+
+from storage.records import ScoreEvent
+from storage.snapshot import TARGET_PLAYER, SnapshotEvents
+
+Key = Union[int, str]
+
+class EventIndex:
+    """Offsets into the event log by target id and by actor id.
+
+    Player targets and actors are keyed by snowflake, house targets by their
+    house key. Offsets are stored in ascending order, so a player's latest
+    events are read from the end of their list without touching the rest
+    of the log.
+    """
+
+    def __init__(self):
+        self._by_target: Dict[Key, array] = {}
+        self._by_actor: Dict[int, array] = {}
+
+    @classmethod
+    def build(cls, events: Sequence[ScoreEvent]) -> "EventIndex":
+        index = cls()
+        base = getattr(events, "base", events)
+        start = 0
+        if isinstance(base, SnapshotEvents):
+            # Read the id columns directly instead of decoding every event
+            index._add_snapshot(base)
+            start = len(base)
+        for offset in range(start, len(events)):
+            index.add(offset, events[offset])
+        return index
+
+    def _add_snapshot(self, events: SnapshotEvents) -> None:
+        snap = events.snapshot
+        ids = snap.column("ids")
+        targets = snap.column("ev_target")
+        refs = snap.column("ev_target_ref")
+        actors = snap.column("ev_actor")
+        for offset in range(snap.event_count):
+            ref = refs[offset]
+            key = ids[ref] if targets[offset] == TARGET_PLAYER else snap.string(ref)
+            self._append(self._by_target, key, offset)
+            self._append(self._by_actor, ids[actors[offset]], offset)
+
+    @staticmethod
+    def _append(table: Dict, key: Key, offset: int) -> None:
+        offsets = table.get(key)
+        if offsets is None:
+            offsets = table[key] = array("Q")
+        offsets.append(offset)
+
+    def add(self, offset: int, event: ScoreEvent) -> None:
+        self._append(self._by_target, event.target_id, offset)
+        self._append(self._by_actor, event.actor_id, offset)
+
+    def for_target(self, target_id: Key) -> Sequence[int]:
+        return self._by_target.get(target_id, ())
+
+    def for_actor(self, actor_id: int) -> Sequence[int]:
+        return self._by_actor.get(actor_id, ())
+
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING
+import time
 
 import discord
 from discord import app_commands
@@ -10,9 +11,9 @@ if TYPE_CHECKING:
     from bot.scoring import ScoreManager
     from bot.config import ConfigManager
 
-from utils.puzzle_embeds import create_puzzle_solved_embed, create_wrong_answer_embed
-from utils.helpers import title_case_house
-from utils.display import update_display_message
+from bot.tree_cache import sync_if_changed
+from utils.metrics import incr, resident_memory_mb, timed, timer
+from utils.names import display_names
 
 def setup_events(
     bot: commands.Bot, 
@@ -26,21 +27,62 @@ def setup_events(
     async def on_ready():
         target_guild = discord.Object(id=int(dev_guild_id)) if dev_guild_id and dev_guild_id.isdigit() else None
         try:
-            if target_guild:
-                await tree.sync(guild=target_guild)
-            else:
-                await tree.sync()
-            print(f"[House Ledger] Logged in as {bot.user} | Commands synced")
+            with timer("discord.sync_commands"):
+                synced = await sync_if_changed(tree, target_guild)
+            print(f"[House Ledger] Logged in as {bot.user} | {'Commands synced' if synced else 'Commands unchanged, sync skipped'}")
         except Exception as e:
             print(f"[House Ledger] Command sync failed: {e}")
+
+        # on_ready fires again after reconnects; only the first one is startup
+        started_at = getattr(bot, "started_at", None)
+        if started_at is not None and not getattr(bot, "startup_logged", True):
+            bot.startup_logged = True
+            rss = resident_memory_mb()
+            rss_text = f"{rss:.1f} MB" if rss is not None else "n/a"
+            print(f"[House Ledger] Ready in {time.perf_counter() - started_at:.2f}s | RSS {rss_text}")
     
+    # Keep leaderboard names current, including for members who leave
+    @bot.event
+    async def on_member_join(member: discord.Member):
+        display_names.update_member(member)
+
+    @bot.event
+    async def on_member_update(before: discord.Member, after: discord.Member):
+        if before.display_name != after.display_name:
+            display_names.update_member(after)
+
+    @bot.event
+    async def on_member_remove(member: discord.Member):
+        display_names.update_member(member)
+
     @bot.event
+    async def on_user_update(before: discord.User, after: discord.User):
+        display_names.update_user(after)
+
+    @bot.event
+    async def on_interaction(interaction: discord.Interaction):
+        shard_stats = getattr(bot, "shard_stats", None)
+        if shard_stats is not None and interaction.guild:
+            shard_stats.record(interaction.guild.shard_id)
+        trace_recorder = getattr(bot, "trace_recorder", None)
+        if trace_recorder is not None:
+            trace_recorder.record_interaction(interaction)
+
+    @bot.event
+    @timed("events.on_message")
     async def on_message(message: discord.Message):
         if message.author.bot:
             return
         
         if not message.guild:
             return
+
+        shard_stats = getattr(bot, "shard_stats", None)
+        if shard_stats is not None:
+            shard_stats.record(message.guild.shard_id)
+        trace_recorder = getattr(bot, "trace_recorder", None)
+        if trace_recorder is not None:
+            trace_recorder.record_message(message)
         
         channel_id = str(message.channel.id)
         puzzle = puzzle_mgr.get_puzzle_for_channel(channel_id)
@@ -55,8 +97,8 @@ def setup_events(
         house_key = None
         role_ids = config_mgr.get_house_role_ids()
         
-        veridian_channel = puzzle.get("house_veridian_channel", "")
-        feathered_channel = puzzle.get("feathered_host_channel", "")
+        veridian_channel = puzzle.house_veridian_channel or ""
+        feathered_channel = puzzle.feathered_host_channel or ""
         
         if channel_id == veridian_channel:
             house_key = "house_veridian"
@@ -78,19 +120,24 @@ def setup_events(
             return
         
         answer = message.content.strip()
+        incr("puzzles.answers")
+        # Rendering modules are only needed once a puzzle answer comes in
+        from utils.puzzle_embeds import create_puzzle_solved_embed, create_wrong_answer_embed
         
-        if puzzle_mgr.check_solution(puzzle["id"], answer):
-            puzzle_mgr.mark_solved(puzzle["id"], str(member.id), house_key)
+        if puzzle_mgr.check_solution(puzzle.id, answer):
+            puzzle_mgr.mark_solved(puzzle.id, str(member.id), house_key, guild_id=message.guild.id)
             
-            points = puzzle.get("points", 10)
+            points = puzzle.points
             await score_mgr.add_points(
                 guild=message.guild,
                 actor_id=member.id,
                 target="player",
                 target_id=str(member.id),
                 base_points=points,
-                reason=f"Solved puzzle: {puzzle['title']}",
-                weighted=True
+                reason=f"Solved puzzle: {puzzle.title}",
+                weighted=True,
+                idempotency_key=f"message:{message.id}",
+                solve=True
             )
             
             solved_embed = create_puzzle_solved_embed(
@@ -99,26 +146,10 @@ def setup_events(
                 house=house_key,
                 points_awarded=points
             )
-            await message.channel.send(embed=solved_embed)
-            
-            await update_display_message(message.guild, config_mgr, score_mgr)
-            
-            log_channel_id = config_mgr.get_log_channel_id()
-            if log_channel_id:
-                try:
-                    log_channel = message.guild.get_channel(int(log_channel_id))
-                    if log_channel:
-                        log_embed = discord.Embed(
-                            title="🧩 Puzzle Solved!",
-                            description=f"**{member.display_name}** from **{title_case_house(house_key)}** solved **{puzzle['title']}**!",
-                            color=0x27ae60,
-                            timestamp=discord.utils.utcnow()
-                        )
-                        log_embed.add_field(name="Points Awarded", value=f"{points} points (weighted)", inline=False)
-                        await log_channel.send(embed=log_embed)
-                except Exception:
-                    pass
+            with timer("discord.send_message"):
+                await message.channel.send(embed=solved_embed)
         else:
             wrong_embed = create_wrong_answer_embed(house_key)
-            msg = await message.channel.send(embed=wrong_embed)
+            with timer("discord.send_message"):
+                msg = await message.channel.send(embed=wrong_embed)
             await msg.delete(delay=5.0)
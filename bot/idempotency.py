@@ -0,0 +1,50 @@
+from __future__ import annotations
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+
+from bot.rollups import DAY
+from storage.records import now_micros
+
+# Retried interactions and replayed gateway events arrive within minutes
+AWARD_KEY_TTL = DAY
+MAX_AWARD_KEYS = 10_000
+
+class AwardKeys:
+    """Idempotency keys of recent awards, with the result each one produced.
+
+    Wraps the ``award_keys`` dict of the scores payload ({key: [timestamp,
+    player points, house points]}), so it is saved with the event log. A
+    deque holds the keys oldest first, so checking a key and expiring old
+    ones are both O(1). Keys are kept for at most ``ttl`` microseconds and
+    at most ``max_keys`` at a time.
+    """
+
+    def __init__(self, data: Dict[str, List[int]], ttl: int = AWARD_KEY_TTL, max_keys: int = MAX_AWARD_KEYS):
+        self.data = data
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._order: Deque[Tuple[int, str]] = deque(sorted((entry[0], key) for key, entry in data.items()))
+
+    def _expire(self, now: int) -> None:
+        oldest = now - self.ttl
+        while self._order and (self._order[0][0] < oldest or len(self._order) > self.max_keys):
+            timestamp, key = self._order.popleft()
+            entry = self.data.get(key)
+            # A key reused after expiring has a newer entry of its own in the deque
+            if entry is not None and entry[0] == timestamp:
+                del self.data[key]
+
+    def get(self, key: str, now: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """(player points, house points) awarded under ``key``, or None if it is unused or expired."""
+        self._expire(now_micros() if now is None else now)
+        entry = self.data.get(key)
+        return None if entry is None else (entry[1], entry[2])
+
+    def add(self, key: str, player_points: int, house_points: int, now: Optional[int] = None) -> None:
+        now = now_micros() if now is None else now
+        self.data[key] = [now, player_points, house_points]
+        self._order.append((now, key))
+        self._expire(now)
+
+    def __len__(self) -> int:
+        return len(self.data)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+from typing import Optional, Tuple, TYPE_CHECKING
+from collections import OrderedDict
+import math
+
+import discord
+
+from utils.metrics import incr
+from utils.names import prefetch_players
+
+if TYPE_CHECKING:
+    from bot.config import ConfigManager
+    from bot.scoring import ScoreManager
+
+PAGE_SIZE = 20
+BROWSE_CUSTOM_ID = "houseledger:ranking:browse"
+
+class RankingPages:
+    """Renders pages of the full player ranking on demand.
+
+    Pages come straight from the score manager's ranking index and are
+    cached per (guild, score version, page), so browsing a large ranking
+    renders each page once per score change instead of once per click.
+    """
+
+    def __init__(self, score_mgr: ScoreManager, config_mgr: ConfigManager, page_size: int = PAGE_SIZE, max_cached: int = 64):
+        self._score_mgr = score_mgr
+        self._config_mgr = config_mgr
+        self.page_size = page_size
+        self._max_cached = max_cached
+        self._cache: "OrderedDict[Tuple[int, int, int], discord.Embed]" = OrderedDict()
+
+    def page_count(self) -> int:
+        return max(1, math.ceil(len(self._score_mgr.ranking) / self.page_size))
+
+    def page_of(self, user_id: str) -> Optional[int]:
+        rank = self._score_mgr.ranking.rank_of(user_id)
+        return None if rank is None else (rank - 1) // self.page_size
+
+    def _clamp(self, page: int) -> int:
+        return min(max(page, 0), self.page_count() - 1)
+
+    async def prefetch(self, guild: discord.Guild, page: int) -> None:
+        """Resolve names for a page's rows; call before ``render`` when the page may not be cached."""
+        page = self._clamp(page)
+        if (guild.id, self._score_mgr.version, page) in self._cache:
+            return
+        start = page * self.page_size
+        await prefetch_players(guild, self._score_mgr.ranking.slice(start, start + self.page_size))
+
+    def render(self, guild: discord.Guild, page: int) -> discord.Embed:
+        from utils.embeds import create_ranking_page_embed
+
+        page_count = self.page_count()
+        page = self._clamp(page)
+        key = (guild.id, self._score_mgr.version, page)
+        embed = self._cache.get(key)
+        if embed is not None:
+            self._cache.move_to_end(key)
+            incr("ranking.page_cache.hits")
+            return embed
+
+        incr("ranking.page_cache.misses")
+        ranking = self._score_mgr.ranking
+        start = page * self.page_size
+        rows = [(start + i + 1, uid, pts) for i, (uid, pts) in enumerate(ranking.slice(start, start + self.page_size))]
+        embed = create_ranking_page_embed(guild, rows, page, page_count, len(ranking), self._config_mgr)
+        self._cache[key] = embed
+        if len(self._cache) > self._max_cached:
+            self._cache.popitem(last=False)
+        return embed
+
+
+class RankingView(discord.ui.View):
+    """First/previous/next/last buttons for one user's view of the ranking."""
+
+    def __init__(self, pages: RankingPages, page: int = 0, owner_id: Optional[int] = None, timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.page = page
+        self.owner_id = owner_id
+        self._sync_buttons()
+
+    def _sync_buttons(self) -> None:
+        last = self.pages.page_count() - 1
+        self.page = min(max(self.page, 0), last)
+        self.first.disabled = self.prev.disabled = self.page == 0
+        self.next.disabled = self.last.disabled = self.page >= last
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.owner_id is not None and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("Use `/leaderboard` to browse the rankings yourself.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, page: int) -> None:
+        self.page = page
+        self._sync_buttons()
+        await self.pages.prefetch(interaction.guild, self.page)
+        await interaction.response.edit_message(embed=self.pages.render(interaction.guild, self.page), view=self)
+
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, 0)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def prev(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.pages.page_count() - 1)
+
+
+class BrowseRankingView(discord.ui.View):
+    """Persistent "Browse rankings" button for the live display.
+
+    Each click opens a private, pageable copy of the ranking starting at the
+    clicking player's own page. Register it with ``bot.add_view`` at startup
+    so the button keeps working after restarts.
+    """
+
+    def __init__(self, pages: RankingPages):
+        super().__init__(timeout=None)
+        self.pages = pages
+
+    @discord.ui.button(label="Browse full rankings", emoji="📜", style=discord.ButtonStyle.secondary, custom_id=BROWSE_CUSTOM_ID)
+    async def browse(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.guild is None:
+            return
+        page = self.pages.page_of(str(interaction.user.id)) or 0
+        view = RankingView(self.pages, page=page, owner_id=interaction.user.id)
+        await self.pages.prefetch(interaction.guild, view.page)
+        await interaction.response.send_message(embed=self.pages.render(interaction.guild, view.page), view=view, ephemeral=True)
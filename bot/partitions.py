@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+
+from storage.records import micros_to_iso, now_micros
+from bot.ranking import RankingIndex
+
+# Players kept in a finished season's summary
+FROZEN_TOP_PLAYERS = 100
+
+class SeasonPartition:
+    """Totals of the current season, kept beside the all-time totals.
+
+    Wraps the ``season`` dict of the scores payload. Events are appended in
+    time order, so a season's awards are the contiguous slice of the event
+    log starting at ``first_event``; the partition records that offset
+    instead of tagging every event.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self._ranking: Optional[RankingIndex] = None
+
+    @classmethod
+    def new(
+        cls,
+        season_id: str,
+        first_event: int,
+        houses: Optional[Dict[str, int]] = None,
+        players: Optional[Dict[str, int]] = None
+    ) -> "SeasonPartition":
+        return cls({
+            "id": season_id,
+            "first_event": first_event,
+            "houses": dict(houses or {}),
+            "players": dict(players or {})
+        })
+
+    @property
+    def season_id(self) -> str:
+        return self.data["id"]
+
+    @property
+    def ranking(self) -> RankingIndex:
+        if self._ranking is None:
+            self._ranking = RankingIndex(self.data["players"])
+        return self._ranking
+
+    def add(self, *, house_key: Optional[str], house_points: int, user_id: Optional[str], player_points: int) -> None:
+        if house_key:
+            houses = self.data["houses"]
+            houses[house_key] = houses.get(house_key, 0) + house_points
+        if user_id:
+            players = self.data["players"]
+            players[user_id] = players.get(user_id, 0) + player_points
+            if self._ranking is not None:
+                self._ranking.update(user_id, players[user_id])
+
+    def freeze(self, last_event: int) -> Dict[str, Any]:
+        """Compact final standings: house totals and the top players, read off the ranking."""
+        return {
+            "first_event": self.data["first_event"],
+            "last_event": last_event,
+            "ended": micros_to_iso(now_micros()),
+            "houses": dict(self.data["houses"]),
+            "top_players": [[uid, pts] for uid, pts in self.ranking.top(FROZEN_TOP_PLAYERS)],
+            "player_count": len(self.data["players"])
+        }
@@ -1,47 +1,76 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import json
-from datetime import datetime
+
+from storage.records import Puzzle, PuzzleSolve, local_now_micros
+from bot.bus import PuzzleSolved, bus
+
+if TYPE_CHECKING:
+    from storage.async_storage import AsyncStorage
 
 class PuzzleManager:
-    def __init__(self, puzzle_file: str = "puzzles.json"):
+    def __init__(self, puzzle_file: str = "puzzles.json", io: Optional["AsyncStorage"] = None):
         self.puzzle_file = puzzle_file
+        self._io = io
         self._puzzles = self._load_puzzles()
     
     def _load_puzzles(self) -> Dict[str, Any]:
         """Load puzzles from JSON file"""
         try:
             with open(self.puzzle_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
         except FileNotFoundError:
             return {"puzzles": []}
+        # Active puzzles are decoded now; the rest of the catalog stays raw
+        # until a lookup or listing touches it.
+        data["puzzles"] = [Puzzle.from_dict(p) if p.get("active") else p for p in data.get("puzzles", [])]
+        return data
+
+    def _decoded(self, index: int) -> Puzzle:
+        puzzles = self._puzzles["puzzles"]
+        puzzle = puzzles[index]
+        if not isinstance(puzzle, Puzzle):
+            puzzle = puzzles[index] = Puzzle.from_dict(puzzle)
+        return puzzle
     
     def _save_puzzles(self) -> None:
-        """Save puzzles to JSON file"""
+        """Save puzzles to JSON file, off the event loop when an io facade is set"""
+        # Puzzle records change in place, so they are encoded here, on the loop
+        payload = {**self._puzzles, "puzzles": [p.to_dict() if isinstance(p, Puzzle) else p for p in self._puzzles.get("puzzles", [])]}
+        if self._io is not None:
+            self._io.submit(self.puzzle_file, self._write_puzzles, payload=payload)
+        else:
+            self._write_puzzles(payload)
+
+    def _write_puzzles(self, payload: Dict[str, Any]) -> None:
         with open(self.puzzle_file, 'w', encoding='utf-8') as f:
-            json.dump(self._puzzles, f, indent=2, ensure_ascii=False)
+            json.dump(payload, f, indent=2, ensure_ascii=False)
     
-    def get_all_puzzles(self) -> List[Dict[str, Any]]:
+    def get_all_puzzles(self) -> List[Puzzle]:
         """Get all puzzles"""
-        return self._puzzles.get("puzzles", [])
+        return [self._decoded(i) for i in range(len(self._puzzles.get("puzzles", [])))]
     
-    def get_puzzle_by_id(self, puzzle_id: str) -> Optional[Dict[str, Any]]:
+    def get_puzzle_by_id(self, puzzle_id: str) -> Optional[Puzzle]:
         """Get a specific puzzle by ID"""
-        for puzzle in self._puzzles.get("puzzles", []):
-            if puzzle.get("id") == puzzle_id:
-                return puzzle
+        for i, puzzle in enumerate(self._puzzles.get("puzzles", [])):
+            if isinstance(puzzle, Puzzle):
+                if puzzle.id == puzzle_id:
+                    return puzzle
+            elif puzzle.get("id") == puzzle_id:
+                return self._decoded(i)
         return None
     
-    def get_active_puzzles(self) -> List[Dict[str, Any]]:
+    def get_active_puzzles(self) -> List[Puzzle]:
         """Get all active puzzles"""
-        return [p for p in self._puzzles.get("puzzles", []) if p.get("active", False)]
+        # Undecoded entries are never active: activation decodes them first
+        return [p for p in self._puzzles.get("puzzles", []) if isinstance(p, Puzzle) and p.active]
     
     def activate_puzzle(self, puzzle_id: str) -> bool:
         """Activate a puzzle"""
         puzzle = self.get_puzzle_by_id(puzzle_id)
         if puzzle:
-            puzzle["active"] = True
-            puzzle["solved_by"] = None
+            puzzle.active = True
+            puzzle.solved_by = None
             self._save_puzzles()
             return True
         return False
@@ -50,22 +79,26 @@ class PuzzleManager:
         """Deactivate a puzzle"""
         puzzle = self.get_puzzle_by_id(puzzle_id)
         if puzzle:
-            puzzle["active"] = False
+            puzzle.active = False
             self._save_puzzles()
             return True
         return False
     
-    def mark_solved(self, puzzle_id: str, user_id: str, house: str) -> bool:
+    def mark_solved(self, puzzle_id: str, user_id: str, house: str, guild_id: Optional[int] = None) -> bool:
         """Mark a puzzle as solved"""
         puzzle = self.get_puzzle_by_id(puzzle_id)
         if puzzle:
-            puzzle["solved_by"] = {
-                "user_id": user_id,
-                "house": house,
-                "timestamp": datetime.now().isoformat()
-            }
-            puzzle["active"] = False
+            puzzle.solved_by = PuzzleSolve(user_id=int(user_id), house=house, timestamp=local_now_micros(), naive=True)
+            puzzle.active = False
             self._save_puzzles()
+            bus.publish(PuzzleSolved(
+                guild_id=guild_id,
+                puzzle_id=puzzle.id,
+                title=puzzle.title,
+                user_id=int(user_id),
+                house_key=house,
+                points=puzzle.points
+            ))
             return True
         return False
     
@@ -73,16 +106,16 @@ class PuzzleManager:
         """Check if an answer is correct"""
         puzzle = self.get_puzzle_by_id(puzzle_id)
         if puzzle:
-            solution = puzzle.get("solution", "").lower().strip()
+            solution = puzzle.solution.lower().strip()
             return answer.lower().strip() == solution
         return False
     
-    def get_puzzle_for_channel(self, channel_id: str) -> Optional[Dict[str, Any]]:
+    def get_puzzle_for_channel(self, channel_id: str) -> Optional[Puzzle]:
         """Get active puzzle for a specific channel"""
         channel_id = str(channel_id)
         for puzzle in self.get_active_puzzles():
-            if (puzzle.get("house_veridian_channel") == channel_id or 
-                puzzle.get("feathered_host_channel") == channel_id):
+            if (puzzle.house_veridian_channel == channel_id or 
+                puzzle.feathered_host_channel == channel_id):
                 return puzzle
         return None
     
@@ -90,8 +123,8 @@ class PuzzleManager:
         """Set the channels for a puzzle"""
         puzzle = self.get_puzzle_by_id(puzzle_id)
         if puzzle:
-            puzzle["house_veridian_channel"] = veridian_channel
-            puzzle["feathered_host_channel"] = feathered_channel
+            puzzle.house_veridian_channel = veridian_channel
+            puzzle.feathered_host_channel = feathered_channel
             self._save_puzzles()
             return True
         return False
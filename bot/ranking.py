@@ -0,0 +1,42 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left, insort
+
+class RankingIndex:
+    """Players ordered by points (highest first, ties by user id), kept sorted as scores change.
+
+    Building it sorts once; each score change after that is a binary search
+    plus one list insert, so top-N and page slices never re-sort all players.
+    """
+
+    def __init__(self, players: Dict[str, int]):
+        self._points: Dict[str, int] = {uid: int(pts) for uid, pts in players.items()}
+        self._keys: List[Tuple[int, str]] = sorted((-pts, uid) for uid, pts in self._points.items())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, user_id: str, points: int) -> None:
+        old = self._points.get(user_id)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, user_id))]
+        self._points[user_id] = points
+        insort(self._keys, (-points, user_id))
+
+    def remove(self, user_id: str) -> None:
+        old = self._points.pop(user_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (-old, user_id))]
+
+    def slice(self, start: int, stop: int) -> List[Tuple[str, int]]:
+        return [(uid, -neg) for neg, uid in self._keys[start:stop]]
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        return self.slice(0, limit)
+
+    def rank_of(self, user_id: str) -> Optional[int]:
+        """1-based position of ``user_id``, or None if they have no score."""
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return bisect_left(self._keys, (-points, user_id)) + 1
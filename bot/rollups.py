@@ -0,0 +1,154 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+
+from storage.records import ScoreEvent, now_micros
+from bot.ranking import RankingIndex
+
+HOUR = 3600 * 1_000_000
+DAY = 24 * HOUR
+
+# period: (bucket size in microseconds, buckets kept)
+WINDOWS = {
+    "week": (HOUR, 7 * 24),
+    "month": (DAY, 30),
+}
+
+def _events_since(events: Sequence[ScoreEvent], start: int) -> range:
+    """Offsets of the trailing events at or after ``start``; the log is appended in time order."""
+    i = len(events)
+    while i > 0 and events[i - 1].timestamp >= start:
+        i -= 1
+    return range(i, len(events))
+
+
+class WindowTotals:
+    """Player points over the last ``span`` buckets, kept as running totals.
+
+    Each award is added to its bucket and to the totals; buckets that fall
+    out of the window are subtracted again as a whole, so the totals and
+    their ranking never need a scan of the event log.
+    """
+
+    def __init__(self, bucket: int, span: int):
+        self.bucket = bucket
+        self.span = span
+        self._buckets: "OrderedDict[int, Dict[str, int]]" = OrderedDict()
+        self.players: Dict[str, int] = {}
+        self.ranking = RankingIndex({})
+
+    def start(self, now: int) -> int:
+        """Earliest timestamp still inside the window at ``now``."""
+        return (now // self.bucket - self.span + 1) * self.bucket
+
+    def _set(self, user_id: str, points: int) -> None:
+        if points:
+            self.players[user_id] = points
+            self.ranking.update(user_id, points)
+        elif user_id in self.players:
+            del self.players[user_id]
+            self.ranking.remove(user_id)
+
+    def advance(self, now: int) -> None:
+        oldest = now // self.bucket - self.span + 1
+        while self._buckets:
+            key = next(iter(self._buckets))
+            if key >= oldest:
+                break
+            for user_id, pts in self._buckets.pop(key).items():
+                self._set(user_id, self.players.get(user_id, 0) - pts)
+
+    def add(self, timestamp: int, user_id: str, points: int) -> None:
+        key = timestamp // self.bucket
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if self._buckets and key < next(reversed(self._buckets)):
+                # Out-of-order timestamp (older naive entries); keep buckets sorted for eviction
+                self._buckets[key] = {}
+                self._buckets = OrderedDict(sorted(self._buckets.items()))
+                bucket = self._buckets[key]
+            else:
+                bucket = self._buckets[key] = {}
+        bucket[user_id] = bucket.get(user_id, 0) + points
+        self._set(user_id, self.players.get(user_id, 0) + points)
+
+
+class Rollups:
+    """Rolling player totals per period, fed by each award.
+
+    Built from the tail of the event log covering the longest window, so
+    startup cost depends on recent activity rather than on the size of
+    the whole history.
+    """
+
+    def __init__(self, events: Sequence[ScoreEvent], now: Optional[int] = None):
+        now = now_micros() if now is None else now
+        self.windows = {name: WindowTotals(bucket, span) for name, (bucket, span) in WINDOWS.items()}
+        start = min(w.start(now) for w in self.windows.values())
+        for offset in _events_since(events, start):
+            self._add_to(self.windows.values(), events[offset])
+
+    @staticmethod
+    def _add_to(totals, event: ScoreEvent) -> None:
+        if event.target != "player" or not event.player_points_awarded:
+            return
+        user_id = str(event.target_id)
+        for t in totals:
+            t.add(event.timestamp, user_id, event.player_points_awarded)
+
+    def add(self, event: ScoreEvent) -> None:
+        self._add_to(self.windows.values(), event)
+
+    def window(self, name: str, now: Optional[int] = None) -> WindowTotals:
+        totals = self.windows[name]
+        totals.advance(now_micros() if now is None else now)
+        return totals
+
+
+# Days of house history kept for charts
+HOUSE_SERIES_DAYS = 90
+
+class HouseSeries:
+    """House points gained per UTC day, for house-over-time charts.
+
+    Wraps the ``house_daily`` dict of the scores payload ({day number:
+    {house: points}}), so it is saved with the scores. Days older than
+    HOUSE_SERIES_DAYS are dropped as new days start. ``version`` changes
+    only when house points do, so charts can be cached on it.
+    """
+
+    def __init__(self, data: Dict[str, Dict[str, int]]):
+        self.data = data
+        self.version = 0
+
+    def add(self, timestamp: int, house_key: str, points: int) -> None:
+        if not points:
+            return
+        day = str(timestamp // DAY)
+        bucket = self.data.get(day)
+        if bucket is None:
+            bucket = self.data[day] = {}
+            oldest = timestamp // DAY - HOUSE_SERIES_DAYS + 1
+            for key in [k for k in self.data if int(k) < oldest]:
+                del self.data[key]
+        bucket[house_key] = bucket.get(house_key, 0) + points
+        self.version += 1
+
+    def cumulative(self, totals: Dict[str, int], days: int, now: Optional[int] = None) -> Tuple[List[int], Dict[str, List[int]]]:
+        """End-of-day totals per house for the last ``days`` days, worked back from the current ``totals``.
+
+        Returns (day numbers, {house: totals}), oldest first. Days before the
+        series began show the earliest known total.
+        """
+        now = now_micros() if now is None else now
+        today = now // DAY
+        day_numbers = list(range(today - days + 1, today + 1))
+        series: Dict[str, List[int]] = {}
+        for house_key, total in totals.items():
+            values = [0] * days
+            running = total
+            for i in range(days - 1, -1, -1):
+                values[i] = running
+                running -= self.data.get(str(day_numbers[i]), {}).get(house_key, 0)
+            series[house_key] = values
+        return day_numbers, series
@@ -1,13 +1,21 @@
 from __future__ import annotations
 from typing import Dict, Any, Optional, Tuple, List
-from datetime import datetime, timezone
+import asyncio
 
 import discord
 
 from storage.base import StorageBase
+from storage.records import EventLog, ScoreEvent, now_micros
 from bot.config import ConfigManager
+from bot.ranking import RankingIndex
+from bot.event_index import EventIndex
+from bot.rollups import HouseSeries, Rollups
+from bot.partitions import SeasonPartition
+from bot.idempotency import AwardKeys
+from bot.bus import PointsAwarded, bus
 from utils.weights import get_house_member_counts, compute_multiplier
 from utils.helpers import apply_rounding
+from utils.metrics import incr, timed
 
 DEFAULT_SCORES: Dict[str, Any] = {
     "houses": {"house_veridian": 0, "feathered_host": 0},
@@ -15,16 +23,54 @@ DEFAULT_SCORES: Dict[str, Any] = {
     "events": []
 }
 
+# Puzzle ("Solved puzzle: ...") and /submit ("Solved <stage>") award reasons
+# before solves were marked on the event
+LEGACY_SOLVE_PREFIX = "Solved"
+
 class ScoreManager:
     def __init__(self, storage: StorageBase, config_mgr: ConfigManager):
         self._storage = storage
         self._config_mgr = config_mgr
         self._scores = self._storage.load_scores(default_payload=DEFAULT_SCORES)
+        # Totals are ready now; the event history is decoded on first access
+        # through `events`, and new awards append without touching it. The
+        # snapshot backend never reads the history here; the JSON backend has
+        # already parsed the whole file, so only the decoding is deferred.
+        events = self._scores.get("events", [])
+        if not isinstance(events, EventLog):
+            events = EventLog(events)
+        self._scores["events"] = events
+        # Events logged before solve awards carried a marker are classified
+        # by their reason instead; see `get_player_history`
+        self._unmarked_events = self._scores.setdefault("solve_marked_from", len(events))
+        self._history_loaded = False
+        # Shards share one event loop; awards are serialized so a total's
+        # read-modify-write and the save after it never interleave.
+        self._lock = asyncio.Lock()
+        # Bumped on every score change; caches of rendered standings key on it
+        self.version = 0
+        self._ranking: Optional[RankingIndex] = None
+        self._event_index: Optional[EventIndex] = None
+        self._rollups: Optional[Rollups] = None
+        self.house_series = HouseSeries(self._scores.setdefault("house_daily", {}))
+        self.award_keys = AwardKeys(self._scores.setdefault("award_keys", {}))
+        season = self._scores.get("season")
+        self._season: Optional[SeasonPartition] = SeasonPartition(season) if season else None
 
     @property
     def data(self) -> Dict[str, Any]:
         return self._scores
 
+    @property
+    def events(self) -> EventLog:
+        """Full award history as ScoreEvent records, decoded on first access."""
+        log: EventLog = self._scores["events"]
+        if not self._history_loaded:
+            if isinstance(log.base, list):
+                log.base = [e if isinstance(e, ScoreEvent) else ScoreEvent.from_dict(e) for e in log.base]
+            self._history_loaded = True
+        return log
+
     def save(self) -> None:
         self._storage.save_scores(self._scores)
 
@@ -34,11 +80,96 @@ class ScoreManager:
     def get_player_total(self, user_id: int) -> int:
         return int(self._scores.get("players", {}).get(str(user_id), 0))
 
+    @property
+    def ranking(self) -> RankingIndex:
+        """All players by points, built on first use and updated by each award."""
+        if self._ranking is None:
+            self._ranking = RankingIndex(self._scores.get("players", {}))
+        return self._ranking
+
     def get_top_players(self, limit: int = 10) -> List[Tuple[str, int]]:
-        players = self._scores.get("players", {})
-        sorted_players = sorted(players.items(), key=lambda kv: kv[1], reverse=True)
-        return sorted_players[:limit]
+        return self.ranking.top(limit)
+
+    @property
+    def event_index(self) -> EventIndex:
+        """Event offsets by target and actor, built from the log on first use and extended by each award."""
+        if self._event_index is None:
+            self._event_index = EventIndex.build(self.events)
+        return self._event_index
 
+    @property
+    def rollups(self) -> Rollups:
+        """Weekly and monthly player totals, built on first use and fed by each award."""
+        if self._rollups is None:
+            self._rollups = Rollups(self.events)
+        return self._rollups
+
+    def period_ranking(self, period: Optional[str] = None) -> RankingIndex:
+        """Ranking for "week", "month" or the current "season"; all-time otherwise."""
+        if period in ("week", "month"):
+            return self.rollups.window(period).ranking
+        if period == "season" and self._season is not None:
+            return self._season.ranking
+        return self.ranking
+
+    def bind_season(self, season_id: str) -> None:
+        """Attach the live partition to the current season, rolling over if seasons advanced meanwhile.
+
+        Scores saved before partitions existed all count toward the season
+        that is current when they are first bound.
+        """
+        if self._season is None:
+            self._season = SeasonPartition.new(
+                season_id, 0, self._scores.get("houses", {}), self._scores.get("players", {})
+            )
+            self._scores["season"] = self._season.data
+            self.save()
+        elif self._season.season_id != season_id:
+            self._rollover(season_id)
+
+    async def rollover_season(self, season_id: str) -> Optional[Dict[str, Any]]:
+        """Freeze the current season's partition and start an empty one for ``season_id``."""
+        async with self._lock:
+            return self._rollover(season_id)
+
+    def _rollover(self, season_id: str) -> Optional[Dict[str, Any]]:
+        summary = None
+        first_event = len(self._scores["events"])
+        if self._season is not None:
+            summary = self._season.freeze(first_event)
+            self._scores.setdefault("season_archive", {})[self._season.season_id] = summary
+        self._season = SeasonPartition.new(season_id, first_event)
+        self._scores["season"] = self._season.data
+        self.version += 1
+        self.save()
+        return summary
+
+    def get_season_summary(self, season_id: str) -> Optional[Dict[str, Any]]:
+        """Final standings of a finished season, as frozen at rollover."""
+        return self._scores.get("season_archive", {}).get(season_id)
+
+    def get_player_history(self, user_id: int, limit: int = 5) -> Tuple[List[ScoreEvent], List[ScoreEvent], int]:
+        """Returns (latest awards, latest solves, total solves) for a player, newest first.
+
+        Reads only the player's own events, never the whole log.
+        """
+        awards: List[ScoreEvent] = []
+        solves: List[ScoreEvent] = []
+        solve_count = 0
+        events = self.events
+        offsets = self.event_index.for_target(int(user_id))
+        for i in range(len(offsets) - 1, -1, -1):
+            offset = offsets[i]
+            event = events[offset]
+            if event.solve or (offset < self._unmarked_events and event.reason.startswith(LEGACY_SOLVE_PREFIX)):
+                solve_count += 1
+                if len(solves) < limit:
+                    solves.append(event)
+            elif len(awards) < limit:
+                awards.append(event)
+        return awards, solves, solve_count
+
+    @timed("scores.add_points")
     async def add_points(
         self,
         *,
@@ -48,54 +179,96 @@ class ScoreManager:
         target_id: str,
         base_points: int,
         reason: str,
-        weighted: bool
+        weighted: bool,
+        idempotency_key: Optional[str] = None,
+        solve: bool = False
     ) -> Tuple[int, int]:
         """
         Returns (player_points_awarded, house_points_awarded)
+
+        ``solve`` marks the award for a puzzle or stage solve, as opposed to a
+        manual one. An award made again with the same ``idempotency_key`` (e.g. a retried
+        interaction's id) changes nothing and returns the first award's result.
         """
-        player_pts_awarded = 0
-        house_pts_awarded = 0
-
-        if target == "player":
-            players = self._scores.setdefault("players", {})
-            players.setdefault(target_id, 0)
-            players[target_id] += base_points
-            player_pts_awarded = base_points
-
-            member = guild.get_member(int(target_id))
-            house_key = self._infer_member_house(member)
-            if house_key:
+        async with self._lock:
+            if idempotency_key is not None:
+                previous = self.award_keys.get(idempotency_key)
+                if previous is not None:
+                    incr("scores.duplicate_awards")
+                    return previous
+
+            player_pts_awarded = 0
+            house_pts_awarded = 0
+
+            if target == "player":
+                players = self._scores.setdefault("players", {})
+                players.setdefault(target_id, 0)
+                players[target_id] += base_points
+                player_pts_awarded = base_points
+                if self._ranking is not None:
+                    self._ranking.update(target_id, players[target_id])
+
+                member = guild.get_member(int(target_id))
+                house_key = self._infer_member_house(member)
+                if house_key:
+                    house_pts_awarded = await self._apply_house_points(
+                        guild=guild,
+                        house_key=house_key,
+                        base_points=base_points,
+                        weighted=weighted
+                    )
+
+            elif target == "house":
+                house_key = target_id
                 house_pts_awarded = await self._apply_house_points(
                     guild=guild,
                     house_key=house_key,
                     base_points=base_points,
                     weighted=weighted
                 )
+            else:
+                raise ValueError("target must be 'house' or 'player'")
 
-        elif target == "house":
-            house_key = target_id
-            house_pts_awarded = await self._apply_house_points(
-                guild=guild,
-                house_key=house_key,
+            if self._season is not None:
+                self._season.add(
+                    house_key=house_key,
+                    house_points=house_pts_awarded,
+                    user_id=target_id if target == "player" else None,
+                    player_points=player_pts_awarded
+                )
+
+            self._log_event(
+                actor_id=actor_id,
+                target=target,
+                target_id=target_id,
                 base_points=base_points,
-                weighted=weighted
+                weighted=weighted,
+                house_points_awarded=house_pts_awarded,
+                player_points_awarded=player_pts_awarded,
+                reason=reason,
+                solve=solve
             )
-        else:
-            raise ValueError("target must be 'house' or 'player'")
-
-        self._log_event(
-            actor_id=actor_id,
-            target=target,
-            target_id=target_id,
-            base_points=base_points,
-            weighted=weighted,
-            house_points_awarded=house_pts_awarded,
-            player_points_awarded=player_pts_awarded,
-            reason=reason
-        )
 
-        self.save()
-        return player_pts_awarded, house_pts_awarded
+            if idempotency_key is not None:
+                self.award_keys.add(idempotency_key, player_pts_awarded, house_pts_awarded)
+            self.version += 1
+            self.save()
+            bus.publish(PointsAwarded(
+                guild_id=guild.id,
+                actor_id=actor_id,
+                target=target,
+                target_id=target_id,
+                reason=reason,
+                base_points=base_points,
+                weighted=weighted,
+                player_points=player_pts_awarded,
+                player_total=self._scores["players"][target_id] if target == "player" else None,
+                house_key=house_key,
+                house_points=house_pts_awarded,
+                house_total=self._scores["houses"][house_key] if house_key else None,
+                solve=solve
+            ))
+            return player_pts_awarded, house_pts_awarded
 
     async def remove_points(
         self,
@@ -106,7 +279,8 @@ class ScoreManager:
         target_id: str,
         base_points: int,
         reason: str,
-        weighted: bool
+        weighted: bool,
+        idempotency_key: Optional[str] = None
     ) -> Tuple[int, int]:
         neg_points = -abs(base_points)
         return await self.add_points(
@@ -116,7 +290,8 @@ class ScoreManager:
             target_id=target_id,
             base_points=neg_points,
             reason=reason,
-            weighted=weighted
+            weighted=weighted,
+            idempotency_key=idempotency_key
         )
 
     async def _apply_house_points(self, *, guild: discord.Guild, house_key: str, base_points: int, weighted: bool) -> int:
@@ -134,6 +309,7 @@ class ScoreManager:
             house_points = apply_rounding(base_points * multiplier, rounding)
 
         houses[house_key] += house_points
+        self.house_series.add(now_micros(), house_key, house_points)
         return house_points
 
     def _infer_member_house(self, member: Optional[discord.Member]) -> Optional[str]:
@@ -171,17 +347,24 @@ class ScoreManager:
         weighted: bool,
         house_points_awarded: int,
         player_points_awarded: int,
-        reason: str
+        reason: str,
+        solve: bool = False
     ) -> None:
-        events = self._scores.setdefault("events", [])
-        events.append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "actor_id": str(actor_id),
-            "target": target,
-            "target_id": str(target_id),
-            "base_points": base_points,
-            "weighted": weighted,
-            "house_points_awarded": house_points_awarded,
-            "player_points_awarded": player_points_awarded,
-            "reason": reason
-        })
+        event = ScoreEvent(
+            timestamp=now_micros(),
+            actor_id=int(actor_id),
+            target=target,
+            target_id=int(target_id) if target == "player" else target_id,
+            base_points=base_points,
+            weighted=weighted,
+            house_points_awarded=house_points_awarded,
+            player_points_awarded=player_points_awarded,
+            reason=reason,
+            solve=solve
+        )
+        log: EventLog = self._scores["events"]
+        log.append(event)
+        if self._event_index is not None:
+            self._event_index.add(len(log) - 1, event)
+        if self._rollups is not None:
+            self._rollups.add(event)
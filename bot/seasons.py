@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from storage.base import StorageBase
+from storage.records import Submission, local_now_micros
+from bot.bus import StageChanged, StageCompleted, bus
 
 DEFAULT_SEASON_DATA: Dict[str, Any] = {
     "current_season": 1,
@@ -29,14 +31,23 @@ class SeasonManager:
     def __init__(self, storage: StorageBase):
         self._storage = storage
         self._data = self._storage.load_season_data(default_payload=DEFAULT_SEASON_DATA)
+        # Only the current stage's submissions are decoded at startup; other
+        # stages keep their raw dicts until something reads them.
+        self.get_stage_submissions(self.get_current_stage())
+        # Bumped on every change, like ScoreManager.version
+        self.version = 0
 
     @property
     def data(self) -> Dict[str, Any]:
         return self._data
 
     def save(self) -> None:
+        self.version += 1
         self._storage.save_season_data(self._data)
 
+    def get_current_season_id(self) -> str:
+        return str(self._data["current_season"])
+
     def get_current_season(self) -> Dict[str, Any]:
         season_id = str(self._data["current_season"])
         return self._data["seasons"].get(season_id, {})
@@ -46,10 +57,21 @@ class SeasonManager:
         stage_id = str(season.get("current_stage", 1))
         return season.get("stages", {}).get(stage_id, {})
 
+    def get_stage_submissions(self, stage: Dict[str, Any]) -> List[Submission]:
+        """Submissions of a stage as records, decoding them on first access."""
+        submissions = stage.get("submissions", [])
+        if submissions and not isinstance(submissions[0], Submission):
+            submissions = [s if isinstance(s, Submission) else Submission.from_dict(s) for s in submissions]
+        stage["submissions"] = submissions
+        return submissions
+
     def advance_season(self) -> str:
         """Advance to the next season."""
         current = self._data["current_season"]
         next_season = current + 1
+        current_season = self._data["seasons"].get(str(current))
+        if current_season is not None and not current_season.get("end_date"):
+            current_season["end_date"] = datetime.now().isoformat()
         self._data["current_season"] = next_season
 
         # Create new season if it doesn't exist
@@ -71,6 +93,7 @@ class SeasonManager:
                 "current_stage": 1
             }
         self.save()
+        self._publish_stage_changed()
         return f"Advanced to Season {next_season}"
 
     def advance_stage(self) -> str:
@@ -91,8 +114,18 @@ class SeasonManager:
 
         season["current_stage"] = next_stage
         self.save()
+        self._publish_stage_changed()
         return f"Advanced to Stage {next_stage}"
 
+    def _publish_stage_changed(self) -> None:
+        season = self.get_current_season()
+        stage_id = str(season.get("current_stage", 1))
+        bus.publish(StageChanged(
+            season_id=self.get_current_season_id(),
+            stage_id=stage_id,
+            stage_name=self.get_current_stage().get("name", f"Stage {stage_id}")
+        ))
+
     def set_stage_solution(self, solution: str, points: int = 10) -> str:
         """Set the solution and points for the current stage."""
         stage = self.get_current_stage()
@@ -101,7 +134,7 @@ class SeasonManager:
         self.save()
         return f"Set solution for {stage['name']} (worth {points} points)"
 
-    def submit_answer(self, user_id: str, answer: str) -> tuple[str, bool]:
+    def submit_answer(self, user_id: str, answer: str, guild_id: Optional[int] = None) -> tuple[str, bool]:
         """Submit an answer for the current stage.
         
         Returns: (message, was_correct)
@@ -116,16 +149,15 @@ class SeasonManager:
         if not solution:
             return "No solution has been set yet. Please wait for the moderators.", False
 
-        submission = {
-            "user_id": user_id,
-            "answer": answer,
-            "timestamp": datetime.now().isoformat(),
-            "correct": answer == solution
-        }
+        submission = Submission(
+            user_id=int(user_id),
+            answer=answer,
+            timestamp=local_now_micros(),
+            naive=True,
+            correct=answer == solution
+        )
 
-        submissions = stage.get("submissions", [])
-        submissions.append(submission)
-        stage["submissions"] = submissions
+        self.get_stage_submissions(stage).append(submission)
 
         season = self.get_current_season()
         season["total_submissions"] = season.get("total_submissions", 0) + 1
@@ -137,6 +169,16 @@ class SeasonManager:
         self.save()
 
         if was_correct:
+            season_id = self.get_current_season_id()
+            stage_id = str(season.get("current_stage", 1))
+            bus.publish(StageCompleted(
+                guild_id=guild_id,
+                season_id=season_id,
+                stage_id=stage_id,
+                stage_name=stage.get("name", f"Stage {stage_id}"),
+                user_id=int(user_id),
+                points=stage.get("points", 10)
+            ))
             return "🎉 Correct! Well done. You've solved the stage!", True
         else:
             return "❌ Incorrect. Try again!", False
@@ -156,8 +198,8 @@ class SeasonManager:
     def get_stage_stats(self) -> Dict[str, Any]:
         """Get detailed stats for current stage."""
         stage = self.get_current_stage()
-        submissions = stage.get("submissions", [])
-        correct_count = sum(1 for s in submissions if s.get("correct", False))
+        submissions = self.get_stage_submissions(stage)
+        correct_count = sum(1 for s in submissions if s.correct)
 
         return {
             "stage_name": stage.get("name", "Unknown"),
@@ -0,0 +1,277 @@
+"""Side effects of awards, solves and stage completions, run off the command path.
+
+Commands and ``on_message`` answer the user as soon as the score is saved;
+the display message and the log channel digest catch up from the event bus. Each
+subscriber reads its own bounded queue on a background task and handles
+whatever has piled up in one go, so a burst of awards costs one display
+update rather than one per award.
+
+The audit trail is deliberately not a subscriber. It is the "events" log
+that ``ScoreManager`` appends and saves together with the totals, and the
+event index, rollups and award keys are read from it. A bus queue drops its
+oldest entries when it overflows and loses what it holds on a crash, so
+the audit log stays part of the award.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple, Type, TYPE_CHECKING
+from abc import ABC, abstractmethod
+import asyncio
+
+import discord
+from discord.ext import commands
+
+from storage.records import micros_to_datetime
+from bot.bus import BusEvent, EventBus, PointsAwarded, PuzzleSolved, StageCompleted, bus
+from utils.helpers import member_house, title_case_house
+from utils.metrics import incr, timer
+from utils.names import display_names
+
+if TYPE_CHECKING:
+    from bot.config import ConfigManager
+    from bot.scoring import ScoreManager
+
+# Discord allows 4096 characters in an embed description
+DESCRIPTION_LIMIT = 4000
+LINE_LIMIT = 300
+
+
+class Subscriber(ABC):
+    """Consumes one bus subscription on its own task, a batch at a time.
+
+    A batch closes ``linger`` seconds after its first event or once it holds
+    ``max_batch`` events, whichever comes first. Stopping lets the batch in
+    hand finish, then handles whatever is still queued.
+    """
+
+    name = "subscriber"
+    types: Tuple[Type[BusEvent], ...] = ()
+
+    def __init__(self, *, maxsize: int = 1000, linger: float = 0.0, max_batch: Optional[int] = None):
+        self.maxsize = maxsize
+        self.linger = linger
+        self.max_batch = max_batch
+        self._sub = None
+        self._task: Optional[asyncio.Task] = None
+        self._handling: Optional[asyncio.Task] = None
+        self._pending: List[BusEvent] = []
+        self._closing = False
+
+    def start(self, event_bus: EventBus = bus) -> None:
+        self._sub = event_bus.subscribe(*self.types, maxsize=self.maxsize, accepts=self.accepts)
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=f"houseledger-{self.name}")
+
+    async def stop(self) -> None:
+        # Before 3.12, wait_for can swallow a cancel that races a finished get(); the flag still ends the loop
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._handling is not None:
+            await asyncio.gather(self._handling, return_exceptions=True)
+        if self._sub is not None:
+            while self._sub.qsize():
+                self._take(self._sub.get_nowait())
+            if self._pending:
+                batch, self._pending = self._pending, []
+                await self._handle(batch)
+            self._sub.close()
+            self._sub = None
+
+    def accepts(self, event: BusEvent) -> bool:
+        """Whether ``event`` belongs in a batch; the rest are never queued, so they can't crowd out or be counted as drops."""
+        return True
+
+    def _take(self, item: Tuple[int, BusEvent]) -> None:
+        self._pending.append(item[1])
+
+    def _full(self) -> bool:
+        return self.max_batch is not None and len(self._pending) >= self.max_batch
+
+    def _drain(self) -> None:
+        while self._sub.qsize() and not self._full():
+            self._take(self._sub.get_nowait())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._closing:
+            while not self._pending:
+                self._take(await self._sub.get())
+            deadline = loop.time() + self.linger
+            self._drain()
+            while not self._closing and not self._full() and loop.time() < deadline:
+                try:
+                    self._take(await asyncio.wait_for(self._sub.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            self._drain()
+            batch, self._pending = self._pending, []
+            # Shielded so that stopping waits for the batch instead of cutting it off
+            self._handling = loop.create_task(self._handle(batch))
+            await asyncio.shield(self._handling)
+            self._handling = None
+
+    async def _handle(self, batch: List[BusEvent]) -> None:
+        incr(f"subscribers.{self.name}.events", len(batch))
+        try:
+            with timer(f"subscribers.{self.name}"):
+                await self.handle(batch)
+        except Exception as e:
+            incr(f"subscribers.{self.name}.errors")
+            print(f"[House Ledger] The {self.name} subscriber failed: {e}")
+
+    @abstractmethod
+    async def handle(self, batch: List[BusEvent]) -> None:
+        ...
+
+
+class DisplayUpdater(Subscriber):
+    """Refreshes the auto-display messages once per batch of awards."""
+
+    name = "display"
+    types = (PointsAwarded,)
+
+    def __init__(self, bot: commands.Bot, config_mgr: ConfigManager, score_mgr: ScoreManager, linger: float = 1.0):
+        super().__init__(linger=linger)
+        self._bot = bot
+        self._config_mgr = config_mgr
+        self._score_mgr = score_mgr
+
+    async def handle(self, batch: List[BusEvent]) -> None:
+        from utils.display import update_display_message
+
+        for guild_id in {event.guild_id for event in batch if event.guild_id is not None}:
+            guild = self._bot.get_guild(guild_id)
+            if guild is not None:
+                await update_display_message(guild, self._config_mgr, self._score_mgr)
+
+
+class LogDigest(Subscriber):
+    """Posts awards, puzzle solves and stage completions to the log channel as digests.
+
+    Entries collect for ``interval`` seconds or until there are ``max_entries``
+    of them, then go out as one embed, so a busy event costs one message per
+    digest rather than one per entry. Entries dropped because the queue
+    overflowed are counted in the next digest that is actually posted.
+    """
+
+    name = "log_digest"
+    types = (PointsAwarded, PuzzleSolved, StageCompleted)
+
+    def __init__(self, bot: commands.Bot, config_mgr: ConfigManager, interval: float = 10.0, max_entries: int = 15, maxsize: int = 500):
+        super().__init__(maxsize=maxsize, linger=interval, max_batch=max_entries)
+        self._bot = bot
+        self._config_mgr = config_mgr
+        self._dropped_reported = 0
+
+    def accepts(self, event: BusEvent) -> bool:
+        # A solve's award is announced by its PuzzleSolved/StageCompleted entry
+        return not (isinstance(event, PointsAwarded) and event.solve)
+
+    def _line(self, guild: discord.Guild, event: BusEvent) -> str:
+        when = f"<t:{event.timestamp // 1_000_000}:T>"
+        if isinstance(event, PointsAwarded):
+            actor = display_names.display_name(guild, event.actor_id) or f"User {event.actor_id}"
+            if event.target == "player":
+                target = display_names.display_name(guild, int(event.target_id)) or f"User {event.target_id}"
+                applied = f"player {event.player_points:+}, house {event.house_points:+}" if event.house_key else f"player {event.player_points:+}"
+            else:
+                target = title_case_house(event.target_id)
+                applied = f"house {event.house_points:+}"
+            return f"{when} ✏️ **{actor}** gave **{target}** {event.base_points:+} ({applied}): {event.reason}"
+
+        member = guild.get_member(event.user_id)
+        user_name = display_names.display_name(guild, event.user_id, member) or f"User {event.user_id}"
+        if isinstance(event, PuzzleSolved):
+            house_key, icon, thing = event.house_key, "🧩", event.title
+        else:
+            house_key, icon, thing = member_house(member, self._config_mgr), "🎉", event.stage_name
+        house_name = title_case_house(house_key) if house_key else "No House"
+        return f"{when} {icon} **{user_name}** from **{house_name}** solved **{thing}**! (+{event.points}, weighted)"
+
+    def _embeds(self, lines: List[str], dropped: int, timestamp: int) -> List[discord.Embed]:
+        if dropped:
+            lines = lines + [f"*…{dropped} more entries were dropped while the log was backed up.*"]
+        embeds: List[discord.Embed] = []
+        chunk: List[str] = []
+        size = 0
+        for line in lines:
+            line = line[:LINE_LIMIT]
+            if chunk and size + len(line) + 1 > DESCRIPTION_LIMIT:
+                embeds.append(self._embed(chunk, timestamp))
+                chunk, size = [], 0
+            chunk.append(line)
+            size += len(line) + 1
+        if chunk:
+            embeds.append(self._embed(chunk, timestamp))
+        return embeds
+
+    @staticmethod
+    def _embed(lines: List[str], timestamp: int) -> discord.Embed:
+        return discord.Embed(
+            title="📜 Activity Log",
+            description="\n".join(lines),
+            color=0x27ae60,
+            timestamp=micros_to_datetime(timestamp)
+        )
+
+    async def handle(self, batch: List[BusEvent]) -> None:
+        log_channel_id = self._config_mgr.get_log_channel_id()
+        if not log_channel_id or not log_channel_id.isdigit():
+            return
+        dropped = self._sub.dropped - self._dropped_reported if self._sub is not None else 0
+
+        by_guild: Dict[int, List[BusEvent]] = {}
+        for event in batch:
+            if event.guild_id is not None:
+                by_guild.setdefault(event.guild_id, []).append(event)
+        for guild_id, events in by_guild.items():
+            guild = self._bot.get_guild(guild_id)
+            channel = guild.get_channel(int(log_channel_id)) if guild is not None else None
+            if channel is None:
+                continue
+            lines = [self._line(guild, e) for e in events]
+            # Usually one embed; a long shutdown flush is split over several messages
+            embeds = self._embeds(lines, dropped, events[-1].timestamp)
+            for i, embed in enumerate(embeds):
+                try:
+                    with timer("discord.send_message"):
+                        await channel.send(embed=embed)
+                    incr("log_channel.digests")
+                except discord.HTTPException as e:
+                    incr("log_channel.errors")
+                    print(f"[House Ledger] Posting to the log channel failed: {e}")
+                    continue
+                # The drop count rides on the last embed; it stays pending until that one is posted
+                if i == len(embeds) - 1 and dropped:
+                    self._dropped_reported += dropped
+                    dropped = 0
+
+
+def setup_subscribers(
+    *,
+    bot: commands.Bot,
+    config_mgr: ConfigManager,
+    score_mgr: ScoreManager,
+    digest_seconds: float = 10.0,
+    digest_entries: int = 15
+) -> List[Subscriber]:
+    """Build the standard subscribers and start/stop them with the bot."""
+    subscribers: List[Subscriber] = [
+        DisplayUpdater(bot, config_mgr, score_mgr),
+        LogDigest(bot, config_mgr, interval=digest_seconds, max_entries=digest_entries),
+    ]
+
+    async def start():
+        for subscriber in subscribers:
+            subscriber.start()
+
+    async def stop():
+        for subscriber in subscribers:
+            await subscriber.stop()
+
+    add_startup_hook = getattr(bot, "add_startup_hook", None)
+    if add_startup_hook is not None:
+        add_startup_hook(start)
+        bot.add_shutdown_hook(stop)
+    return subscribers
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+import json
+import time
+
+import discord
+
+class TraceRecorder:
+    """Append incoming messages and slash-command invocations to a JSONL trace.
+
+    Each line has a wall-clock ``ts`` plus either
+    ``{"type": "message", "channel_id", "author_id", "content"}`` or
+    ``{"type": "command", "name", "user_id", "channel_id", "args"}``, where
+    ``args`` maps option names to the raw values Discord sent (ids for users
+    and channels). ``python -m benchmarks.replay`` plays such a file back.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Line-buffered so a crash loses at most the line being written
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        entry["ts"] = round(time.time(), 6)
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def record_message(self, message: discord.Message) -> None:
+        self._write({
+            "type": "message",
+            "channel_id": str(message.channel.id),
+            "author_id": str(message.author.id),
+            "content": message.content,
+        })
+
+    def record_interaction(self, interaction: discord.Interaction) -> None:
+        if interaction.type is not discord.InteractionType.application_command or not interaction.data:
+            return
+        options: List[Dict[str, Any]] = interaction.data.get("options", [])
+        self._write({
+            "type": "command",
+            "name": interaction.data.get("name"),
+            "user_id": str(interaction.user.id),
+            "channel_id": str(interaction.channel_id or ""),
+            "args": {opt["name"]: opt.get("value") for opt in options if "value" in opt},
+        })
+
+    def close(self) -> None:
+        self._file.close()
+
@@ -0,0 +1,51 @@
+from __future__ import annotations
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+
+import discord
+from discord import app_commands
+
+def command_tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake]) -> str:
+    """Stable hash of the command payload that ``tree.sync`` would upload."""
+    payload = [cmd.to_dict(tree) for cmd in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda c: c.get("name", ""))
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _load_cache(path: str) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+async def sync_if_changed(
+    tree: app_commands.CommandTree,
+    guild: Optional[discord.abc.Snowflake],
+    cache_path: str = ".houseledger_tree_hash.json"
+) -> bool:
+    """Sync the tree only if its commands changed since the last successful sync.
+
+    The hash is keyed by application and target (global or guild id), so
+    switching bots or dev guilds still triggers a sync. Set FORCE_SYNC=1 to
+    sync regardless, e.g. after commands were removed by hand.
+    Returns True if a sync was performed.
+    """
+    key = f"{tree.client.application_id}:{guild.id if guild else 'global'}"
+    digest = command_tree_hash(tree, guild)
+    cache = _load_cache(cache_path)
+
+    force = os.getenv("FORCE_SYNC", "").strip().lower() in ("1", "true", "yes")
+    if not force and cache.get(key) == digest:
+        return False
+
+    await tree.sync(guild=guild)
+    cache[key] = digest
+    tmp = cache_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, cache_path)
+    return True
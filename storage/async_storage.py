@@ -0,0 +1,136 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import StorageBase
+from .records import EventLog
+from utils.metrics import incr, timer
+
+def _frozen(value: Any) -> Any:
+    """Copy of a payload that the event loop can keep changing while a worker thread writes it.
+
+    Dicts are copied at every level. Lists and event logs are copied
+    shallowly: their items (records, raw dicts from the file, small lists)
+    are replaced when they change, never edited in place.
+    """
+    if isinstance(value, dict):
+        return {k: _frozen(v) for k, v in value.items()}
+    if isinstance(value, EventLog):
+        return EventLog(value.base, list(value.tail))
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+class _WriteQueue:
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.pending: Optional[Callable[[], Any]] = None
+        self.payload: Optional[Dict[str, Any]] = None
+        self.waiters: List[asyncio.Future] = []
+
+
+class AsyncStorage(StorageBase):
+    """Storage facade that runs saves on a dedicated thread pool.
+
+    Loads stay synchronous since they only run at startup. Saves are queued
+    per file: writes to one file land in call order, a newer save replaces a
+    queued one that has not started yet, and different files write in
+    parallel. Payload saves are copied on the loop just before their write
+    starts, so a file always holds one consistent state. Outside a running
+    event loop, or once closed, saves go straight to the wrapped storage.
+    """
+
+    def __init__(self, inner: StorageBase, *, max_workers: int = 2):
+        self._inner = inner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="houseledger-io")
+        self._queues: Dict[str, _WriteQueue] = {}
+        self._closed = False
+
+    @property
+    def inner(self) -> StorageBase:
+        return self._inner
+
+    def load_config(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
+        with timer("storage.load.config"):
+            return self._inner.load_config(default_payload)
+
+    def save_config(self, payload: Dict[str, Any]) -> None:
+        self.submit("config", self._inner.save_config, payload=payload)
+
+    def load_scores(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
+        with timer("storage.load.scores"):
+            return self._inner.load_scores(default_payload)
+
+    def save_scores(self, payload: Dict[str, Any]) -> None:
+        self.submit("scores", self._inner.save_scores, payload=payload)
+
+    def load_season_data(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
+        with timer("storage.load.season"):
+            return self._inner.load_season_data(default_payload)
+
+    def save_season_data(self, payload: Dict[str, Any]) -> None:
+        self.submit("season", self._inner.save_season_data, payload=payload)
+
+    def submit(self, key: str, write: Callable[..., Any], *, payload: Optional[Dict[str, Any]] = None) -> Optional[asyncio.Future]:
+        """Queue ``write`` behind earlier writes for ``key``.
+
+        With ``payload``, ``write`` is called with a frozen copy of it.
+        Returns a future resolved once the write (or a newer one that replaced
+        it) has finished, or None when it ran inline.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or self._closed:
+            _timed_write(key, write, payload)
+            return None
+
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = _WriteQueue()
+
+        waiter = loop.create_future()
+        if queue.pending is not None:
+            incr(f"storage.save.{key}.coalesced")
+        queue.pending = write
+        queue.payload = payload
+        queue.waiters.append(waiter)
+        if queue.task is None or queue.task.done():
+            queue.task = loop.create_task(self._drain(key, queue))
+        return waiter
+
+    async def _drain(self, key: str, queue: _WriteQueue) -> None:
+        loop = asyncio.get_running_loop()
+        while queue.pending is not None:
+            write, waiters = queue.pending, queue.waiters
+            payload = _frozen(queue.payload) if queue.payload is not None else None
+            queue.pending, queue.payload, queue.waiters = None, None, []
+            try:
+                await loop.run_in_executor(self._executor, _timed_write, key, write, payload)
+            except Exception as e:
+                print(f"[House Ledger] Saving {key} failed: {e}")
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def flush(self) -> None:
+        """Wait until every queued write has reached disk."""
+        while True:
+            tasks = [q.task for q in self._queues.values() if q.task is not None and not q.task.done()]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks)
+
+    async def aclose(self) -> None:
+        await self.flush()
+        # Anything saved from here on is written inline rather than lost
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        self._inner.close()
+
+
+def _timed_write(key: str, write: Callable[..., Any], payload: Optional[Dict[str, Any]] = None) -> Any:
+    with timer(f"storage.save.{key}"):
+        return write() if payload is None else write(payload)
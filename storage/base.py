@@ -17,4 +17,7 @@ class StorageBase(ABC):
 
     @abstractmethod
     def save_scores(self, payload: Dict[str, Any]) -> None:
-        ...
\ No newline at end of file
+        ...
+
+    def close(self) -> None:
+        """Release files and finish deferred writes; called once, after the last save."""
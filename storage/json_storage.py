@@ -1,60 +1,152 @@
 from __future__ import annotations
 import os
 import json
-from typing import Dict, Any
+from collections.abc import Sequence
+from typing import Dict, Any, Callable, Optional
 
 from .base import StorageBase
 
-def _ensure_file(path: str, default_payload: Dict[str, Any]) -> None:
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(default_payload, f, indent=2)
-    else:
-        # Check if file is empty or contains invalid JSON
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional speedup
+    msgspec = None
+
+class JsonSerializer:
+    """A named pair of dumps/loads functions working on UTF-8 bytes."""
+
+    def __init__(self, name: str, dumps: Callable[[Any, bool], bytes], loads: Callable[[bytes], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"JsonSerializer({self.name!r})"
+
+def _json_default(obj: Any) -> Any:
+    # Records from storage.records know their JSON shape
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    # Lazy containers such as storage.records.EventLog serialize as plain lists
+    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _stdlib_dumps(payload: Any, pretty: bool) -> bytes:
+    if pretty:
+        return json.dumps(payload, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=_json_default).encode("utf-8")
+
+def _stdlib_loads(raw: bytes) -> Any:
+    return json.loads(raw)
+
+SERIALIZERS: Dict[str, JsonSerializer] = {
+    "json": JsonSerializer("json", _stdlib_dumps, _stdlib_loads),
+}
+
+if orjson is not None:
+    def _orjson_dumps(payload: Any, pretty: bool) -> bytes:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    SERIALIZERS["orjson"] = JsonSerializer("orjson", _orjson_dumps, orjson.loads)
+
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=_json_default)
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def _msgspec_dumps(payload: Any, pretty: bool) -> bytes:
+        raw = _msgspec_encoder.encode(payload)
+        return msgspec.json.format(raw, indent=2) if pretty else raw
+
+    def _msgspec_loads(raw: bytes) -> Any:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:  # Empty file
-                    raise ValueError("Empty file")
-                json.loads(content)  # Try to parse
-        except (json.JSONDecodeError, ValueError):
-            # File is empty or invalid, write default payload
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(default_payload, f, indent=2)
-
-def _load_json(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def _save_json(path: str, payload: Dict[str, Any]) -> None:
+            return _msgspec_decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    SERIALIZERS["msgspec"] = JsonSerializer("msgspec", _msgspec_dumps, _msgspec_loads)
+
+def get_serializer(name: Optional[str] = None) -> JsonSerializer:
+    """Return the named serializer, or the fastest one installed (orjson, msgspec, then stdlib)."""
+    if name:
+        if name not in SERIALIZERS:
+            raise ValueError(f"Unknown or unavailable JSON serializer: {name}")
+        return SERIALIZERS[name]
+    for candidate in ("orjson", "msgspec", "json"):
+        if candidate in SERIALIZERS:
+            return SERIALIZERS[candidate]
+    raise AssertionError("stdlib json serializer is always registered")
+
+def _ensure_file(path: str, default_payload: Dict[str, Any], serializer: JsonSerializer, pretty: bool) -> Dict[str, Any]:
+    """Load ``path``, (re)writing it with ``default_payload`` if missing, empty or invalid."""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            content = f.read().strip()
+        if content:
+            try:
+                return serializer.loads(content)
+            except ValueError:
+                # File contains invalid JSON, fall through and write default payload
+                pass
+
+    raw = serializer.dumps(default_payload, pretty)
+    with open(path, "wb") as f:
+        f.write(raw)
+    # Hand back a fresh copy so callers never mutate the shared default dict
+    return serializer.loads(raw)
+
+def _save_json(path: str, payload: Dict[str, Any], serializer: JsonSerializer, pretty: bool) -> None:
+    raw = serializer.dumps(payload, pretty)
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
+    with open(tmp, "wb") as f:
+        f.write(raw)
     os.replace(tmp, path)
 
 class JsonStorage(StorageBase):
-    def __init__(self, *, config_path: str, scores_path: str, season_path: str):
+    """JSON file storage.
+
+    Data files (scores, season) are written compact; the config file is
+    pretty-printed since it is meant to be edited by hand.
+    """
+
+    def __init__(
+        self,
+        *,
+        config_path: str,
+        scores_path: str,
+        season_path: str,
+        serializer: Optional[str] = None,
+        pretty_data: bool = False
+    ):
         self._config_path = config_path
         self._scores_path = scores_path
         self._season_path = season_path
+        self._serializer = get_serializer(serializer)
+        self._pretty_data = pretty_data
+
+    @property
+    def serializer(self) -> JsonSerializer:
+        return self._serializer
 
     def load_config(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
-        _ensure_file(self._config_path, default_payload)
-        return _load_json(self._config_path)
+        return _ensure_file(self._config_path, default_payload, self._serializer, pretty=True)
 
     def save_config(self, payload: Dict[str, Any]) -> None:
-        _save_json(self._config_path, payload)
+        _save_json(self._config_path, payload, self._serializer, pretty=True)
 
     def load_scores(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
-        _ensure_file(self._scores_path, default_payload)
-        return _load_json(self._scores_path)
+        return _ensure_file(self._scores_path, default_payload, self._serializer, self._pretty_data)
 
     def save_scores(self, payload: Dict[str, Any]) -> None:
-        _save_json(self._scores_path, payload)
+        _save_json(self._scores_path, payload, self._serializer, self._pretty_data)
 
     def load_season_data(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
-        _ensure_file(self._season_path, default_payload)
-        return _load_json(self._season_path)
+        return _ensure_file(self._season_path, default_payload, self._serializer, self._pretty_data)
 
     def save_season_data(self, payload: Dict[str, Any]) -> None:
-        _save_json(self._season_path, payload)
+        _save_json(self._season_path, payload, self._serializer, self._pretty_data)
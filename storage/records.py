@@ -0,0 +1,306 @@
+"""Compact in-memory record types for events, submissions and puzzles.
+
+Each record uses ``__slots__``, integer microsecond timestamps and integer
+snowflake ids instead of a dict of strings, and converts losslessly to and
+from the JSON shape stored on disk via ``from_dict``/``to_dict``.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from collections.abc import Sequence as SequenceABC
+from datetime import datetime, timedelta, timezone
+import sys
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICRO = timedelta(microseconds=1)
+
+def iso_to_micros(value: str) -> Tuple[int, bool]:
+    """Parse an ISO timestamp into (microseconds since epoch, was_naive).
+
+    Naive timestamps (local time, as written by older code) are counted from
+    a naive epoch so they format back to the exact same string.
+    """
+    ts = datetime.fromisoformat(value)
+    if ts.tzinfo is None:
+        return (ts - _NAIVE_EPOCH) // _MICRO, True
+    return (ts - _EPOCH) // _MICRO, False
+
+def micros_to_iso(value: int, naive: bool = False) -> str:
+    if naive:
+        return (_NAIVE_EPOCH + timedelta(microseconds=value)).isoformat()
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+def now_micros() -> int:
+    return (datetime.now(timezone.utc) - _EPOCH) // _MICRO
+
+def local_now_micros() -> int:
+    """Naive local time now, for records whose files have always held naive timestamps."""
+    return (datetime.now() - _NAIVE_EPOCH) // _MICRO
+
+def micros_to_datetime(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class _Record:
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class ScoreEvent(_Record):
+    """One award or removal, as logged by ``ScoreManager._log_event``."""
+
+    __slots__ = (
+        "timestamp", "naive", "actor_id", "target", "target_id", "base_points", "weighted",
+        "house_points_awarded", "player_points_awarded", "reason", "solve"
+    )
+
+    def __init__(
+        self,
+        *,
+        timestamp: int,
+        actor_id: int,
+        target: str,
+        target_id: Union[int, str],
+        base_points: int,
+        weighted: bool,
+        house_points_awarded: int,
+        player_points_awarded: int,
+        reason: str,
+        solve: bool = False,
+        naive: bool = False
+    ):
+        self.timestamp = timestamp
+        self.naive = naive
+        self.actor_id = actor_id
+        self.target = target
+        # Players are keyed by snowflake, houses by their key string
+        self.target_id = target_id
+        self.base_points = base_points
+        self.weighted = weighted
+        self.house_points_awarded = house_points_awarded
+        self.player_points_awarded = player_points_awarded
+        self.reason = reason
+        # Set on the award for a puzzle or stage solve; absent from manual awards
+        self.solve = solve
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ScoreEvent":
+        target = sys.intern(d["target"])
+        target_id = str(d["target_id"])
+        timestamp, naive = iso_to_micros(d["timestamp"])
+        return cls(
+            timestamp=timestamp,
+            naive=naive,
+            actor_id=int(d["actor_id"]),
+            target=target,
+            target_id=int(target_id) if target == "player" else sys.intern(target_id),
+            base_points=d["base_points"],
+            weighted=d["weighted"],
+            house_points_awarded=d["house_points_awarded"],
+            player_points_awarded=d["player_points_awarded"],
+            reason=sys.intern(d["reason"]),
+            solve=d.get("solve", False)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "timestamp": micros_to_iso(self.timestamp, self.naive),
+            "actor_id": str(self.actor_id),
+            "target": self.target,
+            "target_id": str(self.target_id),
+            "base_points": self.base_points,
+            "weighted": self.weighted,
+            "house_points_awarded": self.house_points_awarded,
+            "player_points_awarded": self.player_points_awarded,
+            "reason": self.reason
+        }
+        if self.solve:
+            d["solve"] = True
+        return d
+
+
+class Submission(_Record):
+    """One answer submitted for a season stage."""
+
+    __slots__ = ("user_id", "answer", "timestamp", "naive", "correct")
+
+    def __init__(self, *, user_id: int, answer: str, timestamp: int, correct: bool, naive: bool = False):
+        self.user_id = user_id
+        self.answer = answer
+        self.timestamp = timestamp
+        self.naive = naive
+        self.correct = correct
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Submission":
+        timestamp, naive = iso_to_micros(d["timestamp"])
+        return cls(user_id=int(d["user_id"]), answer=d["answer"], timestamp=timestamp, naive=naive, correct=d["correct"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "user_id": str(self.user_id),
+            "answer": self.answer,
+            "timestamp": micros_to_iso(self.timestamp, self.naive),
+            "correct": self.correct
+        }
+
+
+class PuzzleSolve(_Record):
+    """Who solved a puzzle, for which house, and when."""
+
+    __slots__ = ("user_id", "house", "timestamp", "naive")
+
+    def __init__(self, *, user_id: int, house: str, timestamp: int, naive: bool = False):
+        self.user_id = user_id
+        self.house = house
+        self.timestamp = timestamp
+        self.naive = naive
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PuzzleSolve":
+        timestamp, naive = iso_to_micros(d["timestamp"])
+        return cls(user_id=int(d["user_id"]), house=d["house"], timestamp=timestamp, naive=naive)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "user_id": str(self.user_id),
+            "house": self.house,
+            "timestamp": micros_to_iso(self.timestamp, self.naive)
+        }
+
+
+class Puzzle(_Record):
+    """A puzzle from ``puzzles.json``.
+
+    ``keys`` is the file's key order; ``to_dict`` writes exactly those keys
+    back in that order (explicit nulls included), plus any field that was
+    absent but has since been set. Unknown keys are carried in ``extra``.
+    """
+
+    __slots__ = (
+        "id", "title", "description", "puzzle_content", "hint", "image_url", "footer_text",
+        "house_veridian_channel", "feathered_host_channel", "points", "solution", "active",
+        "solved_by", "extra", "keys"
+    )
+
+    _OPTIONAL = ("description", "puzzle_content", "hint", "image_url", "footer_text",
+                 "house_veridian_channel", "feathered_host_channel")
+    # Written after the optional fields when absent from the file and not at their default
+    _DEFAULTS = (("points", 10), ("solution", ""), ("active", False), ("solved_by", None))
+
+    def __init__(
+        self,
+        *,
+        id: str,
+        title: str,
+        solution: str,
+        points: int = 10,
+        active: bool = False,
+        solved_by: Optional[PuzzleSolve] = None,
+        description: Optional[str] = None,
+        puzzle_content: Optional[str] = None,
+        hint: Optional[str] = None,
+        image_url: Optional[str] = None,
+        footer_text: Optional[str] = None,
+        house_veridian_channel: Optional[str] = None,
+        feathered_host_channel: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        keys: Optional[Tuple[str, ...]] = None
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.puzzle_content = puzzle_content
+        self.hint = hint
+        self.image_url = image_url
+        self.footer_text = footer_text
+        self.house_veridian_channel = house_veridian_channel
+        self.feathered_host_channel = feathered_host_channel
+        self.points = points
+        self.solution = solution
+        self.active = active
+        self.solved_by = solved_by
+        self.extra = extra
+        self.keys = keys
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Puzzle":
+        known = set(cls.__slots__) - {"extra", "keys"}
+        solved_by = d.get("solved_by")
+        extra = {k: v for k, v in d.items() if k not in known}
+        return cls(
+            id=d["id"],
+            title=d["title"],
+            solution=d.get("solution", ""),
+            points=d.get("points", 10),
+            active=d.get("active", False),
+            solved_by=PuzzleSolve.from_dict(solved_by) if solved_by else None,
+            extra=extra or None,
+            keys=tuple(d),
+            **{k: d.get(k) for k in cls._OPTIONAL}
+        )
+
+    def _value(self, key: str) -> Any:
+        if key == "solved_by":
+            return self.solved_by.to_dict() if self.solved_by else None
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        extra = self.extra or {}
+        if self.keys is None:
+            keys: Tuple[str, ...] = ("id", "title", *(k for k, _ in self._DEFAULTS))
+        else:
+            keys = self.keys
+        d = {k: extra[k] if k in extra else self._value(k) for k in keys}
+        for k in self._OPTIONAL:
+            if k not in d and getattr(self, k) is not None:
+                d[k] = self._value(k)
+        for k, default in self._DEFAULTS:
+            if k not in d and getattr(self, k) != default:
+                d[k] = self._value(k)
+        for k, v in extra.items():
+            d.setdefault(k, v)
+        return d
+
+
+class EventLog(SequenceABC):
+    """Append-only event list: an immutable base plus events appended since load.
+
+    The base is whatever storage loaded (a snapshot's lazy columns, or the
+    JSON file's dicts until ``ScoreManager`` decodes them), so appending
+    never forces the history to be read.
+    """
+
+    def __init__(self, base: Sequence[Any] = (), tail: Optional[List[ScoreEvent]] = None):
+        self.base = base
+        self.tail = tail if tail is not None else []
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n_base = len(self.base)
+        if index < 0:
+            index += len(self)
+        if index < n_base:
+            if index < 0:
+                raise IndexError("event index out of range")
+            return self.base[index]
+        return self.tail[index - n_base]
+
+    def __iter__(self) -> Iterator[ScoreEvent]:
+        yield from self.base
+        yield from self.tail
+
+    def append(self, event: ScoreEvent) -> None:
+        self.tail.append(event)
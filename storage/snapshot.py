@@ -0,0 +1,551 @@
+"""Binary columnar snapshot of the scores file.
+
+Layout (native little-endian, every column 8-byte aligned)::
+
+    magic "HLSNAP\\0\\0" | u32 version | u32 column count
+    per column: u64 byte offset, u64 item count
+    column data...
+
+Players are two parallel arrays (user ids, scores). Events are one array per
+field: timestamps as int64 microseconds since the epoch, actor/target user ids
+interned into an id table, house keys and reasons deduplicated into a string
+table, and per-event flags (a solve's award, a timestamp written without an
+offset) in a byte column after the rest. The file is memory-mapped on load, so opening it costs the same at 10
+events or 10 million; event rows are decoded only when read. Any other
+top-level keys of the scores payload (e.g. season partitions) are kept as a
+small JSON blob in the "meta" column.
+
+Saves do not rewrite the snapshot. Each one appends a line to a JSON journal
+next to it (``<snapshot>.journal``) holding the events logged since the last
+save and the values that changed elsewhere in the payload, down to the
+innermost dict key (one award key, one season total, one day's bucket). The
+journal is replayed on load and folded into a fresh snapshot once it passes
+COMPACT_JOURNAL_BYTES and when the storage is closed.
+
+On Windows, where a mapped file cannot be replaced, the file is read into
+memory instead of mapped.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from array import array
+from collections.abc import Sequence as SequenceABC
+import copy
+import json
+import mmap
+import os
+import struct
+import sys
+
+from .json_storage import JsonSerializer, JsonStorage, _ensure_file, _save_json, get_serializer
+from .records import EventLog, ScoreEvent
+from utils.metrics import incr
+
+MAGIC = b"HLSNAP\0\0"
+VERSION = 3
+# Readable versions and how many trailing columns they lack (version 1 has no
+# "meta", version 2 no "ev_flags"); new columns only ever go at the end
+_COMPAT_VERSIONS = {1: 2, 2: 1, 3: 0}
+_CORE_KEYS = ("houses", "players", "events")
+
+# Journal size at which a save folds it into a fresh snapshot
+COMPACT_JOURNAL_BYTES = 4 * 1024 * 1024
+# Replacing a file that is mapped fails on Windows
+_MAP_FILES = os.name != "nt"
+
+FLAG_NAIVE = 1
+FLAG_SOLVE = 2
+
+TARGET_PLAYER = 0
+TARGET_HOUSE = 1
+_TARGETS = ("player", "house")
+
+# (name, array typecode); order is the on-disk order.
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("str_offsets", "Q"),
+    ("ids", "Q"),
+    ("house_points", "q"),
+    ("player_ids", "Q"),
+    ("player_scores", "q"),
+    ("ev_timestamp", "q"),
+    ("ev_base_points", "q"),
+    ("ev_house_points", "q"),
+    ("ev_player_points", "q"),
+    ("house_names", "I"),
+    ("ev_actor", "I"),
+    ("ev_target_ref", "I"),
+    ("ev_reason", "I"),
+    ("ev_target", "B"),
+    ("ev_weighted", "B"),
+    ("str_blob", "B"),
+    ("meta", "B"),
+    ("ev_flags", "B"),
+)
+
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<QQ")
+_LITTLE = sys.byteorder == "little"
+
+
+class ScoresSnapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mmap: Optional[mmap.mmap] = None
+        with open(path, "rb") as f:
+            if _MAP_FILES:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                buffer: Union[mmap.mmap, bytes] = self._mmap
+            else:
+                buffer = f.read()
+        magic, version, n_columns = _HEADER.unpack_from(buffer, 0)
+        missing = _COMPAT_VERSIONS.get(version)
+        if magic != MAGIC or missing is None or n_columns != len(COLUMNS) - missing:
+            raise ValueError(f"{path} is not a readable scores snapshot (version {VERSION} or older)")
+
+        view = self._view = memoryview(buffer)
+        self._columns: Dict[str, Sequence[int]] = {name: array(code) for name, code in COLUMNS[n_columns:]}
+        for i, (name, code) in enumerate(COLUMNS[:n_columns]):
+            offset, count = _ENTRY.unpack_from(buffer, _HEADER.size + i * _ENTRY.size)
+            size = array(code).itemsize
+            raw = view[offset:offset + count * size]
+            if _LITTLE:
+                self._columns[name] = raw.cast(code)
+            else:
+                col = array(code, raw.tobytes())
+                col.byteswap()
+                self._columns[name] = col
+        if len(self._columns["ev_flags"]) < self.event_count:
+            self._columns["ev_flags"] = array("B", bytes(self.event_count))
+        self._strings: Dict[int, str] = {}
+
+    def close(self) -> None:
+        """Release the columns and unmap the file; the snapshot is unreadable afterwards."""
+        for col in self._columns.values():
+            if isinstance(col, memoryview):
+                col.release()
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def column(self, name: str) -> Sequence[int]:
+        """Raw column, e.g. for ``numpy.frombuffer``."""
+        return self._columns[name]
+
+    def string(self, index: int) -> str:
+        s = self._strings.get(index)
+        if s is None:
+            offsets = self._columns["str_offsets"]
+            s = bytes(self._columns["str_blob"][offsets[index]:offsets[index + 1]]).decode("utf-8")
+            self._strings[index] = s
+        return s
+
+    @property
+    def string_count(self) -> int:
+        return max(len(self._columns["str_offsets"]) - 1, 0)
+
+    def houses(self) -> Dict[str, int]:
+        names = self._columns["house_names"]
+        points = self._columns["house_points"]
+        return {self.string(names[i]): points[i] for i in range(len(names))}
+
+    def players(self) -> Dict[str, int]:
+        return dict(zip(map(str, self._columns["player_ids"]), self._columns["player_scores"]))
+
+    def extras(self) -> Dict[str, Any]:
+        """Payload keys stored outside the columns."""
+        raw = bytes(self._columns["meta"])
+        return json.loads(raw) if raw else {}
+
+    @property
+    def event_count(self) -> int:
+        return len(self._columns["ev_timestamp"])
+
+    def event(self, i: int) -> ScoreEvent:
+        c = self._columns
+        target = c["ev_target"][i]
+        ref = c["ev_target_ref"][i]
+        return ScoreEvent(
+            timestamp=c["ev_timestamp"][i],
+            naive=bool(c["ev_flags"][i] & FLAG_NAIVE),
+            solve=bool(c["ev_flags"][i] & FLAG_SOLVE),
+            actor_id=c["ids"][c["ev_actor"][i]],
+            target=_TARGETS[target],
+            target_id=c["ids"][ref] if target == TARGET_PLAYER else self.string(ref),
+            base_points=c["ev_base_points"][i],
+            weighted=bool(c["ev_weighted"][i]),
+            house_points_awarded=c["ev_house_points"][i],
+            player_points_awarded=c["ev_player_points"][i],
+            reason=self.string(c["ev_reason"][i])
+        )
+
+    def events(self) -> "SnapshotEvents":
+        return SnapshotEvents(self)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Fully materialized payload in the JSON file's shape."""
+        return {
+            "houses": self.houses(),
+            "players": self.players(),
+            "events": [self.event(i).to_dict() for i in range(self.event_count)],
+            **self.extras()
+        }
+
+
+class SnapshotEvents(SequenceABC):
+    """Events of a snapshot, decoded to ``ScoreEvent`` records on access."""
+
+    def __init__(self, snapshot: ScoresSnapshot):
+        self.snapshot = snapshot
+
+    def __len__(self) -> int:
+        return self.snapshot.event_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.snapshot.event(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("event index out of range")
+        return self.snapshot.event(index)
+
+
+class _SnapshotBuilder:
+    """In-memory columns mirroring the snapshot file, extended incrementally on each save."""
+
+    def __init__(self, base: Optional[ScoresSnapshot] = None):
+        self.strings: List[str] = []
+        self.string_index: Dict[str, int] = {}
+        self.blob = bytearray()
+        self.str_offsets = array("Q", [0])
+        self.ids = array("Q")
+        self.id_index: Dict[int, int] = {}
+        self.events = {name: array(code) for name, code in COLUMNS if name.startswith("ev_")}
+        self.count = 0
+
+        if base is not None:
+            for i in range(base.string_count):
+                self._intern_string(base.string(i))
+            for value in base.column("ids"):
+                self._intern_id(value)
+            for name, col in self.events.items():
+                with memoryview(base.column(name)) as raw, raw.cast("B") as raw_bytes:
+                    col.frombytes(raw_bytes)
+            self.count = base.event_count
+
+    def _intern_string(self, value: str) -> int:
+        idx = self.string_index.get(value)
+        if idx is None:
+            idx = self.string_index[value] = len(self.strings)
+            self.strings.append(value)
+            self.blob += value.encode("utf-8")
+            self.str_offsets.append(len(self.blob))
+        return idx
+
+    def _intern_id(self, value: int) -> int:
+        idx = self.id_index.get(value)
+        if idx is None:
+            idx = self.id_index[value] = len(self.ids)
+            self.ids.append(value)
+        return idx
+
+    def add_event(self, event: Union[ScoreEvent, Dict[str, Any]]) -> None:
+        if isinstance(event, dict):
+            event = ScoreEvent.from_dict(event)
+        cols = self.events
+        target = TARGET_HOUSE if event.target == "house" else TARGET_PLAYER
+        cols["ev_timestamp"].append(event.timestamp)
+        cols["ev_actor"].append(self._intern_id(event.actor_id))
+        cols["ev_target"].append(target)
+        cols["ev_target_ref"].append(
+            self._intern_string(event.target_id) if target == TARGET_HOUSE else self._intern_id(event.target_id)
+        )
+        cols["ev_base_points"].append(event.base_points)
+        cols["ev_weighted"].append(1 if event.weighted else 0)
+        cols["ev_house_points"].append(event.house_points_awarded)
+        cols["ev_player_points"].append(event.player_points_awarded)
+        cols["ev_reason"].append(self._intern_string(event.reason))
+        cols["ev_flags"].append((FLAG_NAIVE if event.naive else 0) | (FLAG_SOLVE if event.solve else 0))
+        self.count += 1
+
+    def sync(self, events: Sequence[Union[ScoreEvent, Dict[str, Any]]]) -> None:
+        n = len(events)
+        if n < self.count:
+            raise ValueError("event log shrank; snapshot must be rebuilt")
+        for i in range(self.count, n):
+            self.add_event(events[i])
+
+    def encode(self, houses: Dict[str, int], players: Dict[str, int], extras: Optional[Dict[str, Any]] = None) -> bytes:
+        house_items = list(houses.items())
+        player_items = list(players.items())
+        columns: Dict[str, array] = dict(self.events)
+        columns["house_names"] = array("I", [self._intern_string(k) for k, _ in house_items])
+        columns["house_points"] = array("q", [int(v) for _, v in house_items])
+        columns["player_ids"] = array("Q", [int(k) for k, _ in player_items])
+        columns["player_scores"] = array("q", [int(v) for _, v in player_items])
+        columns["str_offsets"] = self.str_offsets
+        columns["ids"] = self.ids
+        columns["str_blob"] = array("B", self.blob)
+        columns["meta"] = array("B", json.dumps(extras, separators=(",", ":")).encode("utf-8") if extras else b"")
+
+        header_size = _HEADER.size + _ENTRY.size * len(COLUMNS)
+        offset = (header_size + 7) & ~7
+        header = bytearray(_HEADER.pack(MAGIC, VERSION, len(COLUMNS)))
+        chunks: List[bytes] = []
+        for name, _ in COLUMNS:
+            col = columns[name]
+            if not _LITTLE:
+                col = array(col.typecode, col)
+                col.byteswap()
+            raw = col.tobytes()
+            header += _ENTRY.pack(offset, len(col))
+            padded = len(raw) + (-len(raw) % 8)
+            chunks.append(raw + b"\0" * (padded - len(raw)))
+            offset += padded
+        header += b"\0" * ((-len(header)) % 8)
+        return bytes(header) + b"".join(chunks)
+
+
+def write_scores_snapshot(path: str, payload: Dict[str, Any]) -> None:
+    """Write ``payload`` (JSON scores shape) as a fresh snapshot file, replacing any journal."""
+    builder = _SnapshotBuilder()
+    builder.sync(payload.get("events", []))
+    _write_atomic(path, builder.encode(payload.get("houses", {}), payload.get("players", {}), _extras(payload)))
+    _remove(journal_path(path))
+
+def journal_path(snapshot_path: str) -> str:
+    return snapshot_path + ".journal"
+
+def _extras(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in payload.items() if k not in _CORE_KEYS}
+
+def _write_atomic(path: str, raw: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, path)
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _read_journal(path: str, serializer: JsonSerializer) -> Tuple[List[Dict[str, Any]], int]:
+    """Journal records in order, and the journal's size in bytes.
+
+    A torn last line (a crash mid-append) is cut off the file.
+    """
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, "rb") as f:
+        raw = f.read()
+    records: List[Dict[str, Any]] = []
+    good = 0
+    for line in raw.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            records.append(serializer.loads(line))
+        except ValueError:
+            break
+        good += len(line)
+    if good < len(raw):
+        with open(path, "r+b") as f:
+            f.truncate(good)
+    return records, good
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any], path: List[str], sets: List[Any], dels: List[Any]) -> None:
+    """Collect [path, value] pairs that turn ``old`` into ``new``, recursing into dicts, and removed paths."""
+    for k, v in new.items():
+        if k not in old:
+            sets.append([path + [k], v])
+            continue
+        o = old[k]
+        if isinstance(v, dict) and isinstance(o, dict):
+            _diff(o, v, path + [k], sets, dels)
+        elif o != v:
+            sets.append([path + [k], v])
+    for k in old:
+        if k not in new:
+            dels.append(path + [k])
+
+def _apply(target: Dict[str, Any], sets: Sequence[Any], dels: Sequence[Any]) -> None:
+    for path in dels:
+        d = target
+        for k in path[:-1]:
+            d = d.get(k, {})
+        d.pop(path[-1], None)
+    for path, value in sets:
+        d = target
+        for k in path[:-1]:
+            d = d.setdefault(k, {})
+        d[path[-1]] = value
+
+def _state(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Everything but the event log: what journal records diff."""
+    return {k: v for k, v in payload.items() if k != "events"}
+
+def load_scores_snapshot(path: str, serializer: Optional[JsonSerializer] = None) -> Tuple[ScoresSnapshot, Dict[str, Any]]:
+    """Open the snapshot at ``path`` and replay its journal over it.
+
+    Returns the snapshot and the payload in the JSON file's shape; events
+    from the snapshot are decoded lazily, journal events are ``ScoreEvent``
+    records in the log's tail.
+    """
+    snapshot = ScoresSnapshot(path)
+    payload: Dict[str, Any] = {
+        "houses": snapshot.houses(),
+        "players": snapshot.players(),
+        "events": EventLog(snapshot.events()),
+        **snapshot.extras()
+    }
+    records, _ = _read_journal(journal_path(path), serializer or get_serializer())
+    for record in records:
+        payload["events"].tail.extend(ScoreEvent.from_dict(e) for e in record.get("events", ()))
+        _apply(payload, record.get("set", ()), record.get("del", ()))
+    return snapshot, payload
+
+
+class SnapshotStorage(JsonStorage):
+    """JsonStorage that keeps scores in a memory-mapped snapshot instead of JSON.
+
+    An existing JSON scores file is migrated on first load. Saves append to
+    the snapshot's journal, which is compacted into the snapshot when it
+    grows past ``compact_bytes`` and on ``close``. JSON remains available as
+    an export format through ``export_scores_json``.
+    """
+
+    def __init__(self, *, snapshot_path: str, compact_bytes: int = COMPACT_JOURNAL_BYTES, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._snapshot_path = snapshot_path
+        self._journal_path = journal_path(snapshot_path)
+        self.compact_bytes = compact_bytes
+        self._snapshot: Optional[ScoresSnapshot] = None
+        self._payload: Optional[Dict[str, Any]] = None
+        # What the snapshot plus journal hold, so each save appends only the difference
+        self._saved_events = 0
+        self._saved_state: Dict[str, Any] = {}
+        self._journal_bytes = 0
+
+    def load_scores(self, default_payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not os.path.exists(self._snapshot_path):
+            payload = _ensure_file(self._scores_path, default_payload, self._serializer, self._pretty_data)
+            write_scores_snapshot(self._snapshot_path, payload)
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot, payload = load_scores_snapshot(self._snapshot_path, self._serializer)
+        self._journal_bytes = os.path.getsize(self._journal_path) if os.path.exists(self._journal_path) else 0
+        # Compacted on close even if nothing is saved, in case a journal was left behind
+        self._payload = payload
+        self._mark_saved(payload)
+        return payload
+
+    def _mark_saved(self, payload: Dict[str, Any]) -> None:
+        self._saved_events = len(payload.get("events", []))
+        self._saved_state = copy.deepcopy(_state(payload))
+
+    def save_scores(self, payload: Dict[str, Any]) -> None:
+        events = payload.get("events", [])
+        self._payload = payload
+        if len(events) < self._saved_events or self._journal_bytes >= self.compact_bytes:
+            # A replaced log can't be journaled as an append; a long journal slows the next load
+            self._compact(payload)
+            return
+
+        record: Dict[str, Any] = {}
+        if len(events) > self._saved_events:
+            record["events"] = events[self._saved_events:]
+        sets: List[Any] = []
+        dels: List[Any] = []
+        _diff(self._saved_state, _state(payload), [], sets, dels)
+        if sets:
+            record["set"] = sets
+        if dels:
+            record["del"] = dels
+        if not record:
+            return
+
+        line = self._serializer.dumps(record, False) + b"\n"
+        with open(self._journal_path, "ab") as f:
+            f.write(line)
+        self._journal_bytes += len(line)
+        self._saved_events = len(events)
+        _apply(self._saved_state, copy.deepcopy(sets), dels)
+
+    def _compact(self, payload: Dict[str, Any], release: bool = False) -> None:
+        """Rewrite the snapshot from ``payload`` and drop the journal.
+
+        The old mapping stays open for the payload's lazy events unless
+        ``release`` is set; POSIX keeps the replaced file readable through it.
+        """
+        incr("storage.snapshot.compactions")
+        events = payload.get("events", [])
+        base = self._snapshot
+        # Reuse the mapped columns only if the log still starts with them.
+        if not (isinstance(events, EventLog) and base is not None and getattr(events.base, "snapshot", None) is base):
+            base = None
+        builder = _SnapshotBuilder(base)
+        try:
+            builder.sync(events)
+        except ValueError:
+            builder = _SnapshotBuilder()
+            builder.sync(events)
+        raw = builder.encode(payload.get("houses", {}), payload.get("players", {}), _extras(payload))
+        tmp = self._snapshot_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        # Last read of the payload when releasing: its lazy events go with the mapping below
+        self._mark_saved(payload)
+        if release and self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+        os.replace(tmp, self._snapshot_path)
+        _remove(self._journal_path)
+        self._journal_bytes = 0
+
+    def close(self) -> None:
+        """Fold the journal into the snapshot and unmap it. The payload's lazy events are unreadable afterwards."""
+        if self._payload is not None and os.path.exists(self._journal_path):
+            self._compact(self._payload, release=True)
+        self._payload = None
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def export_scores_json(self, path: Optional[str] = None, pretty: bool = True) -> str:
+        """Write the current snapshot and journal as a JSON scores file and return its path."""
+        path = path or self._scores_path
+        _save_json(path, _export_payload(self._snapshot_path, self._serializer), self._serializer, pretty)
+        return path
+
+
+def _export_payload(path: str, serializer: JsonSerializer) -> Dict[str, Any]:
+    snapshot, payload = load_scores_snapshot(path, serializer)
+    try:
+        payload["events"] = [e.to_dict() for e in payload["events"]]
+    finally:
+        snapshot.close()
+    return payload
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert between JSON scores files and binary snapshots.")
+    parser.add_argument("command", choices=["export", "import"], help="export: snapshot -> JSON, import: JSON -> snapshot")
+    parser.add_argument("snapshot", help="Snapshot file path.")
+    parser.add_argument("json", help="JSON scores file path.")
+    args = parser.parse_args()
+
+    serializer = get_serializer()
+    if args.command == "export":
+        _save_json(args.json, _export_payload(args.snapshot, serializer), serializer, True)
+    else:
+        with open(args.json, "rb") as f:
+            write_scores_snapshot(args.snapshot, serializer.loads(f.read()))
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,35 @@
-from bot.config import ConfigManager
+"""Offline smoke run: award points against a fake guild with throwaway data files.
+
+Usage: python test_local.py
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+from benchmarks.fakes import house_config, make_guild
+from bot.config import DEFAULT_CONFIG, ConfigManager
 from bot.scoring import ScoreManager
 from storage.json_storage import JsonStorage
-from types import SimpleNamespace
 
-mock_guild = SimpleNamespace()
-mock_guild.get_role = lambda role_id: SimpleNamespace(members=[1, 2, 3])
+async def simulate(data_dir: str):
+    config_path = os.path.join(data_dir, "houseledger_config.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(house_config(DEFAULT_CONFIG), f)
 
-storage = JsonStorage(
-    config_path="houseledger_config.json",
-    scores_path="houseledger_scores.json"
-)
-config_mgr = ConfigManager(storage=storage)
-score_mgr = ScoreManager(storage=storage, config_mgr=config_mgr)
-config_mgr.set_weighting(True, "round")
+    storage = JsonStorage(
+        config_path=config_path,
+        scores_path=os.path.join(data_dir, "houseledger_scores.json"),
+        season_path=os.path.join(data_dir, "houseledger_season.json")
+    )
+    config_mgr = ConfigManager(storage=storage)
+    score_mgr = ScoreManager(storage=storage, config_mgr=config_mgr)
+    guild = make_guild(members=30, veridian_share=0.3)
 
-async def simulate():
-    print("Before:", score_mgr.data)
+    print("Before:", score_mgr.get_house_totals())
 
     await score_mgr.add_points(
-        guild=mock_guild,
+        guild=guild,
         actor_id=999,
         target="house",
         target_id="house_veridian",
@@ -26,8 +37,21 @@ async def simulate():
         reason="offline test",
         weighted=True
     )
+    member = guild.members[0]
+    await score_mgr.add_points(
+        guild=guild,
+        actor_id=999,
+        target="player",
+        target_id=str(member.id),
+        base_points=5,
+        reason="offline test",
+        weighted=True
+    )
 
-    print("After:", score_mgr.data)
+    print("After:", score_mgr.get_house_totals())
+    print("Top players:", score_mgr.get_top_players(5))
+    print("Last event:", score_mgr.events[-1])
 
-import asyncio
-asyncio.run(simulate())
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(simulate(tmp))
@@ -0,0 +1,28 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.fakes import house_config
+from bot.config import DEFAULT_CONFIG, ConfigManager
+from bot.scoring import ScoreManager
+from storage.json_storage import JsonStorage
+
+@pytest.fixture
+def storage(tmp_path) -> JsonStorage:
+    config_path = os.path.join(tmp_path, "houseledger_config.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(house_config(DEFAULT_CONFIG), f)
+    return JsonStorage(
+        config_path=config_path,
+        scores_path=os.path.join(tmp_path, "houseledger_scores.json"),
+        season_path=os.path.join(tmp_path, "houseledger_season.json")
+    )
+
+@pytest.fixture
+def config_mgr(storage) -> ConfigManager:
+    return ConfigManager(storage=storage)
+
+@pytest.fixture
+def score_mgr(storage, config_mgr) -> ScoreManager:
+    return ScoreManager(storage=storage, config_mgr=config_mgr)
@@ -0,0 +1,41 @@
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot import api as api_module
+from bot.api import ScoreboardAPI
+from bot.bus import EventBus, StageChanged
+
+def test_bus_since_reports_unreplayable_ids():
+    bus = EventBus(history=2)
+    for i in range(3):
+        bus.publish(StageChanged(season_id="1", stage_id=str(i), stage_name=f"Stage {i}"))
+    assert [seq for seq, _ in bus.since(1)] == [2, 3]
+    assert bus.since(3) == []
+    assert bus.since(0) is None
+    assert bus.since(7) is None
+
+def read_replay(score_mgr, monkeypatch, last_event_id):
+    bus = EventBus()
+    monkeypatch.setattr(api_module, "bus", bus)
+    bus.publish(StageChanged(season_id="1", stage_id="1", stage_name="Stage 1"))
+    api = ScoreboardAPI(score_mgr, season_mgr=None)
+
+    async def run():
+        async with TestClient(TestServer(api.app())) as client:
+            response = await client.get("/api/stream", headers={"Last-Event-ID": last_event_id(api)})
+            body = await response.content.readuntil(b"\n\n")
+            body += await asyncio.wait_for(response.content.readuntil(b"\n\n"), 1)
+            response.close()
+            await api.stop()
+            return body.decode("utf-8")
+    return asyncio.run(run())
+
+def test_stream_replays_events_from_this_boot(score_mgr, monkeypatch):
+    body = read_replay(score_mgr, monkeypatch, lambda api: f"{api._boot}-0")
+    assert "event: stage_changed" in body
+
+def test_stream_resyncs_ids_from_another_boot(score_mgr, monkeypatch):
+    body = read_replay(score_mgr, monkeypatch, lambda api: "deadbeef-0")
+    assert "event: resync" in body
+    assert '"houses":' in body
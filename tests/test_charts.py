@@ -0,0 +1,26 @@
+import asyncio
+
+from utils import charts
+
+def test_house_chart_miss_then_hit(score_mgr, monkeypatch):
+    renders = []
+
+    def fake_render(days, lines):
+        renders.append(days)
+        return b"png"
+
+    monkeypatch.setattr(charts, "available", lambda: True)
+    monkeypatch.setattr(charts, "render_house_chart", fake_render)
+    cache = charts.ChartCache()
+
+    async def run():
+        try:
+            first = await cache.house_chart(score_mgr)
+            second = await cache.house_chart(score_mgr)
+        finally:
+            await cache.aclose()
+        return first, second
+
+    assert asyncio.run(run()) == (b"png", b"png")
+    assert len(renders) == 1
+    assert not cache._inflight
@@ -0,0 +1,52 @@
+import asyncio
+
+from benchmarks.fakes import FakeInteraction, make_guild
+from benchmarks.replay import Replayer
+from utils.metrics import get_histogram
+
+def run_command(tmp_path, name, **kwargs):
+    guild = make_guild(members=20)
+    replayer = Replayer(str(tmp_path), "json", guild)
+    channel = guild.add_channel(555, "scoreboard")
+    interaction = FakeInteraction(guild, guild.members[0], channel)
+
+    async def run():
+        await replayer.bot.tree.get_command(name).callback(interaction, **kwargs)
+        await replayer.storage.aclose()
+    asyncio.run(run())
+    return replayer, channel, interaction
+
+def test_slow_set_display_channel_defers_and_pins_its_reply(tmp_path, monkeypatch):
+    hist = get_histogram("command.set_display_channel")
+    monkeypatch.setattr(hist, "_ewma", 2.0)
+    replayer, channel, interaction = run_command(tmp_path, "set_display_channel")
+
+    assert interaction.response.deferred
+    [display_id] = replayer.config_mgr.get_display_message_ids()
+    assert int(display_id) == interaction.original.id
+    assert channel.messages[int(display_id)].payload["embeds"]
+
+def test_slow_leaderboard_defers(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_histogram("command.leaderboard"), "_ewma", 2.0)
+    _, channel, interaction = run_command(tmp_path, "leaderboard")
+    assert interaction.response.deferred
+    assert interaction.original is not None
+    assert interaction.original.payload["embed"] is not None
+
+def test_name_lookups_defer_before_the_first_timed_run(tmp_path, monkeypatch):
+    hist = get_histogram("command.profile")
+    monkeypatch.setattr(hist, "count", 0)
+    monkeypatch.setattr(hist, "_ewma", None)
+    _, _, interaction = run_command(tmp_path, "profile")
+    assert interaction.response.deferred
+
+    # Timed once and fast: no longer assumed cold
+    again = tmp_path / "again"
+    again.mkdir()
+    _, _, interaction = run_command(again, "profile")
+    assert not interaction.response.deferred
+
+def test_uncached_chart_defers(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_histogram("command.standings_main"), "_ewma", 0.0)
+    _, _, interaction = run_command(tmp_path, "standings_main", chart=True)
+    assert interaction.response.deferred
@@ -0,0 +1,8 @@
+import discord
+
+from utils.display import split_display
+
+def test_split_display_never_yields_empty_groups():
+    embeds = [discord.Embed(title="Houses"), discord.Embed(title="Players")]
+    groups = split_display(embeds, [], 4)
+    assert [[e.title for e in group] for group, _ in groups] == [["Houses"], ["Players"]]
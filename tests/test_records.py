@@ -0,0 +1,19 @@
+import json
+
+from storage.records import Puzzle, PuzzleSolve
+
+def test_sparse_puzzle_round_trips_unchanged():
+    raw = {"title": "Lanterns", "id": "p1", "hint": None, "flavor": "gold", "image_url": ""}
+    puzzle = Puzzle.from_dict(raw)
+    assert json.dumps(puzzle.to_dict()) == json.dumps(raw)
+
+def test_puzzle_writes_fields_set_after_load():
+    puzzle = Puzzle.from_dict({"id": "p1", "title": "Lanterns"})
+    puzzle.active = True
+    puzzle.solved_by = PuzzleSolve(user_id=1, house="house_veridian", timestamp=0, naive=True)
+    assert puzzle.to_dict() == {
+        "id": "p1",
+        "title": "Lanterns",
+        "active": True,
+        "solved_by": {"user_id": "1", "house": "house_veridian", "timestamp": "1970-01-01T00:00:00"}
+    }
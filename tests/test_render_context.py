@@ -0,0 +1,9 @@
+from benchmarks.fakes import FEATHERED_ROLE_ID, VERIDIAN_ROLE_ID, make_guild
+from utils.helpers import member_house
+from utils.render_context import build_render_context
+
+def test_member_with_both_house_roles_matches_member_house(config_mgr):
+    guild = make_guild(members=3)
+    member = guild.add_member(1, "Both", [guild.get_role(FEATHERED_ROLE_ID), guild.get_role(VERIDIAN_ROLE_ID)])
+    ctx = build_render_context(guild, config_mgr, [(str(member.id), 10)])
+    assert ctx.house_of(str(member.id)) == member_house(member, config_mgr) == "house_veridian"
@@ -0,0 +1,47 @@
+import asyncio
+
+from benchmarks.fakes import make_guild
+from bot.config import ConfigManager
+from bot.scoring import ScoreManager
+
+def legacy_event(user_id, reason, points=5):
+    return {
+        "timestamp": "2025-01-01T12:00:00",
+        "actor_id": "999",
+        "target": "player",
+        "target_id": str(user_id),
+        "base_points": points,
+        "weighted": False,
+        "house_points_awarded": 0,
+        "player_points_awarded": points,
+        "reason": reason
+    }
+
+def test_profile_classifies_unmarked_solves_by_reason(storage):
+    guild = make_guild(members=5)
+    user_id = guild.members[0].id
+    storage.save_scores({
+        "houses": {"house_veridian": 0, "feathered_host": 0},
+        "players": {str(user_id): 15},
+        "events": [
+            legacy_event(user_id, "Solved puzzle: Lanterns"),
+            legacy_event(user_id, "Solved Stage 1"),
+            legacy_event(user_id, "Helped at the event")
+        ]
+    })
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+
+    async def award(reason, solve):
+        await score_mgr.add_points(
+            guild=guild, actor_id=999, target="player", target_id=str(user_id),
+            base_points=1, reason=reason, weighted=False, solve=solve
+        )
+    asyncio.run(award("Solved the raffle riddle", False))
+    asyncio.run(award("Solved puzzle: Bells", True))
+
+    # Reload: the marker boundary survives, so new unmarked awards stay awards
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    awards, solves, solve_count = score_mgr.get_player_history(user_id)
+    assert solve_count == 3
+    assert [e.reason for e in solves] == ["Solved puzzle: Bells", "Solved Stage 1", "Solved puzzle: Lanterns"]
+    assert [e.reason for e in awards] == ["Solved the raffle riddle", "Helped at the event"]
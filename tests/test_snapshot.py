@@ -0,0 +1,108 @@
+import asyncio
+import os
+
+from benchmarks.fakes import make_guild
+from bot.config import ConfigManager
+from bot.scoring import ScoreManager
+from storage.snapshot import SnapshotStorage, journal_path
+
+def make_storage(tmp_path, **kwargs):
+    return SnapshotStorage(
+        **kwargs,
+        snapshot_path=os.path.join(tmp_path, "houseledger_scores.snap"),
+        config_path=os.path.join(tmp_path, "houseledger_config.json"),
+        scores_path=os.path.join(tmp_path, "houseledger_scores.json"),
+        season_path=os.path.join(tmp_path, "houseledger_season.json")
+    )
+
+def award(score_mgr, guild, i, **kwargs):
+    return score_mgr.add_points(
+        guild=guild, actor_id=999, target="player", target_id=str(guild.members[i % len(guild.members)].id),
+        base_points=i, reason=f"award {i}", weighted=False, **kwargs
+    )
+
+def test_saves_append_to_the_journal_until_close(tmp_path):
+    guild = make_guild(members=5)
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    snapshot = storage._snapshot_path
+    size = os.path.getsize(snapshot)
+
+    for i in range(1, 4):
+        asyncio.run(award(score_mgr, guild, i))
+    assert os.path.getsize(snapshot) == size
+    with open(journal_path(snapshot), "rb") as f:
+        assert len(f.read().splitlines()) == 3
+
+    # A restart without a clean close replays the journal
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    assert [e.reason for e in score_mgr.events] == ["award 1", "award 2", "award 3"]
+    asyncio.run(award(score_mgr, guild, 4))
+    storage.close()
+    assert not os.path.exists(journal_path(snapshot))
+
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    assert sum(score_mgr.get_player_total(m.id) for m in guild.members) == 10
+    assert [e.reason for e in score_mgr.events] == ["award 1", "award 2", "award 3", "award 4"]
+    storage.close()
+
+def test_torn_journal_line_is_dropped(tmp_path):
+    guild = make_guild(members=5)
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    asyncio.run(award(score_mgr, guild, 1))
+    with open(journal_path(storage._snapshot_path), "ab") as f:
+        f.write(b'{"events":[')
+
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    asyncio.run(award(score_mgr, guild, 2))
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    assert [e.reason for e in score_mgr.events] == ["award 1", "award 2"]
+    storage.close()
+
+def test_journal_bytes_per_award_stay_bounded(tmp_path):
+    guild = make_guild(members=200)
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    score_mgr.bind_season("1")
+
+    async def awards():
+        for i in range(1, 601):
+            await award(score_mgr, guild, i, idempotency_key=f"key {i}")
+    asyncio.run(awards())
+    with open(journal_path(storage._snapshot_path), "rb") as f:
+        lines = f.read().splitlines()
+    # Award keys, season totals and the day's bucket grow; their records must not
+    lines = lines[-600:]
+    assert max(len(line) for line in lines[-100:]) < 2 * max(len(line) for line in lines[:100])
+
+    # Replaying the deltas gives back the same payload
+    payload = {k: v for k, v in storage._payload.items() if k != "events"}
+    storage = make_storage(tmp_path)
+    storage.load_scores({})
+    assert {k: v for k, v in storage._payload.items() if k != "events"} == payload
+    storage.close()
+
+def test_long_journal_is_compacted_on_save(tmp_path):
+    guild = make_guild(members=5)
+    storage = make_storage(tmp_path, compact_bytes=2048)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    snapshot = storage._snapshot_path
+    size = os.path.getsize(snapshot)
+
+    for i in range(1, 31):
+        asyncio.run(award(score_mgr, guild, i))
+    assert os.path.getsize(snapshot) > size
+    assert os.path.getsize(journal_path(snapshot)) < 2048 + 1024
+    # The live log still reads events from the replaced snapshot's mapping
+    assert [e.reason for e in score_mgr.events] == [f"award {i}" for i in range(1, 31)]
+
+    storage = make_storage(tmp_path)
+    score_mgr = ScoreManager(storage=storage, config_mgr=ConfigManager(storage=storage))
+    assert [e.reason for e in score_mgr.events] == [f"award {i}" for i in range(1, 31)]
+    assert sum(score_mgr.get_player_total(m.id) for m in guild.members) == sum(range(1, 31))
+    storage.close()
@@ -0,0 +1,49 @@
+import asyncio
+from types import SimpleNamespace
+
+from benchmarks.fakes import make_guild
+from bot.bus import EventBus, PointsAwarded
+from bot.subscribers import LogDigest
+
+def award(guild, reason, solve=False):
+    return PointsAwarded(
+        guild_id=guild.id, actor_id=999, target="house", target_id="house_veridian", reason=reason,
+        base_points=1, weighted=False, player_points=0, player_total=None,
+        house_key="house_veridian", house_points=1, house_total=1, solve=solve
+    )
+
+def test_log_digest_counts_only_overflowed_entries(config_mgr):
+    guild = make_guild(members=3)
+    channel = guild.add_channel(123, "log")
+    config_mgr._config["channels"] = {"log": str(channel.id)}
+    bot = SimpleNamespace(get_guild=lambda guild_id: guild if guild_id == guild.id else None)
+    digest = LogDigest(bot, config_mgr, interval=0, maxsize=2)
+    bus = EventBus()
+
+    async def run():
+        digest.start(bus)
+        for i in range(3):
+            bus.publish(award(guild, f"manual {i}"))
+            bus.publish(award(guild, "Solved puzzle: Bells", solve=True))
+        await digest.stop()
+    asyncio.run(run())
+
+    [message] = channel.messages.values()
+    description = message.payload["embed"].description
+    assert "Solved puzzle" not in description
+    assert "1 more entries were dropped" in description
+
+def test_log_digest_keeps_drop_count_until_posted(config_mgr):
+    guild = make_guild(members=3)
+    config_mgr._config["channels"] = {"log": "123"}
+    bot = SimpleNamespace(get_guild=lambda guild_id: None)
+    digest = LogDigest(bot, config_mgr, interval=0, maxsize=1)
+    bus = EventBus()
+
+    async def run():
+        digest.start(bus)
+        bus.publish(award(guild, "manual 0"))
+        bus.publish(award(guild, "manual 1"))
+        await digest.stop()
+    asyncio.run(run())
+    assert digest._dropped_reported == 0
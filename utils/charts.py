@@ -0,0 +1,132 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import asyncio
+import importlib.util
+import io
+
+from storage.records import now_micros
+from utils.helpers import title_case_house
+from utils.metrics import incr, timer
+
+if TYPE_CHECKING:
+    from bot.scoring import ScoreManager
+
+# matplotlib is optional and takes ~0.3s to import, so the first render loads it
+_HAVE_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
+
+CHART_DAYS = 30
+CHART_FILENAME = "house_momentum.png"
+HOUSE_COLORS = {"house_veridian": "#00FF88", "feathered_host": "#FFD700"}
+_DAY_SECONDS = 86400
+
+def available() -> bool:
+    return _HAVE_MATPLOTLIB
+
+def render_house_chart(days: List[str], lines: List[Tuple[str, str, List[int]]]) -> bytes:
+    """PNG of house totals over ``days``; ``lines`` are (label, color, values).
+
+    Uses matplotlib's object API (no pyplot state), so it is safe to run
+    on a worker thread.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 3), dpi=100, facecolor="#2B2D31")
+    ax = fig.add_subplot()
+    ax.set_facecolor("#2B2D31")
+    x = range(len(days))
+    for label, color, values in lines:
+        ax.plot(x, values, label=label, color=color, linewidth=2)
+    step = max(1, len(days) // 6)
+    ax.set_xticks(list(x)[::step], days[::step])
+    ax.tick_params(colors="#B5BAC1", labelsize=8)
+    for spine in ax.spines.values():
+        spine.set_color("#4E5058")
+    ax.grid(True, color="#3F4147", linewidth=0.5)
+    ax.legend(facecolor="#2B2D31", edgecolor="#4E5058", labelcolor="#DBDEE1", fontsize=8, loc="upper left")
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", facecolor=fig.get_facecolor())
+    return buf.getvalue()
+
+
+class ChartCache:
+    """Rendered house charts as PNG bytes, keyed by (house series version, window, UTC day).
+
+    A chart is rendered on a single worker thread the first time its key
+    is asked for; later views, and concurrent requests for the same key,
+    share that one render.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[int, int, int], bytes]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, int, int], asyncio.Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _key(score_mgr: ScoreManager, days: int, now: int) -> Tuple[int, int, int]:
+        return (score_mgr.house_series.version, days, now // (_DAY_SECONDS * 1_000_000))
+
+    def is_cached(self, score_mgr: ScoreManager, days: int = CHART_DAYS) -> bool:
+        """Whether ``house_chart`` would answer without rendering."""
+        return self._key(score_mgr, days, now_micros()) in self._cache
+
+    async def house_chart(self, score_mgr: ScoreManager, days: int = CHART_DAYS) -> Optional[bytes]:
+        """Cumulative house points over the last ``days`` days, or None without matplotlib."""
+        if not available():
+            return None
+        now = now_micros()
+        series = score_mgr.house_series
+        key = self._key(score_mgr, days, now)
+        png = self._cache.get(key)
+        if png is not None:
+            self._cache.move_to_end(key)
+            incr("charts.cache.hits")
+            return png
+
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        incr("charts.cache.misses")
+        day_numbers, totals = series.cumulative(score_mgr.get_house_totals(), days, now)
+        labels = [datetime.fromtimestamp(d * _DAY_SECONDS, tz=timezone.utc).strftime("%b %d") for d in day_numbers]
+        lines = [(title_case_house(h), HOUSE_COLORS.get(h, "#9D84FF"), values) for h, values in totals.items()]
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="houseledger-charts")
+        loop = asyncio.get_running_loop()
+        future = self._inflight[key] = loop.create_future()
+        try:
+            with timer("charts.render"):
+                png = await loop.run_in_executor(self._executor, render_house_chart, labels, lines)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters still get it; don't warn when there are none
+            raise
+        except BaseException:
+            # Cancelled render: waiters must still wake up
+            future.cancel()
+            raise
+        else:
+            future.set_result(png)
+        finally:
+            self._inflight.pop(key, None)
+
+        self._cache[key] = png
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return png
+
+    async def aclose(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+house_charts = ChartCache()
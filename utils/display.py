@@ -1,34 +1,119 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+import json
 
 import discord
 
 from utils.embeds import create_standings_embed
+from utils.metrics import incr, timer
+from utils.names import prefetch_players
 
 if TYPE_CHECKING:
     from bot.config import ConfigManager
     from bot.scoring import ScoreManager
 
+# What each display message currently shows, by message id: the embeds
+# without their timestamps, and the attachment filenames. Empty after a
+# restart, so the first update edits every message once.
+_last_sent: Dict[int, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+
+def _embed_signature(embed: discord.Embed) -> str:
+    data = embed.to_dict()
+    # The timestamp is "now" on every render and would defeat the comparison
+    data.pop("timestamp", None)
+    return json.dumps(data, sort_keys=True, ensure_ascii=False)
+
+def _payload_signature(embeds: Sequence[discord.Embed], files: Sequence[discord.File]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    return tuple(_embed_signature(e) for e in embeds), tuple(f.filename for f in files)
+
+def _files_for(embeds: Sequence[discord.Embed], files: Sequence[discord.File]) -> List[discord.File]:
+    urls = set()
+    for embed in embeds:
+        for url in (embed.thumbnail.url, embed.image.url):
+            if url and url.startswith("attachment://"):
+                urls.add(url[len("attachment://"):])
+    return [f for f in files if f.filename in urls]
+
+def split_display(
+    embeds: List[discord.Embed],
+    files: List[discord.File],
+    messages: int
+) -> List[Tuple[List[discord.Embed], List[discord.File]]]:
+    """Spread the standings embeds over ``messages`` display messages, one each, the last taking the rest.
+
+    Never returns more groups than there are embeds, so spare messages are
+    left as they are rather than edited to an empty message.
+    """
+    messages = min(messages, len(embeds))
+    if messages <= 1:
+        return [(embeds, files)]
+    groups = [[e] for e in embeds[:messages - 1]]
+    groups.append(embeds[messages - 1:])
+    return [(group, _files_for(group, files)) for group in groups]
+
+def remember_display(message_id: int, embeds: Sequence[discord.Embed], files: Sequence[discord.File]) -> None:
+    """Record what a freshly sent display message shows, so the next update can diff against it."""
+    _last_sent[message_id] = _payload_signature(embeds, files)
+
+def _close_files(files: Sequence[discord.File], keep: Sequence[discord.File] = ()) -> None:
+    for f in files:
+        if f not in keep:
+            f.close()
+
 
 async def update_display_message(guild: discord.Guild, config_mgr: ConfigManager, score_mgr: ScoreManager) -> None:
-    """Update the auto-display message with current standings."""
+    """Update the auto-display messages with current standings.
+
+    Each message is edited only if its embeds changed, ignoring timestamps;
+    images are re-uploaded only if the set of attachments changed.
+    """
     channel_id = config_mgr.get_display_channel_id()
-    message_id = config_mgr.get_display_message_id()
+    message_ids = [int(m) for m in config_mgr.get_display_message_ids() if m.isdigit()]
+
+    if not channel_id or not channel_id.isdigit() or not message_ids:
+        return
 
-    if not channel_id or not message_id:
+    channel = guild.get_channel(int(channel_id))
+    if not channel or not isinstance(channel, discord.TextChannel):
+        incr("display.skipped")
         return
-    
-    try:
-        channel = guild.get_channel(int(channel_id))
-        if not channel or not isinstance(channel, discord.TextChannel):
-            return
 
-        message = await channel.fetch_message(int(message_id))
+    with timer("display.update"):
         houses = score_mgr.get_house_totals()
         top_players = score_mgr.get_top_players(15)
+        await prefetch_players(guild, top_players)
         embeds, files = create_standings_embed(guild, houses, top_players, config_mgr)
-        
-        await message.edit(embeds=embeds, attachments=files)
+        groups = split_display(embeds, files, len(message_ids))
+
+        sent: List[discord.File] = []
+        for message_id, (group_embeds, group_files) in zip(message_ids, groups):
+            signature = _payload_signature(group_embeds, group_files)
+            previous: Optional[Tuple] = _last_sent.get(message_id)
+            if previous == signature:
+                incr("display.unchanged")
+                continue
+
+            kwargs = {"embeds": group_embeds}
+            if previous is None or previous[1] != signature[1]:
+                kwargs["attachments"] = group_files
+                sent.extend(group_files)
+
+            try:
+                with timer("discord.edit_message"):
+                    await channel.get_partial_message(message_id).edit(**kwargs)
+                _last_sent[message_id] = signature
+                incr("display.edits")
+            except discord.NotFound:
+                _last_sent.pop(message_id, None)
+                incr("display.errors")
+                print(f"[House Ledger] Display message {message_id} not found in #{channel.name}; re-run /set_display_channel.")
+            except discord.Forbidden:
+                incr("display.errors")
+                print(f"[House Ledger] Missing permission to edit the display message in #{channel.name}.")
+            except discord.HTTPException as e:
+                _last_sent.pop(message_id, None)
+                incr("display.errors")
+                print(f"[House Ledger] Display update failed: {e}")
 
-    except (discord.NotFound, discord.Forbidden, ValueError, Exception):
-        pass
\ No newline at end of file
+        # discord.File opens its file eagerly; release the ones not uploaded
+        _close_files(files, keep=sent)
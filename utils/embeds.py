@@ -1,18 +1,24 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+import io
 import os
 
 import discord
 
 from utils.helpers import embed_kv, title_case_house
+from utils.metrics import timed
+from utils.render_context import RenderContext, build_render_context
+from storage.records import ScoreEvent
 
+@timed("render.diag_embed")
 def create_diag_embed(
     guild: discord.Guild,
     weighting: Dict[str, Any],
     vr_count: int,
     fh_count: int,
     houses: Dict[str, int],
-    show_members: bool
+    show_members: bool,
+    shard_rows: Optional[List[Dict[str, Any]]] = None
 ) -> discord.Embed:
     embed = discord.Embed(title="HOUSE LEDGER — DIAGNOSTICS", color=0x0E171B)
     embed.add_field(name="Guild", value=f"{guild.name} ({guild.id})", inline=False)
@@ -29,11 +35,83 @@ def create_diag_embed(
         "House Veridian": houses.get("house_veridian", 0),
         "Feathered Host": houses.get("feathered_host", 0)
     }), inline=False)
+    if shard_rows:
+        shard_lines = []
+        for row in shard_rows:
+            latency = f"{row['latency_ms']:.0f}ms" if row["latency_ms"] >= 0 else "n/a"
+            current = " ◀" if row["shard_id"] == guild.shard_id else ""
+            shard_lines.append(
+                f"**#{row['shard_id']}**: {latency} • {row['events_per_min']}/min • {row['events_total']} total{current}"
+            )
+        embed.add_field(name="Shards", value="\n".join(shard_lines)[:1024], inline=False)
     embed.set_footer(text="All Offerings are recorded. Balance will be kept.")
     return embed
 
-def create_main_standings_embed(guild: discord.Guild, houses: Dict[str, int], config_mgr) -> Tuple[discord.Embed, List[discord.File]]:
-    """Creates the main house standings embed with progress bars."""
+def create_perf_embed(rows: List[Dict[str, Any]], counters: Dict[str, int], limit: int = 20) -> discord.Embed:
+    """Timer percentiles (slowest p95 first) and counters, as collected by utils.metrics."""
+    embed = discord.Embed(title="HOUSE LEDGER — PERFORMANCE", color=0x0E171B)
+    if rows:
+        lines = [f"`{'timer (ms)':<28} {'calls':>7} {'p50':>6} {'p95':>6} {'p99':>6}`"]
+        for row in rows[:limit]:
+            lines.append(
+                f"`{row['name'][:28]:<28} {row['count']:>7} {row['p50_ms']:>6.1f} {row['p95_ms']:>6.1f} {row['p99_ms']:>6.1f}`"
+            )
+        embed.add_field(name="Timers", value="\n".join(lines)[:1024], inline=False)
+    else:
+        embed.add_field(name="Timers", value="Nothing recorded yet.", inline=False)
+    if counters:
+        embed.add_field(name="Counters", value=embed_kv(dict(sorted(counters.items())))[:1024], inline=False)
+    embed.set_footer(text="Since process start.")
+    return embed
+
+@timed("render.stats_embed")
+def create_stats_embed(report: Dict[str, Any]) -> discord.Embed:
+    """Analytics summary from ``bot.analytics.build_report``."""
+    embed = discord.Embed(title="HOUSE LEDGER — STATS", color=0x0E171B)
+
+    momentum = [
+        f"**{title_case_house(house)}**: {m['recent']} pts this week ({m['change']:+d} vs last week)"
+        for house, m in report["house_momentum"].items()
+    ]
+    embed.add_field(name="Momentum", value="\n".join(momentum) or "No house points yet.", inline=False)
+
+    dist = report["award_distribution"]
+    if dist["awards"]:
+        common = ", ".join(f"{value}×{count}" for value, count in dist["common"])
+        embed.add_field(name="Awards", value=embed_kv({
+            "awards": dist["awards"],
+            "removals": dist["removals"],
+            "mean": dist["mean"],
+            "p50 / p90 / p99": f"{dist['p50']:g} / {dist['p90']:g} / {dist['p99']:g}",
+            "largest": dist["max"],
+            "most common": common
+        }), inline=False)
+    else:
+        embed.add_field(name="Awards", value="No awards yet.", inline=False)
+
+    weighting = [
+        f"**{title_case_house(house)}**: {w['weighted_awards']} awards, {w['base_points']} → {w['house_points']} pts ({w['net']:+d})"
+        for house, w in report["weighting_impact"].items() if w["weighted_awards"]
+    ]
+    embed.add_field(name="Weighting impact", value="\n".join(weighting) or "No weighted awards.", inline=False)
+
+    recent = report["points_per_day"][-7:]
+    lines = [f"`{'day':<10} {'events':>6} {'house':>7} {'player':>7}`"]
+    for row in recent:
+        lines.append(f"`{row['day']:<10} {row['events']:>6} {row['house_points']:>7} {row['player_points']:>7}`")
+    embed.add_field(name="Last 7 days", value="\n".join(lines)[:1024], inline=False)
+
+    embed.set_footer(text=f"{report['events']} events • python -m bot.analytics for the full report")
+    return embed
+
+@timed("render.main_standings_embed")
+def create_main_standings_embed(
+    guild: discord.Guild,
+    houses: Dict[str, int],
+    config_mgr,
+    chart: Optional[bytes] = None
+) -> Tuple[discord.Embed, List[discord.File]]:
+    """Creates the main house standings embed with progress bars, and the house chart PNG as its image if given."""
     ordered_houses = sorted(houses.items(), key=lambda kv: kv[1], reverse=True)
     leading_house = ordered_houses[0][0] if ordered_houses else None
 
@@ -94,14 +172,39 @@ def create_main_standings_embed(guild: discord.Guild, houses: Dict[str, int], co
 
     # Add spacing
     embed.add_field(name="\u200B", value="\u200B", inline=False)
+
+    if chart:
+        from utils.charts import CHART_FILENAME
+        files.append(discord.File(io.BytesIO(chart), filename=CHART_FILENAME))
+        embed.set_image(url=f"attachment://{CHART_FILENAME}")
     
     embed.set_footer(text="⚖️ Balance will be kept. Glory to the houses!")
     return embed, files
 
-def create_overall_leaderboard_embed(guild: discord.Guild, top_players: List[Tuple[str, int]], config_mgr) -> Tuple[discord.Embed, List[discord.File]]:
-    """Creates the overall player leaderboard embed."""
+# period: (title, footer) of the overall leaderboard
+_PERIOD_LABELS: Dict[Optional[str], Tuple[str, str]] = {
+    None: ("OVERALL RANKINGS", "Ranked by total points across all activities"),
+    "week": ("THIS WEEK", "Ranked by points earned in the last 7 days"),
+    "month": ("THIS MONTH", "Ranked by points earned in the last 30 days"),
+    "season": ("THIS SEASON", "Ranked by points earned this season"),
+}
+
+@timed("render.overall_leaderboard_embed")
+def create_overall_leaderboard_embed(
+    guild: discord.Guild,
+    top_players: List[Tuple[str, int]],
+    config_mgr,
+    ctx: Optional[RenderContext] = None,
+    period: Optional[str] = None
+) -> Tuple[discord.Embed, List[discord.File]]:
+    """Creates the overall player leaderboard embed; ``period`` is "week", "month" or "season" for windowed rankings."""
+    top_players = top_players[:15]
+    if ctx is None:
+        ctx = build_render_context(guild, config_mgr, top_players)
+
+    title, footer = _PERIOD_LABELS.get(period, _PERIOD_LABELS[None])
     embed = discord.Embed(
-        title="👥 TOP PLAYERS — OVERALL RANKINGS 👥",
+        title=f"👥 TOP PLAYERS — {title} 👥",
         description="*The mightiest warriors across all houses*",
         color=0x9D84FF,
         timestamp=discord.utils.utcnow()
@@ -111,70 +214,140 @@ def create_overall_leaderboard_embed(guild: discord.Guild, top_players: List[Tup
     embed.add_field(name="\u200B", value="\u200B", inline=False)
 
     player_text = ""
-    for i, (user_id, pts) in enumerate(top_players[:15]):
-        member = guild.get_member(int(user_id))
-        name = member.display_name if member else f"User {user_id}"
+    for i, (user_id, pts) in enumerate(top_players):
+        name = ctx.name(user_id)
         medal = ["🥇", "🥈", "🥉"][i] if i < 3 else f"#{i+1:2d}"
-
-        player_house = None
-        role_ids = config_mgr.get_house_role_ids()
-        for house_key, role_id_list in role_ids.items():
-            for role_id in role_id_list:
-                if role_id and role_id.isdigit():
-                    role = guild.get_role(int(role_id))
-                    if role and member and role in member.roles:
-                        player_house = house_key
-                        break
-            if player_house:
-                break
-
-        leader_marker = ""
-        if player_house:
-            house_members = set()
-            role_ids = config_mgr.get_house_role_ids()
-            for hk, rid_list in role_ids.items():
-                if hk == player_house:
-                    for rid in rid_list:
-                        if rid and rid.isdigit():
-                            role = guild.get_role(int(rid))
-                            if role:
-                                house_members.update(str(m.id) for m in role.members)
-                    break
-            if house_members:
-                house_scores = [p for uid, p in top_players if uid in house_members]
-                if house_scores and pts == max(house_scores):
-                    leader_marker = " 👑"
+        player_house = ctx.house_of(user_id)
+        leader_marker = " 👑" if ctx.is_house_leader(user_id, pts) else ""
 
         house_emoji = "⚔️" if player_house == "house_veridian" else "🪶" if player_house == "feathered_host" else "🏠"
         house_display = f"{house_emoji} *{title_case_house(player_house)}*" if player_house else "*[No House]*"
         player_text += f"{medal} **{name}** {house_display}\n    ➤ **{pts}** pts{leader_marker}\n"
 
-    embed.add_field(name="✦ ELITE COMPETITORS ✦", value=player_text, inline=False)
+    embed.add_field(name="✦ ELITE COMPETITORS ✦", value=player_text or "*No points earned yet*", inline=False)
     
     # Add spacing
     embed.add_field(name="\u200B", value="\u200B", inline=False)
     
-    embed.set_footer(text="⚖️ Ranked by total points across all activities")
+    embed.set_footer(text=f"⚖️ {footer}")
     return embed, []
 
-def create_house_leaderboard_embed(guild: discord.Guild, houses: Dict[str, int], top_players: List[Tuple[str, int]], config_mgr, house_key: str) -> Tuple[discord.Embed, List[discord.File]]:
+@timed("render.ranking_page_embed")
+def create_ranking_page_embed(
+    guild: discord.Guild,
+    rows: List[Tuple[int, str, int]],
+    page: int,
+    page_count: int,
+    total_players: int,
+    config_mgr
+) -> discord.Embed:
+    """One page of the full player ranking; ``rows`` are (rank, user_id, points)."""
+    ctx = build_render_context(guild, config_mgr, [(uid, pts) for _, uid, pts in rows])
+
+    lines = []
+    for rank, user_id, pts in rows:
+        house_key = ctx.house_of(user_id)
+        house_emoji = "⚔️" if house_key == "house_veridian" else "🪶" if house_key == "feathered_host" else "🏠"
+        medal = ["🥇", "🥈", "🥉"][rank - 1] if rank <= 3 else f"`#{rank}`"
+        lines.append(f"{medal} {house_emoji} **{ctx.name(user_id)}** — {pts} pts")
+
+    # The description allows 4096 characters, enough for a page of long names
+    embed = discord.Embed(
+        title="👥 FULL RANKINGS 👥",
+        description="\n".join(lines)[:4096] or "*No players yet*",
+        color=0x9D84FF
+    )
+    embed.set_footer(text=f"Page {page + 1}/{page_count} • {total_players} players ranked")
+    return embed
+
+def _event_line(event: ScoreEvent) -> str:
+    when = f"<t:{event.timestamp // 1_000_000}:R>"
+    pts = event.player_points_awarded
+    return f"`{pts:+d}` {event.reason} • {when}"
+
+@timed("render.profile_embed")
+def create_profile_embed(
+    guild: discord.Guild,
+    user_id: str,
+    total: int,
+    rank: Optional[int],
+    total_players: int,
+    awards: List[ScoreEvent],
+    solves: List[ScoreEvent],
+    solve_count: int,
+    config_mgr
+) -> discord.Embed:
+    """A player's total, rank, house and latest awards and solves."""
+    ctx = build_render_context(guild, config_mgr, [(user_id, total)])
+    house_key = ctx.house_of(user_id)
+    house_emoji = "⚔️" if house_key == "house_veridian" else "🪶" if house_key == "feathered_host" else "🏠"
+
+    embed = discord.Embed(
+        title=f"📜 {ctx.name(user_id)}",
+        color=0x9D84FF,
+        timestamp=discord.utils.utcnow()
+    )
+    embed.add_field(name="Points", value=f"**{total}**", inline=True)
+    embed.add_field(name="Rank", value=f"#{rank} of {total_players}" if rank else "Unranked", inline=True)
+    embed.add_field(name="House", value=f"{house_emoji} {title_case_house(house_key)}" if house_key else "[No House]", inline=True)
+    embed.add_field(
+        name="Recent awards",
+        value="\n".join(_event_line(e) for e in awards)[:1024] or "*None yet*",
+        inline=False
+    )
+    embed.add_field(
+        name=f"Solves ({solve_count})",
+        value="\n".join(_event_line(e) for e in solves)[:1024] or "*None yet*",
+        inline=False
+    )
+    return embed
+
+@timed("render.season_results_embed")
+def create_season_results_embed(guild: discord.Guild, season_name: str, summary: Dict[str, Any], config_mgr) -> discord.Embed:
+    """Final standings of a finished season, from its frozen summary."""
+    top_players = [(uid, pts) for uid, pts in summary["top_players"][:15]]
+    ctx = build_render_context(guild, config_mgr, top_players)
+
+    embed = discord.Embed(
+        title=f"🏁 {season_name.upper()} — FINAL STANDINGS 🏁",
+        color=0xFFD700
+    )
+    houses = sorted(summary["houses"].items(), key=lambda kv: kv[1], reverse=True)
+    house_lines = []
+    for i, (house_key, pts) in enumerate(houses):
+        medal = ["🥇", "🥈", "🥉"][i] if i < 3 else f"#{i+1}"
+        house_lines.append(f"{medal} **{title_case_house(house_key)}** — {pts} pts")
+    embed.add_field(name="✦ HOUSES ✦", value="\n".join(house_lines) or "*No house points*", inline=False)
+
+    player_lines = []
+    for i, (user_id, pts) in enumerate(top_players):
+        medal = ["🥇", "🥈", "🥉"][i] if i < 3 else f"`#{i+1}`"
+        player_lines.append(f"{medal} **{ctx.name(user_id)}** — {pts} pts")
+    embed.add_field(name="✦ TOP PLAYERS ✦", value="\n".join(player_lines)[:1024] or "*No players*", inline=False)
+
+    embed.set_footer(text=f"{summary['player_count']} players took part • Ended {summary['ended'][:10]}")
+    return embed
+
+@timed("render.house_leaderboard_embed")
+def create_house_leaderboard_embed(
+    guild: discord.Guild,
+    houses: Dict[str, int],
+    top_players: List[Tuple[str, int]],
+    config_mgr,
+    house_key: str,
+    ctx: Optional[RenderContext] = None
+) -> Tuple[discord.Embed, List[discord.File]]:
     """Creates a house-specific leaderboard embed."""
-    house_roles = config_mgr.get_house_role_ids()
-    role_id_list = house_roles.get(house_key, [])
-    if not role_id_list:
+    if ctx is None:
+        ctx = build_render_context(guild, config_mgr, top_players)
+    if not any(hk == house_key and ids for hk, ids in ctx.house_roles):
         return None, []
 
-    house_members = set()
-    for role_id in role_id_list:
-        if role_id and role_id.isdigit():
-            role = guild.get_role(int(role_id))
-            if role:
-                house_members.update(str(m.id) for m in role.members)
-    
-    if not house_members:
+    member_count = ctx.house_size(house_key)
+    if not member_count:
         return None, []
-    
-    house_top = [(uid, pts) for uid, pts in top_players if uid in house_members][:12]
+
+    house_top = [(uid, pts) for uid, pts in top_players if ctx.house_of(uid) == house_key][:12]
     active_participants = len(house_top) if house_top else 0
 
     house_config = {
@@ -206,8 +379,7 @@ def create_house_leaderboard_embed(guild: discord.Guild, houses: Dict[str, int],
     if house_top:
         house_text = ""
         for i, (user_id, pts) in enumerate(house_top):
-            member = guild.get_member(int(user_id))
-            name = member.display_name if member else f"User {user_id}"
+            name = ctx.name(user_id)
             medal = ["🥇", "🥈", "🥉"][i] if i < 3 else f"#{i+1:2d}"
 
             if i == 0:
@@ -231,7 +403,7 @@ def create_house_leaderboard_embed(guild: discord.Guild, houses: Dict[str, int],
     # Add spacing
     embed.add_field(name="\u200B", value="\u200B", inline=False)
 
-    embed.add_field(name="👥 HOUSE MEMBERS", value=f"**{len(house_members)}** total", inline=True)
+    embed.add_field(name="👥 HOUSE MEMBERS", value=f"**{member_count}** total", inline=True)
     embed.add_field(name="🎮 ACTIVE PARTICIPANTS", value=f"**{active_participants}** scoring", inline=True)
     
     # Add spacing
@@ -250,21 +422,23 @@ def create_house_leaderboard_embed(guild: discord.Guild, houses: Dict[str, int],
     embed.set_footer(text=f"⚖️ House standing: {standing}/{len(ordered_houses)}")
     return embed, files
 
+@timed("render.standings_embed")
 def create_standings_embed(guild: discord.Guild, houses: Dict[str, int], top_players: List[Tuple[str, int]], config_mgr) -> Tuple[List[discord.Embed], List[discord.File]]:
     """Creates multi-embed scoreboard system with progress bars and house leaderboards."""
     embeds = []
     files = []
+    ctx = build_render_context(guild, config_mgr, top_players)
 
     embed, f = create_main_standings_embed(guild, houses, config_mgr)
     embeds.append(embed)
     files.extend(f)
 
-    embed, f = create_overall_leaderboard_embed(guild, top_players, config_mgr)
+    embed, f = create_overall_leaderboard_embed(guild, top_players, config_mgr, ctx)
     embeds.append(embed)
     files.extend(f)
 
     for house_key in ["house_veridian", "feathered_host"]:
-        embed, f = create_house_leaderboard_embed(guild, houses, top_players, config_mgr, house_key)
+        embed, f = create_house_leaderboard_embed(guild, houses, top_players, config_mgr, house_key, ctx)
         if embed:
             embeds.append(embed)
             files.extend(f)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, Optional
 import math
 
 import discord
@@ -34,6 +34,16 @@ def title_case_house(key: str) -> str:
         return "House Veridian"
     return key.title()
 
+def member_house(member: Optional[discord.Member], config_mgr: ConfigManager) -> Optional[str]:
+    """Key of the first configured house whose role ``member`` has, or None."""
+    if member is None:
+        return None
+    member_role_ids = {r.id for r in member.roles}
+    for house_key, role_id_list in config_mgr.get_house_role_ids().items():
+        if any(role_id and role_id.isdigit() and int(role_id) in member_role_ids for role_id in role_id_list):
+            return house_key
+    return None
+
 def apply_rounding(value: float, mode: str) -> int:
     if mode == "floor":
         return math.floor(value)
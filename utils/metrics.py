@@ -0,0 +1,202 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+import asyncio
+import bisect
+import functools
+import inspect
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def _geometric_buckets(start: float, stop: float, factor: float) -> Tuple[float, ...]:
+    bounds = []
+    bound = start
+    while bound < stop:
+        bounds.append(round(bound, 7))
+        bound *= factor
+    bounds.append(float("inf"))
+    return tuple(bounds)
+
+# Upper bounds in seconds, 50µs to ~60s in 25% steps; the last bucket catches
+# everything slower. Quantiles are interpolated within a bucket.
+DEFAULT_BUCKETS: Tuple[float, ...] = _geometric_buckets(0.00005, 60.0, 1.25)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with an exponentially weighted mean."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, alpha: float = 0.2):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._alpha = alpha
+        self._ewma: Optional[float] = None
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if self._ewma is None:
+            self._ewma = seconds
+        else:
+            self._ewma += self._alpha * (seconds - self._ewma)
+
+    @property
+    def ewma(self) -> float:
+        return self._ewma or 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate of the q-th quantile (0 < q <= 1), interpolated within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = min(self.buckets[i], self.max)
+                if upper <= lower:
+                    return upper
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+
+histograms: Dict[str, LatencyHistogram] = {}
+counters: Dict[str, int] = {}
+
+def get_histogram(name: str) -> LatencyHistogram:
+    hist = histograms.get(name)
+    if hist is None:
+        hist = histograms[name] = LatencyHistogram()
+    return hist
+
+def incr(name: str, n: int = 1) -> None:
+    counters[name] = counters.get(name, 0) + n
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Time the block into the ``name`` histogram; exceptions also count as ``<name>.errors``."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        incr(f"{name}.errors")
+        raise
+    finally:
+        get_histogram(name).observe(time.perf_counter() - start)
+
+def timed(name: str) -> Callable:
+    """Decorator form of ``timer`` for plain and async functions."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timer(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def snapshot_rows() -> List[Dict[str, Any]]:
+    """One row per timer with call count and p50/p95/p99/max in milliseconds, slowest p95 first."""
+    rows = []
+    for name, hist in histograms.items():
+        if not hist.count:
+            continue
+        rows.append({
+            "name": name,
+            "count": hist.count,
+            "p50_ms": hist.percentile(0.50) * 1000,
+            "p95_ms": hist.percentile(0.95) * 1000,
+            "p99_ms": hist.percentile(0.99) * 1000,
+            "max_ms": hist.max * 1000,
+        })
+    rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+    return rows
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def to_prometheus() -> str:
+    """All timers and counters in the Prometheus text exposition format."""
+    lines = [
+        "# HELP houseledger_timer_seconds Duration of instrumented operations.",
+        "# TYPE houseledger_timer_seconds summary",
+    ]
+    for name, hist in sorted(histograms.items()):
+        label = _label(name)
+        for q in (0.5, 0.95, 0.99):
+            lines.append(f'houseledger_timer_seconds{{name="{label}",quantile="{q}"}} {hist.percentile(q):.6f}')
+        lines.append(f'houseledger_timer_seconds_sum{{name="{label}"}} {hist.total:.6f}')
+        lines.append(f'houseledger_timer_seconds_count{{name="{label}"}} {hist.count}')
+    lines.append("# HELP houseledger_events_total Count of instrumented events.")
+    lines.append("# TYPE houseledger_events_total counter")
+    for name, value in sorted(counters.items()):
+        lines.append(f'houseledger_events_total{{name="{_label(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+async def write_prometheus_periodically(path: str, interval: float = 15.0) -> None:
+    """Rewrite ``path`` with the Prometheus dump every ``interval`` seconds, e.g. for node_exporter's textfile collector."""
+    while True:
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(to_prometheus())
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[House Ledger] Writing metrics to {path} failed: {e}")
+        await asyncio.sleep(interval)
+
+async def serve_prometheus(host: str, port: int) -> asyncio.AbstractServer:
+    """Serve the Prometheus dump over plain HTTP on ``host:port`` for scraping."""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            body = to_prometheus().encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode("ascii")
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def resident_memory_mb() -> Optional[float]:
+    """Current resident set size in MB, or the peak where only that is available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+import discord
+
+from utils.metrics import incr, timer
+
+# Gateway member queries accept at most 100 user ids
+QUERY_BATCH = 100
+# Renders wait at most this long per batch; slower lookups fall back to "User <id>"
+QUERY_TIMEOUT = 2.0
+
+class DisplayNameCache:
+    """Display names by user id, with a TTL, kept current by member events.
+
+    Members in the gateway cache are always read live; this cache covers the
+    rest. Names of members who left stay until they expire, and ids that the
+    gateway could not resolve are remembered briefly so a leaderboard does
+    not re-query them on every render.
+    """
+
+    def __init__(self, ttl: float = 3600.0, missing_ttl: float = 300.0, max_entries: int = 50000):
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[Optional[str], float]] = {}
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: int) -> Optional[str]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        name, expires = entry
+        if expires < time.monotonic():
+            del self._entries[user_id]
+            return None
+        return name
+
+    def is_known(self, user_id: int) -> bool:
+        """True if the id has a fresh entry, including a remembered miss."""
+        entry = self._entries.get(user_id)
+        return entry is not None and entry[1] >= time.monotonic()
+
+    def set(self, user_id: int, name: Optional[str], ttl: Optional[float] = None) -> None:
+        now = time.monotonic()
+        self._entries[user_id] = (name, now + (self.ttl if ttl is None else ttl))
+        if len(self._entries) > self.max_entries:
+            self._entries = {uid: e for uid, e in self._entries.items() if e[1] >= now}
+
+    def update_member(self, member: discord.Member) -> None:
+        self.set(member.id, member.display_name)
+
+    def update_user(self, user: discord.abc.User) -> None:
+        # Only refresh ids we already track; a user update says nothing about guild nicknames
+        if user.id in self._entries and self._entries[user.id][0] is not None:
+            self.set(user.id, user.display_name)
+
+    def display_name(self, guild: discord.Guild, user_id: int, member: Optional[discord.Member] = None) -> Optional[str]:
+        """Name for ``user_id``: live from the member cache when present, else from this cache."""
+        if member is None:
+            member = guild.get_member(user_id)
+        if member is not None:
+            return member.display_name
+        return self.get(user_id)
+
+    async def prefetch(self, guild: discord.Guild, user_ids: Iterable[int]) -> None:
+        """Resolve ids missing from the member cache in batched gateway queries.
+
+        Found members land in the guild's member cache; ids that are not in
+        the guild are remembered as misses for ``missing_ttl`` seconds.
+        Concurrent callers wait for queries already in flight instead of
+        repeating them.
+        """
+        missing: List[int] = []
+        waiting: List[asyncio.Future] = []
+        for uid in user_ids:
+            if guild.get_member(uid) is not None or self.is_known(uid):
+                continue
+            future = self._inflight.get(uid)
+            if future is not None:
+                waiting.append(future)
+            elif uid not in missing:
+                missing.append(uid)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            for uid in missing:
+                self._inflight[uid] = future
+            try:
+                for start in range(0, len(missing), QUERY_BATCH):
+                    await self._query(guild, missing[start:start + QUERY_BATCH])
+            finally:
+                for uid in missing:
+                    self._inflight.pop(uid, None)
+                future.set_result(None)
+        if waiting:
+            await asyncio.gather(*waiting)
+
+    async def _query(self, guild: discord.Guild, batch: List[int]) -> None:
+        incr("names.queries")
+        try:
+            with timer("discord.query_members"):
+                members = await asyncio.wait_for(
+                    guild.query_members(user_ids=batch, limit=len(batch), cache=True), timeout=QUERY_TIMEOUT
+                )
+        except (asyncio.TimeoutError, discord.ClientException) as e:
+            # ClientException: the members intent is off; fall back to "User <id>"
+            print(f"[House Ledger] Member lookup for {len(batch)} users failed: {e}")
+            members = []
+        found = set()
+        for member in members:
+            found.add(member.id)
+            self.update_member(member)
+        for uid in batch:
+            if uid not in found and not self.is_known(uid):
+                self.set(uid, None, ttl=self.missing_ttl)
+
+
+display_names = DisplayNameCache()
+
+async def prefetch_players(guild: discord.Guild, players: Iterable[Tuple[str, int]]) -> None:
+    """Make sure the leaderboard rows in ``players`` resolve to names before rendering."""
+    await display_names.prefetch(guild, [int(uid) for uid, _ in players])
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import List
 import discord
 
+from storage.records import Puzzle
+from utils.metrics import timed
+
 HOUSE_THEMES = {
     "house_veridian": {
         "color": 0x00FF88,
@@ -21,13 +24,14 @@ HOUSE_THEMES = {
     }
 }
 
-def create_puzzle_embed(puzzle: Dict[str, Any], house: str) -> discord.Embed:
+@timed("render.puzzle_embed")
+def create_puzzle_embed(puzzle: Puzzle, house: str) -> discord.Embed:
     """Create a beautiful puzzle embed for a specific house"""
     theme = HOUSE_THEMES.get(house, HOUSE_THEMES["house_veridian"])
     
     embed = discord.Embed(
-        title=f"{theme['emoji']} {puzzle['title']} {theme['emoji']}",
-        description=f"{theme['glow']}\n\n{puzzle['description']}\n\n{theme['banner']}",
+        title=f"{theme['emoji']} {puzzle.title} {theme['emoji']}",
+        description=f"{theme['glow']}\n\n{puzzle.description}\n\n{theme['banner']}",
         color=theme['color'],
         timestamp=discord.utils.utcnow()
     )
@@ -35,31 +39,31 @@ def create_puzzle_embed(puzzle: Dict[str, Any], house: str) -> discord.Embed:
     # Puzzle content
     embed.add_field(
         name=f"{theme['accent']} The Challenge {theme['accent']}",
-        value=puzzle['puzzle_content'],
+        value=puzzle.puzzle_content,
         inline=False
     )
     
     # Points value
     embed.add_field(
         name="💎 Reward",
-        value=f"**{puzzle['points']} Points**",
+        value=f"**{puzzle.points} Points**",
         inline=True
     )
     
     # Hint (if available)
-    if puzzle.get('hint'):
+    if puzzle.hint:
         embed.add_field(
             name="💡 Hint",
-            value=f"||{puzzle['hint']}||",
+            value=f"||{puzzle.hint}||",
             inline=True
         )
     
     # Image (if available)
-    if puzzle.get('image_url'):
-        embed.set_image(url=puzzle['image_url'])
+    if puzzle.image_url:
+        embed.set_image(url=puzzle.image_url)
     
     # Footer
-    footer_text = puzzle.get('footer_text', 'Submit your answer in this channel')
+    footer_text = puzzle.footer_text or 'Submit your answer in this channel'
     embed.set_footer(
         text=f"{theme['name']} • {footer_text}",
         icon_url=None
@@ -74,7 +78,8 @@ def create_puzzle_embed(puzzle: Dict[str, Any], house: str) -> discord.Embed:
     return embed
 
 
-def create_puzzle_solved_embed(puzzle: Dict[str, Any], winner_name: str, house: str, points_awarded: int) -> discord.Embed:
+@timed("render.puzzle_solved_embed")
+def create_puzzle_solved_embed(puzzle: Puzzle, winner_name: str, house: str, points_awarded: int) -> discord.Embed:
     """Create a celebration embed when puzzle is solved"""
     theme = HOUSE_THEMES.get(house, HOUSE_THEMES["house_veridian"])
     
@@ -87,7 +92,7 @@ def create_puzzle_solved_embed(puzzle: Dict[str, Any], winner_name: str, house:
     
     embed.add_field(
         name=f"{theme['emoji']} Puzzle",
-        value=puzzle['title'],
+        value=puzzle.title,
         inline=True
     )
     
@@ -99,7 +104,7 @@ def create_puzzle_solved_embed(puzzle: Dict[str, Any], winner_name: str, house:
     
     embed.add_field(
         name="✨ Solution",
-        value=f"||{puzzle['solution']}||",
+        value=f"||{puzzle.solution}||",
         inline=False
     )
     
@@ -111,7 +116,8 @@ def create_puzzle_solved_embed(puzzle: Dict[str, Any], winner_name: str, house:
     return embed
 
 
-def create_puzzle_list_embed(puzzles: list, house: str = "house_veridian") -> discord.Embed:
+@timed("render.puzzle_list_embed")
+def create_puzzle_list_embed(puzzles: List[Puzzle], house: str = "house_veridian") -> discord.Embed:
     """Create an embed showing all available puzzles"""
     theme = HOUSE_THEMES.get(house, HOUSE_THEMES["house_veridian"])
     
@@ -123,16 +129,16 @@ def create_puzzle_list_embed(puzzles: list, house: str = "house_veridian") -> di
     )
     
     for puzzle in puzzles:
-        status = "🟢 Active" if puzzle.get('active') else "⚫ Inactive"
-        solved = "✅ Solved" if puzzle.get('solved_by') else "❌ Unsolved"
+        status = "🟢 Active" if puzzle.active else "⚫ Inactive"
+        solved = "✅ Solved" if puzzle.solved_by else "❌ Unsolved"
         
         value = f"**Status:** {status}\n"
         value += f"**Progress:** {solved}\n"
-        value += f"**Points:** {puzzle.get('points', 10)}\n"
-        value += f"**ID:** `{puzzle['id']}`"
+        value += f"**Points:** {puzzle.points}\n"
+        value += f"**ID:** `{puzzle.id}`"
         
         embed.add_field(
-            name=f"{theme['accent']} {puzzle['title']}",
+            name=f"{theme['accent']} {puzzle.title}",
             value=value,
             inline=True
         )
@@ -145,6 +151,7 @@ def create_puzzle_list_embed(puzzles: list, house: str = "house_veridian") -> di
     return embed
 
 
+@timed("render.wrong_answer_embed")
 def create_wrong_answer_embed(house: str) -> discord.Embed:
     """Create an embed for wrong answers"""
     theme = HOUSE_THEMES.get(house, HOUSE_THEMES["house_veridian"])
@@ -160,20 +167,21 @@ def create_wrong_answer_embed(house: str) -> discord.Embed:
     return embed
 
 
-def create_puzzle_activated_embed(puzzle: Dict[str, Any], house: str) -> discord.Embed:
+@timed("render.puzzle_activated_embed")
+def create_puzzle_activated_embed(puzzle: Puzzle, house: str) -> discord.Embed:
     """Create an announcement embed when puzzle is activated"""
     theme = HOUSE_THEMES.get(house, HOUSE_THEMES["house_veridian"])
     
     embed = discord.Embed(
         title=f"🔔 NEW PUZZLE ACTIVATED! 🔔",
-        description=f"{theme['glow']}\n\n**{puzzle['title']}** is now live!\n\nHead to your house's puzzle channel to participate!\n\n{theme['banner']}",
+        description=f"{theme['glow']}\n\n**{puzzle.title}** is now live!\n\nHead to your house's puzzle channel to participate!\n\n{theme['banner']}",
         color=theme['color'],
         timestamp=discord.utils.utcnow()
     )
     
     embed.add_field(
         name="💎 Points at Stake",
-        value=f"**{puzzle['points']} Points**",
+        value=f"**{puzzle.points} Points**",
         inline=True
     )
     
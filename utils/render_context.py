@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+
+from utils.names import display_names
+
+class RenderContext:
+    """Per-render lookups shared by the leaderboard embeds.
+
+    Built once from the rows about to be shown: each player's resolved name
+    and house, and the best score per house among them. Renderers then do
+    dictionary lookups per row instead of walking role member lists.
+    """
+
+    def __init__(self, guild: discord.Guild, house_role_ids: Dict[str, List[str]]):
+        self.guild = guild
+        # Config order, so a member with several house roles lands in the
+        # same house as `utils.helpers.member_house` and the scorer pick
+        self.house_roles: List[Tuple[str, Set[int]]] = [
+            (house_key, {int(role_id) for role_id in role_id_list if role_id and role_id.isdigit()})
+            for house_key, role_id_list in house_role_ids.items()
+        ]
+        self.names: Dict[str, str] = {}
+        self.member_house: Dict[str, Optional[str]] = {}
+        self.house_leaders: Dict[str, int] = {}
+        self._house_sizes: Optional[Dict[str, int]] = None
+
+    def add_players(self, players: Iterable[Tuple[str, int]]) -> None:
+        """Resolve names and houses for ``players`` (sorted best first) and track house leaders."""
+        for user_id, pts in players:
+            if user_id not in self.names:
+                member = self.guild.get_member(int(user_id))
+                self.names[user_id] = display_names.display_name(self.guild, int(user_id), member) or f"User {user_id}"
+                house_key = None
+                if member:
+                    member_role_ids = {r.id for r in member.roles}
+                    house_key = next((hk for hk, ids in self.house_roles if ids & member_role_ids), None)
+                self.member_house[user_id] = house_key
+            house_key = self.member_house[user_id]
+            if house_key and pts > self.house_leaders.get(house_key, pts - 1):
+                self.house_leaders[house_key] = pts
+
+    def name(self, user_id: str) -> str:
+        return self.names.get(user_id) or f"User {user_id}"
+
+    def house_of(self, user_id: str) -> Optional[str]:
+        return self.member_house.get(user_id)
+
+    def is_house_leader(self, user_id: str, pts: int) -> bool:
+        house_key = self.member_house.get(user_id)
+        return house_key is not None and self.house_leaders.get(house_key) == pts
+
+    def house_size(self, house_key: str) -> int:
+        """Distinct members holding any of the house's roles; computed once per context."""
+        if self._house_sizes is None:
+            members: Dict[str, Set[int]] = {}
+            for hk, role_ids in self.house_roles:
+                for role_id in role_ids:
+                    role = self.guild.get_role(role_id)
+                    if role:
+                        members.setdefault(hk, set()).update(m.id for m in role.members)
+            self._house_sizes = {hk: len(ids) for hk, ids in members.items()}
+        return self._house_sizes.get(house_key, 0)
+
+
+def build_render_context(guild: discord.Guild, config_mgr, players: Iterable[Tuple[str, int]] = ()) -> RenderContext:
+    ctx = RenderContext(guild, config_mgr.get_house_role_ids())
+    ctx.add_players(players)
+    return ctx
@@ -23,6 +23,18 @@ def get_house_member_counts(*, guild: discord.Guild, house_role_ids: Dict[str, L
     
     return len(veridian_members), len(feathered_members)
 
+def get_member_houses(*, guild: discord.Guild, house_role_ids: Dict[str, List[str]]) -> Dict[int, str]:
+    """House of every member holding a house role; the first matching house wins."""
+    member_houses: Dict[int, str] = {}
+    for house_key, role_id_list in house_role_ids.items():
+        for role_id in role_id_list:
+            if role_id and role_id.isdigit():
+                role = guild.get_role(int(role_id))
+                if role:
+                    for m in role.members:
+                        member_houses.setdefault(m.id, house_key)
+    return member_houses
+
 def compute_multiplier(*, house_key: str, veridian_count: int, feathered_count: int) -> float:
     largest = max(veridian_count, feathered_count, 1)
     if house_key == "house_veridian":